@@ -1,10 +1,17 @@
 """ISC DHCP cable modem provisioner module."""
 
+# pylint: disable=too-many-lines
+
+import asyncio
 import ipaddress
 import logging
 import re
 from argparse import Namespace
+from collections import deque
+from functools import cached_property
 from pathlib import Path
+from time import monotonic, sleep
+from typing import Any
 
 import pexpect
 from boardfarm3 import hookimpl
@@ -25,11 +32,24 @@ from boardfarm3.lib.custom_typing.dhcp import (
 from boardfarm3.lib.networking import IptablesFirewall
 from boardfarm3.lib.utils import get_nth_mac_address
 
+from boardfarm3_docsis.lib.address_plan import AddressPlan
+from boardfarm3_docsis.lib.fair_lock import DEFAULT_LOCK_DIR, FairLock, LockStats
 from boardfarm3_docsis.templates.provisioner import Provisioner
 
 _LOGGER = logging.getLogger(__name__)
 
+# dhcpd pid file and listening UDP port of each of the two DHCP daemons
+_DHCP_DAEMONS = {"/run/dhcpd.pid": 67, "/run/dhcpd6.pid": 547}
+_DHCP_DIAGNOSTIC_COMMANDS = (
+    "tail /var/log/syslog -n 100",
+    "cat /etc/dhcp/dhcpd.conf",
+    "cat /etc/dhcp/dhcpd6.conf",
+)
+# number of DHCP service restart durations kept for the session report
+_DHCP_RESTART_HISTORY_SIZE = 1000
+
 _DHCPV4_MASTER_CONFIG = """log-facility local0;
+###OMAPI_CONFIG###
 option log-servers ###LOG_SERVER###;
 option time-servers ###TIME_SERVER###;
 default-lease-time 604800;
@@ -243,6 +263,54 @@ _DHCPV4_MTA_CONFIG = """host mta-###BOARD_NAME### {
 }
 """
 
+_DHCPV4_CPE_CONFIG = """host cpe-###CPE_NAME### {
+   hardware ethernet ###CPE_MAC_ADDRESS###;
+   fixed-address ###CPE_FIXED_ADDRESS###;
+###CPE_OPTIONS###}"""
+
+_DHCPV6_CPE_CONFIG = """host cpe-###CPE_NAME### {
+   host-identifier option dhcp6.client-id 00:03:00:01:###CPE_MAC_ADDRESS###;
+   hardware ethernet ###CPE_MAC_ADDRESS###;
+   fixed-address6 ###CPE_FIXED_ADDRESS###;
+###CPE_OPTIONS###}"""
+
+# omshell commands removing and creating a host object of the running DHCPv4
+# daemon
+_OMAPI_REMOVE_HOST_COMMANDS = """new host
+set name = "cpe-###CPE_NAME###"
+open
+remove
+"""
+
+_OMAPI_HOST_COMMANDS = """###REMOVE_COMMANDS###new host
+set name = "cpe-###CPE_NAME###"
+set hardware-address = ###CPE_MAC_ADDRESS###
+set hardware-type = 1
+set ip-address = ###CPE_FIXED_ADDRESS###
+set statements = "###CPE_STATEMENTS###"
+create
+"""
+
+_DHCPV4_CPE_OPTIONS = {
+    "dns-server": ("option domain-name-servers {};",),
+    "ntp-server": ("option ntp-servers {};",),
+    "valid-lifetime": ("default-lease-time {0};", "max-lease-time {0};"),
+}
+
+_DHCPV6_CPE_OPTIONS = {
+    "dns-server": ("option dhcp6.name-servers {};",),
+    "ntp-server": ("option dhcp6.sntp-servers {};",),
+    "valid-lifetime": ("default-lease-time {0};", "max-lease-time {0};"),
+}
+
+_DHCPV4_CONFIG_PATH = "/etc/dhcp/dhcpd.conf"
+_DHCPV6_CONFIG_PATH = "/etc/dhcp/dhcpd6.conf"
+# live DHCP config paths, with whether they are the DHCPv6 ones
+_DHCP_CONFIG_PATHS = {_DHCPV4_CONFIG_PATH: False, _DHCPV6_CONFIG_PATH: True}
+# omshell prints the object after each successful open and create
+_OMAPI_HOST_CONFIRMATION = "obj: host"
+_OMSHELL_EXIT_STATUS_REGEX = re.compile(r"omshell-rc=(\d+)")
+
 
 # pylint: disable-next=too-many-instance-attributes
 class ISCProvisioner(LinuxDevice, Provisioner):
@@ -263,18 +331,6 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         )
         self._prov_ipv6_address = prov_ipv6_interface.ip
         self._prov_ipv6_network = prov_ipv6_interface.network
-        # we're storing a list of all /56 subnets possible from erouter_net_interface.
-        # As per docsis, /56 must be the default pd length
-        # Changing the PD to /60 from /56 to update ITC V6 IP scope
-        erouter_ipv6_net_interface = ipaddress.IPv6Interface(
-            self._config.get("erouter_net", "2001:dead:beef:e000::/51"),
-        )
-        _prefix_len = erouter_ipv6_net_interface.network.prefixlen
-        self._erouter_ipv6_network_list = list(
-            erouter_ipv6_net_interface.network.subnets(
-                60 - _prefix_len,
-            ),
-        )
         self._default_lease_time = 604800
         self._sip_fqdn = self._config.get(
             "sip_fqdn",
@@ -283,6 +339,23 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         )
         self._mta_gateway_ipv4 = self._config.get("mta_gateway", "192.168.201.1")
         self._firewall: IptablesFirewall = None
+        self._dhcp_restart_durations: deque[float] = deque(
+            maxlen=_DHCP_RESTART_HISTORY_SIZE
+        )
+        self._cpe_reservations: dict[
+            str,
+            tuple[
+                dict[DHCPServicePools, DHCPv4Options],
+                dict[DHCPServicePools, DHCPv6Options],
+            ],
+        ] = {}
+        self._applied_cpe_hosts: dict[str, dict[str, tuple[str, list[str]]]] = {}
+        self._omapi_port = self._config.get("omapi_port", 7911)
+        self._omapi_key: tuple[str, str] | None = (
+            (self._config["omapi_key_name"], self._config["omapi_key_secret"])
+            if "omapi_key_name" in self._config
+            else None
+        )
         self.station_no = -1
         self.resource_name = ""
 
@@ -352,6 +425,20 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             err_msg = "ISCProvisioner device console in not responding"
             raise ContingencyCheckError(err_msg)
 
+    async def contingency_check_async(self) -> None:
+        """Make sure the ISCProvisioner is working fine before use.
+
+        :raises ContingencyCheckError: when device is not responding
+        """
+        if self._cmdline_args.skip_contingency_checks:
+            return
+        _LOGGER.info("Contingency check %s(%s)", self.device_name, self.device_type)
+        async with self._console_lock_async:
+            output = await self._console.execute_command_async("echo FOO")
+        if "FOO" not in output:
+            err_msg = "ISCProvisioner device console in not responding"
+            raise ContingencyCheckError(err_msg)
+
     @property
     def console(self) -> BoardfarmPexpect:
         """Returns Provisioner console.
@@ -406,22 +493,23 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             "###MTA_DHCP_SERVER2###": self._prov_ipv4_address,
         }
 
+    @cached_property
+    def address_plan(self) -> AddressPlan:
+        """Address plan of the provisioner, computed once per inventory.
+
+        :return: pools and per station reservations
+        :rtype: AddressPlan
+        """
+        return AddressPlan(self._config, self._ipv6_prefix)
+
     def _get_dhcpv4_master_config(self) -> str:
-        cm_network_ipv4 = ipaddress.IPv4Network(
-            self._config.get("cm_network", "192.168.200.0/24"),
-        )
+        plan = self.address_plan
+        cm_network_ipv4 = plan.cm_pool.network
         cm_gateway_ipv4 = self._config.get("cm_gateway", "192.168.200.1")
-        mta_network_ipv4 = ipaddress.IPv4Network(
-            self._config.get("mta_network", "192.168.201.0/24"),
-        )
-        open_network_ipv4 = ipaddress.IPv4Network(
-            self._config.get("open_network", "192.168.202.0/24"),
-        )
+        mta_network_ipv4 = plan.mta_pool.network
+        open_network_ipv4 = plan.open_pool.network
         open_gateway_ipv4 = self._config.get("open_gateway", "192.168.202.1")
-        prov_network_ipv4 = ipaddress.IPv4Network(
-            self._config.get("prov_network", "192.168.3.0/24"),
-        )
-        pool_size = self._config.get("pool_size", 120)
+        prov_network_ipv4 = plan.prov_network
         syslog_server = self._config.get("syslog_server", self._prov_ipv4_address)
         time_server_ipv4 = self._config.get("time_server", self._prov_ipv4_address)
         keywords_to_replace = {
@@ -432,23 +520,24 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             "###PROV_NETMASK###": prov_network_ipv4.netmask,
             "###CM_IPV4###": cm_network_ipv4[0],
             "###CM_NETMASK###": cm_network_ipv4.netmask,
-            "###CM_START_RANGE###": cm_network_ipv4[5],
-            "###CM_END_RANGE###": cm_network_ipv4[5 + pool_size],
+            "###CM_START_RANGE###": plan.cm_pool.start,
+            "###CM_END_RANGE###": plan.cm_pool.end,
             "###CM_GATEWAY###": cm_gateway_ipv4,
             "###CM_BROADCAST###": cm_network_ipv4[-1],
             "###MTA_IP###": mta_network_ipv4[0],
             "###MTA_NETMASK###": mta_network_ipv4.netmask,
-            "###MTA_START_RANGE###": mta_network_ipv4[5],
-            "###MTA_END_RANGE###": mta_network_ipv4[5 + pool_size],
+            "###MTA_START_RANGE###": plan.mta_pool.start,
+            "###MTA_END_RANGE###": plan.mta_pool.end,
             "###MTA_GATEWAY###": self._mta_gateway_ipv4,
             "###MTA_BROADCAST###": mta_network_ipv4[-1],
             "###OPEN_IP###": open_network_ipv4[0],
             "###OPEN_NETMASK###": open_network_ipv4.netmask,
-            "###OPEN_START_RANGE###": open_network_ipv4[5],
-            "###OPEN_END_RANGE###": open_network_ipv4[5 + pool_size],
+            "###OPEN_START_RANGE###": plan.open_pool.start,
+            "###OPEN_END_RANGE###": plan.open_pool.end,
             "###OPEN_GATEWAY###": open_gateway_ipv4,
             "###OPEN_BROADCAST###": open_network_ipv4[-1],
             "###WAN_IP###": self._prov_ipv4_address,
+            "###OMAPI_CONFIG###": self._get_omapi_config(),
         }
         keywords_to_replace.update(self._get_common_keywords_to_replace())
         return self._replace_keywords_from_string(
@@ -457,55 +546,26 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         )
 
     def _get_dhcpv6_master_config(self) -> str:
-        cm_network_ipv6 = ipaddress.IPv6Interface(
-            self._config.get(
-                "cm_gateway_v6",
-                f"2001:dead:beef:4::cafe/{self._ipv6_prefix}",
-            ),
-        ).network
-        cm_network_ipv6_start = self._config.get(
-            "cm_network_v6_start",
-            "2001:dead:beef:4::10",
-        )
-        cm_network_ipv6_end = self._config.get(
-            "cm_network_v6_end",
-            "2001:dead:beef:4::100",
-        )
-        open_network_ipv6 = ipaddress.IPv6Interface(
-            self._config.get(
-                "open_gateway_v6",
-                f"2001:dead:beef:6::cafe/{self._ipv6_prefix}",
-            ),
-        ).network
-        open_network_ipv6_start = ipaddress.IPv6Address(
-            self._config.get("open_network_v6_start", "2001:dead:beef:6::10"),
-        )
-        open_network_ipv6_end = ipaddress.IPv6Address(
-            self._config.get("open_network_v6_end", "2001:dead:beef:6::100"),
-        )
+        plan = self.address_plan
+        cm_network_ipv6 = plan.cm_pool_v6.network
+        open_network_ipv6 = plan.open_pool_v6.network
         time_server_ipv6 = self._config.get("time_server6", self._prov_ipv6_address)
         keywords_to_replace = {
             "###PROV_IPV6###": self._prov_ipv6_address,
             "###TIME_IPV6###": time_server_ipv6,
             "###PROV_NW_IPV6###": self._prov_ipv6_network,
             "###CM_NETWORK_V6###": cm_network_ipv6,
-            "###CM_NETWORK_V6_START###": cm_network_ipv6_start,
-            "###CM_NETWORK_V6_END###": cm_network_ipv6_end,
+            "###CM_NETWORK_V6_START###": plan.cm_pool_v6.start,
+            "###CM_NETWORK_V6_END###": plan.cm_pool_v6.end,
             "###OPEN_NETWORK_V6###": open_network_ipv6,
-            "###OPEN_NETWORK_V6_START###": open_network_ipv6_start,
-            "###OPEN_NETWORK_V6_END###": open_network_ipv6_end,
-            # Increment IP by 200 hosts
-            "###OPEN_NETWORK_HOST_V6_START###": open_network_ipv6_start + 256 * 2,
-            "###OPEN_NETWORK_HOST_V6_END###": open_network_ipv6_end + 256 * 2,
-            # keep last ten /56 prefix in erouter pool. for unknown hosts
-            "###EROUTER_NET_START###": self._erouter_ipv6_network_list[
-                -10
-            ].network_address,
-            "###EROUTER_NET_END###": self._erouter_ipv6_network_list[
-                -1
-            ].network_address,
-            # pylint: disable=protected-access
-            "###EROUTER_PREFIX###": self._erouter_ipv6_network_list[-1]._prefixlen,  # type: ignore[attr-defined]  # noqa: SLF001  # pylint: disable=[line-too-long]
+            "###OPEN_NETWORK_V6_START###": plan.open_pool_v6.start,
+            "###OPEN_NETWORK_V6_END###": plan.open_pool_v6.end,
+            "###OPEN_NETWORK_HOST_V6_START###": plan.open_host_pool_v6.start,
+            "###OPEN_NETWORK_HOST_V6_END###": plan.open_host_pool_v6.end,
+            # keep last ten prefixes in erouter pool, for unknown hosts
+            "###EROUTER_NET_START###": plan.dynamic_prefix_pool.start,
+            "###EROUTER_NET_END###": plan.dynamic_prefix_pool.end,
+            "###EROUTER_PREFIX###": plan.delegated_prefix_length,
         }
         keywords_to_replace.update(self._get_common_keywords_to_replace())
         dhcp_ipv6_master_config = _DHCPV6_MASTER_CONFIG
@@ -524,9 +584,7 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         tftp_server: str,
         is_dhcpv6: bool,
     ) -> str:
-        erouter_fixed_ipv6_start = ipaddress.IPv6Interface(
-            self._config.get("erouter_fixed_ip_start"),
-        )
+        station = self.address_plan.get_station(self.station_no)
         erouter_mac = get_nth_mac_address(cm_mac, 2)
         keywords_to_replace = {
             "###PROV_IPV4###": self._prov_ipv4_address,
@@ -537,11 +595,8 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             "###EROUTER_MAC_ADDRESS###": erouter_mac,
             "###DEFAULT_LEASE_TIME###": self._default_lease_time,
             "###MAX_LEASE_TIME###": self._default_lease_time,
-            "###FIXED_PREFIX_IPV6###": self._erouter_ipv6_network_list[
-                self.station_no - 1
-            ],
-            "###FIXED_ADDRESS_IPV6###": erouter_fixed_ipv6_start.ip
-            + (self.station_no - 1),
+            "###FIXED_PREFIX_IPV6###": station.delegated_prefix,
+            "###FIXED_ADDRESS_IPV6###": station.erouter_address,
         }
 
         if self._config["dhcp_snooping"]:
@@ -602,15 +657,30 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             keywords_to_replace,
         )
 
-    def _update_dhcp_config(
+    def _get_dhcp_config_files(
         self,
         cm_mac: str,
         tftp_server: str,
         cm_bootfile: str,
         mta_bootfile: str,
         is_dhcpv6: bool,
-    ) -> None:
-        dhcp_mta_config = ""
+    ) -> tuple[str, dict[str, str]]:
+        """Render the DHCP config files of the board.
+
+        :param cm_mac: cable modem mac address
+        :type cm_mac: str
+        :param tftp_server: tftp server address
+        :type tftp_server: str
+        :param cm_bootfile: cable modem boot file name
+        :type cm_bootfile: str
+        :param mta_bootfile: mta boot file name, empty if not needed
+        :type mta_bootfile: str
+        :param is_dhcpv6: True for the DHCPv6 config, False for DHCPv4
+        :type is_dhcpv6: bool
+        :return: live DHCP config path, and the content of the board master
+            and board host config files keyed by their path
+        :rtype: tuple[str, dict[str, str]]
+        """
         if not is_dhcpv6:
             dhcp_config_path = "/etc/dhcp/dhcpd.conf"
             master_config = self._get_dhcpv4_master_config()
@@ -618,9 +688,6 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             dhcp_config_path = "/etc/dhcp/dhcpd6.conf"
             master_config = self._get_dhcpv6_master_config()
         board_name = self.resource_name
-        cm_config_path = f"{dhcp_config_path}.{board_name}"
-        master_config_path = f"{dhcp_config_path}-{board_name}.master"
-        self._create_dhcp_config_file(master_config, master_config_path)
         dhcp_cm_config = self._get_dhcp_cable_modem_config(
             cm_mac,
             cm_bootfile,
@@ -634,11 +701,188 @@ class ISCProvisioner(LinuxDevice, Provisioner):
                 tftp_server,
             )
             dhcp_cm_config = f"{dhcp_mta_config}{dhcp_cm_config}"
-        self._create_dhcp_config_file(dhcp_cm_config, cm_config_path)
-        self._console.execute_command(
-            f"cat {dhcp_config_path}.* >> {master_config_path}",
+        return dhcp_config_path, {
+            f"{dhcp_config_path}-{board_name}.master": master_config,
+            f"{dhcp_config_path}.{board_name}": dhcp_cm_config,
+        }
+
+    def _apply_dhcp_config_files(
+        self,
+        dhcp_config_path: str,
+        config_files: dict[str, str],
+        is_dhcpv6: bool,
+    ) -> None:
+        """Upload the board config files and rebuild the live DHCP config.
+
+        The live config is the board master config followed by the host
+        config files of all the boards sharing the provisioner. The board
+        files are staged and only moved into place once dhcpd accepts the
+        master config built from them, so a rejected render never reaches
+        the configs of the other boards.
+
+        :param dhcp_config_path: live DHCP config path
+        :type dhcp_config_path: str
+        :param config_files: board master config, first, and board host
+            config files keyed by their path
+        :type config_files: dict[str, str]
+        :param is_dhcpv6: True for the DHCPv6 config, False for DHCPv4
+        :type is_dhcpv6: bool
+        """
+        staged_paths = self._get_staged_paths(config_files)
+        staged_master_path = next(iter(staged_paths.values()))
+        staging_dir = str(Path(staged_master_path).parent)
+        self._console.execute_command(f"rm -rf {staging_dir}; mkdir -p {staging_dir}")
+        try:
+            for config_path, config in config_files.items():
+                self._create_dhcp_config_file(config, staged_paths[config_path])
+            self._console.execute_command(
+                self._get_staged_master_command(dhcp_config_path, staged_paths)
+            )
+            success_message = "DHCP config is valid."
+            self._check_dhcp_config_output(
+                self._console.execute_command(
+                    self._get_dhcp_config_test_command(
+                        staged_master_path, is_dhcpv6, success_message
+                    )
+                ),
+                staged_master_path,
+                success_message,
+            )
+            self._console.execute_command(
+                self._get_staged_commit_command(dhcp_config_path, staged_paths)
+            )
+        finally:
+            self._console.execute_command(f"rm -rf {staging_dir}")
+
+    async def _apply_dhcp_config_files_async(
+        self,
+        dhcp_config_path: str,
+        config_files: dict[str, str],
+        is_dhcpv6: bool,
+    ) -> None:
+        """Upload the board config files and rebuild the live DHCP config.
+
+        Same as ``_apply_dhcp_config_files()``, using asyncio.
+
+        :param dhcp_config_path: live DHCP config path
+        :type dhcp_config_path: str
+        :param config_files: board master config, first, and board host
+            config files keyed by their path
+        :type config_files: dict[str, str]
+        :param is_dhcpv6: True for the DHCPv6 config, False for DHCPv4
+        :type is_dhcpv6: bool
+        """
+        staged_paths = self._get_staged_paths(config_files)
+        staged_master_path = next(iter(staged_paths.values()))
+        staging_dir = str(Path(staged_master_path).parent)
+        await self._console.execute_command_async(
+            f"rm -rf {staging_dir}; mkdir -p {staging_dir}"
+        )
+        try:
+            for config_path, config in config_files.items():
+                await self._create_dhcp_config_file_async(
+                    config, staged_paths[config_path]
+                )
+            await self._console.execute_command_async(
+                self._get_staged_master_command(dhcp_config_path, staged_paths)
+            )
+            success_message = "DHCP config is valid."
+            self._check_dhcp_config_output(
+                await self._console.execute_command_async(
+                    self._get_dhcp_config_test_command(
+                        staged_master_path, is_dhcpv6, success_message
+                    )
+                ),
+                staged_master_path,
+                success_message,
+            )
+            await self._console.execute_command_async(
+                self._get_staged_commit_command(dhcp_config_path, staged_paths)
+            )
+        finally:
+            await self._console.execute_command_async(f"rm -rf {staging_dir}")
+
+    def _get_staged_paths(self, config_files: dict[str, str]) -> dict[str, str]:
+        staging_dir = f"/tmp/dhcp-staging-{self.resource_name}"  # noqa: S108
+        return {path: f"{staging_dir}/{Path(path).name}" for path in config_files}
+
+    @staticmethod
+    def _get_staged_master_command(
+        dhcp_config_path: str, staged_paths: dict[str, str]
+    ) -> str:
+        """Return the command appending all the host configs to the staged master.
+
+        The live host configs of the other boards are followed by the staged
+        host configs of this board.
+
+        :param dhcp_config_path: live DHCP config path
+        :type dhcp_config_path: str
+        :param staged_paths: staged path of the board config files, keyed by
+            their live path, master config first
+        :type staged_paths: dict[str, str]
+        :return: shell command
+        :rtype: str
+        """
+        staged_master_path, *staged_host_paths = staged_paths.values()
+        replaced_paths = " ".join(f"-e {path}" for path in list(staged_paths)[1:])
+        other_host_paths = (
+            f"$(ls {dhcp_config_path}.* 2>/dev/null | grep -vxF {replaced_paths})"
+        )
+        return (
+            f"cat {other_host_paths} {' '.join(staged_host_paths)}"
+            f" >> {staged_master_path}"
+        )
+
+    @staticmethod
+    def _get_staged_commit_command(
+        dhcp_config_path: str, staged_paths: dict[str, str]
+    ) -> str:
+        """Return the command moving the staged configs into place.
+
+        :param dhcp_config_path: live DHCP config path
+        :type dhcp_config_path: str
+        :param staged_paths: staged path of the board config files, keyed by
+            their live path, master config first
+        :type staged_paths: dict[str, str]
+        :return: shell command
+        :rtype: str
+        """
+        master_config_path = next(iter(staged_paths))
+        moves = " && ".join(
+            f"mv -f {staged_path} {config_path}"
+            for config_path, staged_path in staged_paths.items()
+        )
+        return f"{moves} && cat {master_config_path} > {dhcp_config_path}"
+
+    def _update_dhcp_config(
+        self,
+        cm_mac: str,
+        tftp_server: str,
+        cm_bootfile: str,
+        mta_bootfile: str,
+        is_dhcpv6: bool,
+    ) -> None:
+        self._apply_dhcp_config_files(
+            *self._get_dhcp_config_files(
+                cm_mac, tftp_server, cm_bootfile, mta_bootfile, is_dhcpv6
+            ),
+            is_dhcpv6,
+        )
+
+    async def _update_dhcp_config_async(
+        self,
+        cm_mac: str,
+        tftp_server: str,
+        cm_bootfile: str,
+        mta_bootfile: str,
+        is_dhcpv6: bool,
+    ) -> None:
+        await self._apply_dhcp_config_files_async(
+            *self._get_dhcp_config_files(
+                cm_mac, tftp_server, cm_bootfile, mta_bootfile, is_dhcpv6
+            ),
+            is_dhcpv6,
         )
-        self._console.execute_command(f"cat {master_config_path} > {dhcp_config_path}")
 
     def provision_cable_modem(
         self,
@@ -663,22 +907,72 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         :param tftp_ipv6_addr: tftp server ipv6 address
         """
         lock_file = "/etc/init.d/isc-dhcp-server.lock"
-        try:
-            self._acquire_device_file_lock(lock_file)
-            self._update_dhcp_config(
-                cm_mac,
-                tftp_ipv4_addr,
-                Path(cm_bootfile).name,
-                Path(mta_bootfile).name if mta_bootfile else "",
-                False,
-            )
-            # Note: MTA over IPv6 not yet supported!
-            self._update_dhcp_config(
-                cm_mac, tftp_ipv6_addr, Path(cm_bootfile).name, "", True
-            )
-            self._restart_dhcp_service()
-        finally:
-            self._release_device_file_lock(lock_file)
+        with self._provisioning_lock.hold(self.resource_name):
+            try:
+                self._acquire_device_file_lock(lock_file)
+                self._update_dhcp_config(
+                    cm_mac,
+                    tftp_ipv4_addr,
+                    Path(cm_bootfile).name,
+                    Path(mta_bootfile).name if mta_bootfile else "",
+                    False,
+                )
+                # Note: MTA over IPv6 not yet supported!
+                self._update_dhcp_config(
+                    cm_mac, tftp_ipv6_addr, Path(cm_bootfile).name, "", True
+                )
+                self._restart_dhcp_service()
+            finally:
+                self._release_device_file_lock(lock_file)
+
+    async def provision_cable_modem_async(
+        self,
+        cm_mac: str,
+        cm_bootfile: str,
+        mta_bootfile: str,
+        tftp_ipv4_addr: str,
+        tftp_ipv6_addr: str,
+    ) -> None:
+        """Provision cable modem with given mac address, using asyncio.
+
+        Concurrent calls on the same provisioner are served one at a time on
+        the shared console, while the event loop is free to drive other
+        devices in the meantime. The console is only taken once the
+        provisioner lock is held, so that other coroutines can use it while
+        this call waits behind the sessions of other processes.
+
+        :param cm_mac: cable modem mac address
+        :type cm_mac: str
+        :param cm_bootfile: cable modem boot file path
+        :type cm_bootfile: str
+        :param mta_bootfile: mta boot file path
+        :type mta_bootfile: str
+        :param tftp_ipv4_addr: tftp server ipv4 address
+        :type tftp_ipv4_addr: str
+        :param tftp_ipv6_addr: tftp server ipv6 address
+        :type tftp_ipv6_addr: str
+        """
+        lock_file = "/etc/init.d/isc-dhcp-server.lock"
+        async with (
+            self._provisioning_lock.hold_async(self.resource_name),
+            self._console_lock_async,
+        ):
+            try:
+                await self._acquire_device_file_lock_async(lock_file)
+                await self._update_dhcp_config_async(
+                    cm_mac,
+                    tftp_ipv4_addr,
+                    Path(cm_bootfile).name,
+                    Path(mta_bootfile).name if mta_bootfile else "",
+                    False,
+                )
+                # Note: MTA over IPv6 not yet supported!
+                await self._update_dhcp_config_async(
+                    cm_mac, tftp_ipv6_addr, Path(cm_bootfile).name, "", True
+                )
+                await self._restart_dhcp_service_async()
+            finally:
+                await self._release_device_file_lock_async(lock_file)
 
     def provision_cpe(
         self,
@@ -724,34 +1018,461 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         :type dhcpv4_options: dict[DHCPServicePools, DHCPv4Options]
         :param dhcpv6_options: DHCPv6 Options with ACS, NTP, DNS details
         :type dhcpv6_options: dict[DHCPServicePools, DHCPv6Options]
-        :raises NotImplementedError: Not Implemented for docsis provisioner
         """
-        raise NotImplementedError
+        self.provision_cpes({cpe_mac: (dhcpv4_options, dhcpv6_options)})
+
+    def provision_cpes(
+        self,
+        cpe_options: dict[
+            str,
+            tuple[
+                dict[DHCPServicePools, DHCPv4Options],
+                dict[DHCPServicePools, DHCPv6Options],
+            ],
+        ],
+    ) -> None:
+        """Provision several CPEs at once.
+
+        Adds a DHCP host reservation for every CPE to the board reservations.
+        Each CPE gets a fixed address from the block of the board station in
+        the address plan. A DHCPv6 reservation is only added for the CPEs
+        given DHCPv6 options, the others are served from the DHCPv6 pool.
+
+        The reservations are always written to the board host config files
+        first, so that they are validated and kept over later restarts. When
+        an OMAPI key is configured, new and updated DHCPv4 reservations are
+        then applied to the running dhcpd over OMAPI, without a restart.
+        OMAPI host objects have no DHCPv6 client identifier nor
+        fixed-address6, so a change of the DHCPv6 reservations still rebuilds
+        the configs followed by a single DHCP service restart, as does an
+        OMAPI failure or a config without OMAPI key.
+
+        The options of the ``all`` pool are used, overridden by those of the
+        ``data`` pool: DNS and NTP servers and the lease time. VSIO and VIVSO
+        options are not supported.
+
+        .. code-block:: python
+
+            provisioner.provision_cpes(
+                {
+                    "AA:BB:CC:DD:EE:01": ({}, {}),
+                    "AA:BB:CC:DD:EE:02": (
+                        {"data": {"dns-server": "x.x.x.x"}},
+                        {"all": {"dns-server": "x::x"}},
+                    ),
+                }
+            )
+
+        :param cpe_options: DHCPv4 and DHCPv6 options keyed by CPE mac address
+        :type cpe_options: dict[str, tuple[dict[DHCPServicePools, DHCPv4Options],
+            dict[DHCPServicePools, DHCPv6Options]]]
+        """
+        self._cpe_reservations.update(
+            {mac.lower(): options for mac, options in cpe_options.items()}
+        )
+        cpe_hosts = {
+            dhcp_config_path: self._get_cpe_hosts(is_dhcpv6)
+            for dhcp_config_path, is_dhcpv6 in _DHCP_CONFIG_PATHS.items()
+        }
+        if cpe_hosts == self._applied_cpe_hosts:
+            _LOGGER.info("CPE reservations already applied, skipping DHCP restart")
+            return
+        applied_hosts = self._applied_cpe_hosts.get(_DHCPV4_CONFIG_PATH, {})
+        changed_hosts = {
+            cpe_mac: host
+            for cpe_mac, host in cpe_hosts[_DHCPV4_CONFIG_PATH].items()
+            if applied_hosts.get(cpe_mac) != host
+        }
+        lock_file = "/etc/init.d/isc-dhcp-server.lock"
+        with self._provisioning_lock.hold(self.resource_name):
+            try:
+                self._acquire_device_file_lock(lock_file)
+                # the staged config is validated before any host is pushed
+                self._apply_cpe_config(
+                    _DHCPV4_CONFIG_PATH, cpe_hosts[_DHCPV4_CONFIG_PATH]
+                )
+                if cpe_hosts[_DHCPV6_CONFIG_PATH] != self._applied_cpe_hosts.get(
+                    _DHCPV6_CONFIG_PATH, {}
+                ) or not self._add_omapi_hosts(changed_hosts, set(applied_hosts)):
+                    self._apply_cpe_config(
+                        _DHCPV6_CONFIG_PATH, cpe_hosts[_DHCPV6_CONFIG_PATH]
+                    )
+                    self._restart_dhcp_service()
+            finally:
+                self._release_device_file_lock(lock_file)
+        self._applied_cpe_hosts = cpe_hosts
+
+    def _get_cpe_hosts(self, is_dhcpv6: bool) -> dict[str, tuple[str, list[str]]]:
+        """Return the host reservations of all the CPEs of the board.
+
+        :param is_dhcpv6: True for the DHCPv6 reservations, False for DHCPv4
+        :type is_dhcpv6: bool
+        :return: fixed address and option statements, keyed by CPE mac address
+        :rtype: dict[str, tuple[str, list[str]]]
+        """
+        hosts: dict[str, tuple[str, list[str]]] = {}
+        for index, (cpe_mac, pool_options) in enumerate(self._cpe_reservations.items()):
+            pools: dict[DHCPServicePools, Any] = (
+                pool_options[1] if is_dhcpv6 else pool_options[0]
+            )
+            if is_dhcpv6 and not pools:
+                continue
+            fixed_addresses = self.address_plan.get_cpe_addresses(
+                self.station_no, index
+            )
+            hosts[cpe_mac] = (
+                str(fixed_addresses[1 if is_dhcpv6 else 0]),
+                self._get_cpe_option_statements(cpe_mac, pools, is_dhcpv6),
+            )
+        return hosts
+
+    @staticmethod
+    def _get_cpe_option_statements(
+        cpe_mac: str, pools: dict[DHCPServicePools, Any], is_dhcpv6: bool
+    ) -> list[str]:
+        option_templates = _DHCPV6_CPE_OPTIONS if is_dhcpv6 else _DHCPV4_CPE_OPTIONS
+        if ignored_pools := set(pools) - {"all", "data"}:
+            _LOGGER.warning(
+                "Ignoring the %s pool options of CPE %s", sorted(ignored_pools), cpe_mac
+            )
+        options = {**pools.get("all", {}), **pools.get("data", {})}
+        if unsupported := set(options) - set(option_templates):
+            _LOGGER.warning(
+                "Ignoring unsupported DHCP options %s of CPE %s",
+                sorted(unsupported),
+                cpe_mac,
+            )
+        return [
+            statement.format(options[name])
+            for name, option_template in option_templates.items()
+            if name in options
+            for statement in option_template
+        ]
+
+    def _apply_cpe_config(
+        self, dhcp_config_path: str, hosts: dict[str, tuple[str, list[str]]]
+    ) -> None:
+        """Write the CPE host config file of the board and rebuild the live one.
+
+        :param dhcp_config_path: live DHCP config path
+        :type dhcp_config_path: str
+        :param hosts: fixed address and option statements, keyed by CPE mac
+        :type hosts: dict[str, tuple[str, list[str]]]
+        """
+        is_dhcpv6 = _DHCP_CONFIG_PATHS[dhcp_config_path]
+        template = _DHCPV6_CPE_CONFIG if is_dhcpv6 else _DHCPV4_CPE_CONFIG
+        cpe_config = "\n".join(
+            self._replace_keywords_from_string(
+                template,
+                {
+                    "###CPE_NAME###": cpe_mac.replace(":", ""),
+                    "###CPE_MAC_ADDRESS###": cpe_mac,
+                    "###CPE_FIXED_ADDRESS###": fixed_address,
+                    "###CPE_OPTIONS###": "".join(
+                        f"   {statement}\n" for statement in statements
+                    ),
+                },
+            )
+            for cpe_mac, (fixed_address, statements) in hosts.items()
+        )
+        master_config = (
+            self._get_dhcpv6_master_config()
+            if is_dhcpv6
+            else self._get_dhcpv4_master_config()
+        )
+        self._apply_dhcp_config_files(
+            dhcp_config_path,
+            {
+                f"{dhcp_config_path}-{self.resource_name}.master": master_config,
+                f"{dhcp_config_path}.{self.resource_name}-cpe": cpe_config,
+            },
+            is_dhcpv6,
+        )
+
+    def _get_omapi_config(self) -> str:
+        # OMAPI is only opened with a key, the CPEs are reloaded otherwise
+        if not self._omapi_key:
+            return ""
+        key_name, key_secret = self._omapi_key
+        return (
+            f'key {key_name} {{\n  algorithm hmac-md5;\n  secret "{key_secret}";'
+            f"\n}}\nomapi-port {self._omapi_port};\nomapi-key {key_name};"
+        )
+
+    def _add_omapi_hosts(
+        self, hosts: dict[str, tuple[str, list[str]]], existing_hosts: set[str]
+    ) -> bool:
+        """Add host reservations to the running DHCPv4 daemon over OMAPI.
+
+        :param hosts: fixed address and option statements, keyed by CPE mac
+        :type hosts: dict[str, tuple[str, list[str]]]
+        :param existing_hosts: mac addresses of the CPEs already known to the
+            daemon, whose host objects are replaced
+        :type existing_hosts: set[str]
+        :return: True if the daemon accepted all the host objects, False if it
+            did not or no OMAPI key is configured
+        :rtype: bool
+        """
+        if not self._omapi_key:
+            return False
+        commands = [
+            "server 127.0.0.1",
+            f"port {self._omapi_port}",
+            f"key {self._omapi_key[0]} {self._omapi_key[1]}",
+            "connect",
+        ]
+        commands.extend(
+            self._replace_keywords_from_string(
+                _OMAPI_HOST_COMMANDS,
+                {
+                    "###REMOVE_COMMANDS###": (
+                        _OMAPI_REMOVE_HOST_COMMANDS if cpe_mac in existing_hosts else ""
+                    ),
+                    "###CPE_NAME###": cpe_mac.replace(":", ""),
+                    "###CPE_MAC_ADDRESS###": cpe_mac,
+                    "###CPE_FIXED_ADDRESS###": fixed_address,
+                    "###CPE_STATEMENTS###": " ".join(statements),
+                },
+            )
+            for cpe_mac, (fixed_address, statements) in hosts.items()
+        )
+        script_path = f"/tmp/omapi-{self.resource_name}.cmd"  # noqa: S108
+        self._create_dhcp_config_file("\n".join(commands), script_path)
+        output = self._console.execute_command(
+            f"omshell < {script_path} 2>&1; echo omshell-rc=$?; rm -f {script_path}"
+        )
+        exit_status = _OMSHELL_EXIT_STATUS_REGEX.search(output)
+        # one confirmation per opened and per created host object
+        confirmations = len(hosts) + len(hosts.keys() & existing_hosts)
+        if (
+            exit_status is None
+            or exit_status.group(1) != "0"
+            or output.count(_OMAPI_HOST_CONFIRMATION) != confirmations
+        ):
+            _LOGGER.warning("OMAPI update of the CPE reservations failed:\n%s", output)
+            return False
+        _LOGGER.info("Applied %s CPE reservations over OMAPI", len(hosts))
+        return True
+
+    @property
+    def dhcp_restart_durations(self) -> list[float]:
+        """Time taken by each DHCP service restart, in seconds.
+
+        Measured from the service stop until both daemons are serving, only
+        the last _DHCP_RESTART_HISTORY_SIZE restarts are kept.
+
+        :return: restart durations, in the order the restarts happened
+        :rtype: list[float]
+        """
+        return list(self._dhcp_restart_durations)
+
+    @staticmethod
+    def _get_dhcp_readiness_command(ready_message: str) -> str:
+        checks = " && ".join(
+            f"[ -s {pid_file} ] && kill -0 $(cat {pid_file}) 2>/dev/null"
+            f" && ss -lnu | grep -q ':{port} '"
+            for pid_file, port in _DHCP_DAEMONS.items()
+        )
+        return f"{checks} && echo {ready_message}"
+
+    def _is_dhcp_service_ready(self) -> bool:
+        """Check whether both dhcpd daemons are running and listening.
+
+        A daemon is considered ready when its pid file is present, the pid
+        is alive and its UDP server port is bound.
+
+        :return: True if the DHCPv4 and DHCPv6 daemons are serving
+        :rtype: bool
+        """
+        ready_message = "DHCP service ready."
+        output = self._console.execute_command(
+            self._get_dhcp_readiness_command(ready_message)
+        )
+        return ready_message in output
+
+    async def _is_dhcp_service_ready_async(self) -> bool:
+        """Check whether both dhcpd daemons are running and listening.
+
+        :return: True if the DHCPv4 and DHCPv6 daemons are serving
+        :rtype: bool
+        """
+        ready_message = "DHCP service ready."
+        output = await self._console.execute_command_async(
+            self._get_dhcp_readiness_command(ready_message)
+        )
+        return ready_message in output
+
+    def _wait_for_dhcp_service(
+        self,
+        timeout: float = 30,
+        initial_delay: float = 0.1,
+        max_delay: float = 2,
+    ) -> bool:
+        """Poll the dhcpd daemons until they are serving.
+
+        The poll interval starts at ``initial_delay`` and doubles after every
+        unsuccessful probe, capped at ``max_delay``.
+
+        :param timeout: maximum time to wait in seconds, defaults to 30
+        :type timeout: float
+        :param initial_delay: first poll interval in seconds, defaults to 0.1
+        :type initial_delay: float
+        :param max_delay: maximum poll interval in seconds, defaults to 2
+        :type max_delay: float
+        :return: True if both daemons were serving within the timeout
+        :rtype: bool
+        """
+        deadline = monotonic() + timeout
+        delay = initial_delay
+        while not self._is_dhcp_service_ready():
+            if monotonic() + delay > deadline:
+                return False
+            sleep(delay)
+            delay = min(delay * 2, max_delay)
+        return True
+
+    async def _wait_for_dhcp_service_async(
+        self,
+        timeout: float = 30,
+        initial_delay: float = 0.1,
+        max_delay: float = 2,
+    ) -> bool:
+        """Poll the dhcpd daemons until they are serving, using asyncio.
+
+        :param timeout: maximum time to wait in seconds, defaults to 30
+        :type timeout: float
+        :param initial_delay: first poll interval in seconds, defaults to 0.1
+        :type initial_delay: float
+        :param max_delay: maximum poll interval in seconds, defaults to 2
+        :type max_delay: float
+        :return: True if both daemons were serving within the timeout
+        :rtype: bool
+        """
+        deadline = monotonic() + timeout
+        delay = initial_delay
+        while not await self._is_dhcp_service_ready_async():
+            if monotonic() + delay > deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_delay)
+        return True
 
     def _restart_dhcp_service(self) -> None:
         dhcp_service_path = "/etc/init.d/isc-dhcp-server"
+        start_time = monotonic()
         self._console.execute_command("ps auxwww | grep dhcpd")
         self._console.execute_command(f"{dhcp_service_path} stop")
         self._console.execute_command("killall -15 dhcpd")
         success_message = "Stopped DHCP service."
-        num_processes = "ps aux | grep -v grep | grep dhcpd | wc -l"
-        command = f"[ $({num_processes}) == 0 ] && echo {success_message}"
-        output = self._console.execute_command(command)
+        output = self._console.execute_command(
+            self._get_dhcp_stopped_command(success_message)
+        )
         if success_message not in output:
             err_msg = "Failed to stop DHCP service."
             raise ConfigurationFailure(err_msg)
         self._console.execute_command("rm -f /run/dhcpd*.pid")
         self._console.execute_command(f"{dhcp_service_path} start")
-        success_message = "DHCP Restarted successfully."
-        command = f"[ $({num_processes}) == 2 ] && echo {success_message}"
-        output = self._console.execute_command(command)
+        if not self._wait_for_dhcp_service():
+            _LOGGER.error("Failed to restart DHCP service.")
+            for command in _DHCP_DIAGNOSTIC_COMMANDS:
+                self._console.execute_command(command)
+            err_msg = "Failed to apply DHCP config."
+            raise ConfigurationFailure(err_msg)
+        self._record_dhcp_restart(monotonic() - start_time)
+
+    async def _restart_dhcp_service_async(self) -> None:
+        dhcp_service_path = "/etc/init.d/isc-dhcp-server"
+        start_time = monotonic()
+        await self._console.execute_command_async("ps auxwww | grep dhcpd")
+        await self._console.execute_command_async(f"{dhcp_service_path} stop")
+        await self._console.execute_command_async("killall -15 dhcpd")
+        success_message = "Stopped DHCP service."
+        output = await self._console.execute_command_async(
+            self._get_dhcp_stopped_command(success_message)
+        )
         if success_message not in output:
+            err_msg = "Failed to stop DHCP service."
+            raise ConfigurationFailure(err_msg)
+        await self._console.execute_command_async("rm -f /run/dhcpd*.pid")
+        await self._console.execute_command_async(f"{dhcp_service_path} start")
+        if not await self._wait_for_dhcp_service_async():
             _LOGGER.error("Failed to restart DHCP service.")
-            self._console.execute_command("tail /var/log/syslog -n 100")
-            self._console.execute_command("cat /etc/dhcp/dhcpd.conf")
-            self._console.execute_command("cat /etc/dhcp/dhcpd6.conf")
+            for command in _DHCP_DIAGNOSTIC_COMMANDS:
+                await self._console.execute_command_async(command)
             err_msg = "Failed to apply DHCP config."
             raise ConfigurationFailure(err_msg)
+        self._record_dhcp_restart(monotonic() - start_time)
+
+    @staticmethod
+    def _get_dhcp_stopped_command(success_message: str) -> str:
+        num_processes = "ps aux | grep -v grep | grep dhcpd | wc -l"
+        return f"[ $({num_processes}) == 0 ] && echo {success_message}"
+
+    @staticmethod
+    def _get_dhcp_config_test_command(
+        config_path: str, is_dhcpv6: bool, success_message: str
+    ) -> str:
+        family = "-6" if is_dhcpv6 else "-4"
+        return f"dhcpd -t {family} -cf {config_path} 2>&1 && echo {success_message}"
+
+    @staticmethod
+    def _check_dhcp_config_output(
+        output: str, config_path: str, success_message: str
+    ) -> None:
+        """Check the output of the dhcpd config test.
+
+        :param output: output of the config test command
+        :type output: str
+        :param config_path: tested config path
+        :type config_path: str
+        :param success_message: message printed when the config is valid
+        :type success_message: str
+        :raises ConfigurationFailure: when dhcpd rejects the config
+        """
+        if success_message not in output:
+            _LOGGER.error("dhcpd rejected %s:\n%s", config_path, output)
+            err_msg = f"Invalid DHCP config {config_path}, DHCP service untouched."
+            raise ConfigurationFailure(err_msg)
+
+    def _record_dhcp_restart(self, duration: float) -> None:
+        self._dhcp_restart_durations.append(duration)
+        _LOGGER.info("DHCP service restarted in %.2f seconds", duration)
+
+    @cached_property
+    def _provisioning_lock(self) -> FairLock:
+        """Host side FIFO lock of this provisioner.
+
+        Sessions sharing the provisioner from the same host queue up on this
+        lock before taking the device file lock, which still guards against
+        sessions running on other hosts.
+
+        :return: provisioner lock
+        :rtype: FairLock
+        """
+        return FairLock(
+            f"{self._config.get('ipaddr', self.device_name)}"
+            f"-{self._config.get('port', 22)}",
+            lock_dir=self._config.get("lock_dir", DEFAULT_LOCK_DIR),
+            stale_timeout=self._config.get("lock_stale_timeout", 600),
+        )
+
+    @cached_property
+    def _console_lock_async(self) -> asyncio.Lock:
+        """Serialize the coroutines sharing the provisioner console.
+
+        :return: console lock
+        :rtype: asyncio.Lock
+        """
+        return asyncio.Lock()
+
+    @property
+    def provisioning_lock_stats(self) -> LockStats:
+        """Wait and hold time metrics of the provisioner lock.
+
+        :return: provisioner lock metrics
+        :rtype: LockStats
+        """
+        return self._provisioning_lock.stats
 
     def _acquire_device_file_lock(
         self,
@@ -775,6 +1496,31 @@ class ISCProvisioner(LinuxDevice, Provisioner):
             err_msg = f"Failed to acquire lock on file {lock_file_path}"
             raise FileLockTimeout(err_msg)
 
+    async def _acquire_device_file_lock_async(
+        self,
+        lock_file_path: str,
+        timeout: int = 200,
+        file_handle: int = 9,
+    ) -> None:
+        """Acquire file lock on the device, using asyncio.
+
+        :param lock_file_path: lock file path
+        :param timeout: timeout in seconds. defaults to 200.
+        :param file_handle: lock file handle number. defaults to 9.
+        :raises FileLockTimeout: when failed to acquire lock within timeout
+        """
+        await self._console.execute_command_async(
+            f"exec {file_handle}>{lock_file_path}"
+        )
+        self._console.sendline(f"flock -x {file_handle}")
+        if not await self._console.expect(
+            [pexpect.TIMEOUT, *self._shell_prompt],
+            timeout=timeout,
+            async_=True,
+        ):
+            err_msg = f"Failed to acquire lock on file {lock_file_path}"
+            raise FileLockTimeout(err_msg)
+
     def _release_device_file_lock(
         self,
         lock_file_path: str,
@@ -788,6 +1534,19 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         self._console.execute_command(f"flock -u {file_handle}")
         self._console.execute_command(f"rm {lock_file_path}")
 
+    async def _release_device_file_lock_async(
+        self,
+        lock_file_path: str,
+        file_handle: int = 9,
+    ) -> None:
+        """Release file lock on the device, using asyncio.
+
+        :param lock_file_path: lock file path
+        :param file_handle: lock file handle number. defaults to 9.
+        """
+        await self._console.execute_command_async(f"flock -u {file_handle}")
+        await self._console.execute_command_async(f"rm {lock_file_path}")
+
     def _create_dhcp_config_file(self, config: str, config_path: str) -> None:
         """Create DHCP config on the server.
 
@@ -802,6 +1561,19 @@ class ISCProvisioner(LinuxDevice, Provisioner):
         self._console.sendline(f"cat > {config_path} << EOF\n{config}\nEOF")
         self._console.expect(self._shell_prompt)
 
+    async def _create_dhcp_config_file_async(
+        self, config: str, config_path: str
+    ) -> None:
+        """Create DHCP config on the server, using asyncio.
+
+        :param config: config file content
+        :type config: str
+        :param config_path: config file path
+        :type config_path: str
+        """
+        self._console.sendline(f"cat > {config_path} << EOF\n{config}\nEOF")
+        await self._console.expect(self._shell_prompt, async_=True)
+
     @property
     def firewall(self) -> IptablesFirewall:
         """Firewall component instance.
@@ -33,6 +33,8 @@ from boardfarm3.lib.shell_prompt import DEFAULT_BASH_SHELL_PROMPT_PATTERN
 from boardfarm3.lib.utils import get_nth_mac_address
 from pexpect.exceptions import ExceptionPexpect
 
+from boardfarm3_docsis.lib.cm_state import check_mac_state
+from boardfarm3_docsis.lib.cm_state_tracker import CmStateTracker
 from boardfarm3_docsis.templates.cmts import CMTS
 
 if TYPE_CHECKING:
@@ -57,25 +59,35 @@ class MiniCMTS(BoardfarmDevice, CMTS):
         super().__init__(config, cmdline_args)
         self._console: BoardfarmPexpect = None
         self._rtr_console: BoardfarmPexpect = None
+        self._tracker_console: BoardfarmPexpect | None = None
+        self._cm_state_tracker: CmStateTracker | None = None
         self._shell_prompt = ["Topvision(.*)>", "Topvision(.*)#"]
         self._router_shell_prompt = [DEFAULT_BASH_SHELL_PROMPT_PATTERN]
 
-    def _additional_shell_setup(self) -> None:
-        """Additional shell initialization steps."""
-        self._console.login_to_server(password=self._config.get("password", "admin"))
-        self._console.execute_command("enable")
+    def _additional_shell_setup(self, console: BoardfarmPexpect) -> None:
+        """Additional shell initialization steps.
+
+        :param console: CMTS console connection
+        """
+        console.login_to_server(password=self._config.get("password", "admin"))
+        console.execute_command("enable")
         # Change terminal length to inf in order to avoid pagination
-        self._console.execute_command("terminal length 0")
+        console.execute_command("terminal length 0")
         # Increase connection timeout until better solution
-        self._console.execute_command("config terminal")
-        self._console.execute_command("line vty")
-        self._console.execute_command("exec-timeout 60")
-        self._console.execute_command("end")
+        console.execute_command("config terminal")
+        console.execute_command("line vty")
+        console.execute_command("exec-timeout 60")
+        console.execute_command("end")
 
-    def _connect_to_console(self) -> None:
-        self._console = connection_factory(
+    def _create_console(self, connection_name: str) -> BoardfarmPexpect:
+        """Open a CMTS console connection.
+
+        :param connection_name: name of the connection
+        :returns: CMTS console connection, logged in and in enable mode
+        """
+        console = connection_factory(
             self._config.get("connection_type"),
-            f"{self.device_name}.console",
+            connection_name,
             username=self._config.get("username", "admin"),
             password=self._config.get("password", "admin"),
             ip_addr=self._config.get("ipaddr"),
@@ -83,7 +95,11 @@ class MiniCMTS(BoardfarmDevice, CMTS):
             shell_prompt=self._shell_prompt,
             save_console_logs=self._cmdline_args.save_console_logs,
         )
-        self._additional_shell_setup()
+        self._additional_shell_setup(console)
+        return console
+
+    def _connect_to_console(self) -> None:
+        self._console = self._create_console(f"{self.device_name}.console")
 
     def _connect_to_rtr_console(self) -> None:
         """Create FRR router connection."""
@@ -147,22 +163,17 @@ class MiniCMTS(BoardfarmDevice, CMTS):
         if self._console is not None:
             self._console.close()
             self._console = None
+        self.stop_cm_state_tracker()
 
-    @connect_and_run
-    def _get_cable_modem_table_data(
-        self, mac_address: str, column_name: str
-    ) -> str | None:
-        """Get given cable modem information on CMTS.
+    @staticmethod
+    def _parse_cable_modem_table(output: str) -> pd.DataFrame:
+        """Parse the output of the show cable modem command.
 
-        :param mac_address: cable modem mac address
-        :type mac_address: str
-        :param column_name: cable modem data column name
-        :type column_name: str
-        :returns: cable modem column data, None if not available
-        :rtype: str
+        :param output: show cable modem command output
+        :type output: str
+        :return: cable modem table, indexed by MAC address in CMTS format
+        :rtype: pd.DataFrame
         """
-        mac_address = self._convert_mac_address(mac_address)
-        output = self._console.execute_command("show cable modem")
         columns = [
             "MAC_ADDRESS",
             "IP_ADDRESS",
@@ -175,7 +186,7 @@ class MiniCMTS(BoardfarmDevice, CMTS):
             "BPI_ENABLED",
             "ONLINE_TIME",
         ]
-        csv = pd.read_csv(
+        return pd.read_csv(
             StringIO(output),
             skiprows=2,
             skipfooter=1,
@@ -186,6 +197,89 @@ class MiniCMTS(BoardfarmDevice, CMTS):
             index_col="MAC_ADDRESS",
             dtype=None,
         )
+
+    @connect_and_run
+    def _get_cable_modem_table(self) -> pd.DataFrame:
+        """Return the cable modem table of the CMTS.
+
+        :return: cable modem table, indexed by MAC address in CMTS format
+        :rtype: pd.DataFrame
+        """
+        return self._parse_cable_modem_table(
+            self._console.execute_command("show cable modem")
+        )
+
+    def _fetch_cable_modem_states(self) -> dict[str, str]:
+        """Fetch the MAC state of all the cable modems, on the tracker console.
+
+        :return: MAC state of each cable modem, keyed by MAC address
+        :rtype: dict[str, str]
+        """
+        if self._tracker_console is None or self._tracker_console.closed:
+            self._tracker_console = self._create_console(f"{self.device_name}.tracker")
+        try:
+            output = self._tracker_console.execute_command("show cable modem")
+        except ExceptionPexpect:
+            # reconnect on the next sample
+            self._tracker_console.close()
+            raise
+        csv = self._parse_cable_modem_table(output)
+        return {str(mac): str(state) for mac, state in csv["MAC_STATE"].items()}
+
+    def start_cm_state_tracker(
+        self, interval: float = 5.0, history_size: int = 4096
+    ) -> CmStateTracker:
+        """Start sampling the MAC states of the cable modems in the background.
+
+        The modem table is fetched on a dedicated console connection, so the
+        tracker runs alongside the other CMTS commands.
+
+        :param interval: seconds between two samples, defaults to 5.0
+        :type interval: float
+        :param history_size: number of transitions kept, defaults to 4096
+        :type history_size: int
+        :return: running tracker, the existing one if already started
+        :rtype: CmStateTracker
+        """
+        if self._cm_state_tracker is None:
+            self._cm_state_tracker = CmStateTracker(
+                self._fetch_cable_modem_states, interval, history_size
+            )
+        self._cm_state_tracker.start()
+        return self._cm_state_tracker
+
+    def stop_cm_state_tracker(self) -> None:
+        """Stop the background sampling and close its console connection."""
+        if self._cm_state_tracker is not None:
+            self._cm_state_tracker.stop()
+            self._cm_state_tracker = None
+        if self._tracker_console is not None:
+            self._tracker_console.close()
+            self._tracker_console = None
+
+    @property
+    def cm_state_tracker(self) -> CmStateTracker | None:
+        """Background tracker of the MAC state transitions.
+
+        :return: tracker, None if not started
+        :rtype: CmStateTracker | None
+        """
+        return self._cm_state_tracker
+
+    def _get_cable_modem_table_data(
+        self, mac_address: str, column_name: str
+    ) -> str | None:
+        """Get given cable modem information on CMTS.
+
+        :param mac_address: cable modem mac address
+        :type mac_address: str
+        :param column_name: cable modem data column name
+        :type column_name: str
+        :returns: cable modem column data, None if not available
+        :rtype: str
+        """
+        mac_address = self._convert_mac_address(mac_address)
+        csv = self._get_cable_modem_table()
         return (
             str(csv.loc[mac_address][column_name]) if mac_address in csv.index else None
         )  # pylint: disable=no-member # known issue
@@ -255,27 +349,32 @@ class MiniCMTS(BoardfarmDevice, CMTS):
         :param ignore_cpe: ignore CPE. defaults to False.
         :returns: True when cable is online on cmts, otherwise False
         """
-        status = self._get_cable_modem_status(mac_address)
-        is_modem_online = False
-        if status is None:
-            _LOGGER.info("Cable modem status is unknown")
-        elif "offline" in status:
-            _LOGGER.info("Cable modem is %s", status)
-        elif "init" in status:
-            _LOGGER.info("Cable modem is initializing: %s", status)
-        elif "online" not in status:
-            _LOGGER.info("Cable modem in unknown state: %s", status)
-        elif not ignore_bpi and re.search(r"online\(p(t|k)", status) is None:
-            _LOGGER.info("Cable modem in BPI is disabled: %s", status)
-        elif not ignore_partial and re.search(r"p-online", status) is not None:
-            _LOGGER.info("Cable modem in partial service: %s", status)
-        elif not ignore_cpe and re.search(r"online\(d", status) is not None:
-            _LOGGER.info("Cable modem is prohibited from forwarding data: %s", status)
-        else:
-            _LOGGER.info("Cable modem is online: %s", status)
-            is_modem_online = True
+        is_modem_online, description = check_mac_state(
+            self._get_cable_modem_status(mac_address),
+            ignore_bpi=ignore_bpi,
+            ignore_partial=ignore_partial,
+            ignore_cpe=ignore_cpe,
+        )
+        _LOGGER.info(description)
         return is_modem_online
 
+    def get_cable_modem_states(self, mac_addresses: list[str]) -> dict[str, str | None]:
+        """Get the MAC state of several cable modems from one CMTS query.
+
+        :param mac_addresses: cable modem mac addresses
+        :type mac_addresses: list[str]
+        :returns: MAC state of each cable modem, None if not found on the CMTS
+        :rtype: dict[str, str | None]
+        """
+        csv = self._get_cable_modem_table()
+        states: dict[str, str | None] = {}
+        for mac_address in mac_addresses:
+            cmts_mac = self._convert_mac_address(mac_address)
+            states[mac_address] = (
+                str(csv.loc[cmts_mac]["MAC_STATE"]) if cmts_mac in csv.index else None
+            )  # pylint: disable=no-member # known issue
+        return states
+
     @connect_and_run
     def reset_cable_modem_status(self, mac_address: str) -> None:
         """Reset given cable modem status on cmts.
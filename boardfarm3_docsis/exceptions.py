@@ -6,10 +6,22 @@ from boardfarm3.exceptions import BoardfarmException
 class ConfigEncodingError(BoardfarmException):
     """Raise this on docsis config encoding error."""
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, details: str = ""):
         """Raise this on docsis config encoding error.
 
         :param filename: filename for encode
         :type filename: str
+        :param details: encoder diagnostics, e.g. its error output
+        :type details: str
         """
-        super().__init__(f"Failed to encode modem config {filename}")
+        self.details = details.strip()
+        message = f"Failed to encode modem config {filename}"
+        super().__init__(f"{message}: {self.details}" if self.details else message)
+
+
+class NativeEncodingError(BoardfarmException):
+    """Raise this when a config cannot be encoded by the native encoder."""
+
+
+class ConfigDecodingError(BoardfarmException):
+    """Raise this when an encoded docsis config file is malformed."""
@@ -0,0 +1,315 @@
+"""DOCSIS provisioner address plan."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from functools import cached_property
+from ipaddress import (
+    IPv4Address,
+    IPv4Network,
+    IPv6Address,
+    IPv6Interface,
+    IPv6Network,
+)
+from itertools import combinations
+from typing import Any
+
+from boardfarm3.exceptions import ConfigurationFailure
+
+_LOGGER = logging.getLogger(__name__)
+
+# As per docsis, /56 must be the default pd length
+# Changing the PD to /60 from /56 to update ITC V6 IP scope
+_DELEGATED_PREFIX_LENGTH = 60
+# number of delegated prefixes, at the end of the eRouter network, served
+# dynamically to unknown hosts
+_DYNAMIC_PREFIX_COUNT = 10
+# offset of the dynamic pools from the start of the IPv4 networks
+_IPV4_POOL_OFFSET = 5
+# offset of the fixed CPE addresses from the start of the open IPv6 network
+_CPE_IPV6_OFFSET = 0x10000
+
+
+@dataclass(frozen=True)
+class AddressPool:
+    """Range of dynamically served addresses within a network."""
+
+    network: IPv4Network | IPv6Network
+    start: IPv4Address | IPv6Address
+    end: IPv4Address | IPv6Address
+
+    def overlaps(self, other: AddressPool) -> bool:
+        """Check whether two pools share any address.
+
+        :param other: pool to compare with
+        :type other: AddressPool
+        :return: True if the pools overlap
+        :rtype: bool
+        """
+        return self.start.version == other.start.version and (
+            int(self.start) <= int(other.end) and int(other.start) <= int(self.end)
+        )
+
+
+@dataclass(frozen=True)
+class StationAddresses:
+    """Fixed eRouter addresses reserved for a station."""
+
+    delegated_prefix: IPv6Network
+    erouter_address: IPv6Address
+
+
+# pylint: disable-next=too-many-instance-attributes
+class AddressPlan:
+    """Pools and per station reservations of a DOCSIS provisioner.
+
+    The plan is computed once from the provisioner inventory config and
+    checked for overlaps. Station reservations are precomputed for
+    ``max_stations`` stations and served in constant time.
+    """
+
+    def __init__(self, config: dict[str, Any], ipv6_prefix: int = 64) -> None:
+        """Compute the address plan of a provisioner.
+
+        :param config: provisioner inventory config
+        :type config: dict[str, Any]
+        :param ipv6_prefix: prefix length of the default IPv6 networks,
+            defaults to 64
+        :type ipv6_prefix: int
+        :raises ConfigurationFailure: when the fixed eRouter addresses are not
+            configured or the plan does not fit the networks
+        """
+        pool_size = int(config.get("pool_size", 120))
+        self.prov_network = IPv4Network(config.get("prov_network", "192.168.3.0/24"))
+        self.cm_pool = self._get_ipv4_pool(
+            config.get("cm_network", "192.168.200.0/24"), pool_size
+        )
+        self.mta_pool = self._get_ipv4_pool(
+            config.get("mta_network", "192.168.201.0/24"), pool_size
+        )
+        self.open_pool = self._get_ipv4_pool(
+            config.get("open_network", "192.168.202.0/24"), pool_size
+        )
+        cm_network_ipv6 = IPv6Interface(
+            config.get("cm_gateway_v6", f"2001:dead:beef:4::cafe/{ipv6_prefix}")
+        ).network
+        self.cm_pool_v6 = AddressPool(
+            cm_network_ipv6,
+            IPv6Address(config.get("cm_network_v6_start", "2001:dead:beef:4::10")),
+            IPv6Address(config.get("cm_network_v6_end", "2001:dead:beef:4::100")),
+        )
+        open_network_ipv6 = IPv6Interface(
+            config.get("open_gateway_v6", f"2001:dead:beef:6::cafe/{ipv6_prefix}")
+        ).network
+        self.open_pool_v6 = AddressPool(
+            open_network_ipv6,
+            IPv6Address(config.get("open_network_v6_start", "2001:dead:beef:6::10")),
+            IPv6Address(config.get("open_network_v6_end", "2001:dead:beef:6::100")),
+        )
+        # Increment IP by 200 hosts
+        self.open_host_pool_v6 = AddressPool(
+            open_network_ipv6,
+            self.open_pool_v6.start + 256 * 2,
+            self.open_pool_v6.end + 256 * 2,
+        )
+        self._erouter_network = IPv6Interface(
+            config.get("erouter_net", "2001:dead:beef:e000::/51")
+        ).network
+        self._prefix_count = 2 ** (
+            _DELEGATED_PREFIX_LENGTH - self._erouter_network.prefixlen
+        )
+        if not (fixed_ip_start := config.get("erouter_fixed_ip_start")):
+            msg = "erouter_fixed_ip_start is missing from the provisioner config"
+            raise ConfigurationFailure(msg)
+        self._erouter_fixed_ip_start = IPv6Interface(fixed_ip_start).ip
+        self.max_stations = int(
+            config.get("max_stations", self._prefix_count - _DYNAMIC_PREFIX_COUNT)
+        )
+        # fixed CPE addresses, a block of cpes_per_station addresses per station
+        self.cpes_per_station = int(config.get("cpes_per_station", 4))
+        self._cpe_fixed_ip_start = IPv4Address(
+            config.get("cpe_fixed_ip_start", self.open_pool.end + 1)
+        )
+        self._cpe_fixed_ip_start_v6 = IPv6Address(
+            config.get(
+                "cpe_fixed_ip_start_v6",
+                open_network_ipv6.network_address + _CPE_IPV6_OFFSET,
+            )
+        )
+        self._validate()
+
+    @staticmethod
+    def _get_ipv4_pool(network: str, pool_size: int) -> AddressPool:
+        ipv4_network = IPv4Network(network)
+        if _IPV4_POOL_OFFSET + pool_size >= ipv4_network.num_addresses - 1:
+            msg = f"Pool of {pool_size} addresses does not fit in {ipv4_network}"
+            raise ConfigurationFailure(msg)
+        return AddressPool(
+            ipv4_network,
+            ipv4_network[_IPV4_POOL_OFFSET],
+            ipv4_network[_IPV4_POOL_OFFSET + pool_size],
+        )
+
+    def _get_delegated_prefix(self, index: int) -> IPv6Network:
+        prefix_size = 2 ** (128 - _DELEGATED_PREFIX_LENGTH)
+        return IPv6Network(
+            (
+                self._erouter_network.network_address + index * prefix_size,
+                _DELEGATED_PREFIX_LENGTH,
+            )
+        )
+
+    @property
+    def dynamic_prefix_pool(self) -> AddressPool:
+        """Delegated prefixes served to unknown eRouters.
+
+        :return: pool of the last delegated prefixes of the eRouter network
+        :rtype: AddressPool
+        """
+        return AddressPool(
+            self._erouter_network,
+            self._get_delegated_prefix(
+                self._prefix_count - _DYNAMIC_PREFIX_COUNT
+            ).network_address,
+            self._get_delegated_prefix(self._prefix_count - 1).network_address,
+        )
+
+    @property
+    def delegated_prefix_length(self) -> int:
+        """Length of the prefixes delegated to the eRouters.
+
+        :return: prefix length
+        :rtype: int
+        """
+        return _DELEGATED_PREFIX_LENGTH
+
+    @cached_property
+    def _stations(self) -> tuple[StationAddresses, ...]:
+        return tuple(
+            StationAddresses(
+                self._get_delegated_prefix(index),
+                self._erouter_fixed_ip_start + index,
+            )
+            for index in range(self.max_stations)
+        )
+
+    def get_station(self, station_no: int) -> StationAddresses:
+        """Return the fixed eRouter addresses of a station.
+
+        :param station_no: station number, starting from 1
+        :type station_no: int
+        :raises ConfigurationFailure: when the station is not in the plan
+        :return: reserved addresses of the station
+        :rtype: StationAddresses
+        """
+        if not 1 <= station_no <= self.max_stations:
+            msg = (
+                f"Station {station_no} is out of the address plan "
+                f"(1-{self.max_stations})"
+            )
+            raise ConfigurationFailure(msg)
+        return self._stations[station_no - 1]
+
+    def get_cpe_addresses(
+        self, station_no: int, cpe_index: int
+    ) -> tuple[IPv4Address, IPv6Address]:
+        """Return the fixed addresses of a CPE of a station.
+
+        :param station_no: station number, starting from 1
+        :type station_no: int
+        :param cpe_index: index of the CPE within the station, starting from 0
+        :type cpe_index: int
+        :raises ConfigurationFailure: when the CPE is not in the plan
+        :return: fixed IPv4 and IPv6 addresses of the CPE
+        :rtype: tuple[IPv4Address, IPv6Address]
+        """
+        self.get_station(station_no)
+        if not 0 <= cpe_index < self.cpes_per_station:
+            msg = (
+                f"CPE {cpe_index + 1} of station {station_no} exceeds the "
+                f"{self.cpes_per_station} CPEs per station of the address plan, "
+                "raise cpes_per_station in the provisioner config"
+            )
+            raise ConfigurationFailure(msg)
+        offset = (station_no - 1) * self.cpes_per_station + cpe_index
+        ipv4_address = self._cpe_fixed_ip_start + offset
+        open_network = self.open_pool.network
+        if ipv4_address not in open_network or ipv4_address in (
+            open_network.network_address,
+            open_network.broadcast_address,
+        ):
+            msg = (
+                f"CPE {cpe_index + 1} of station {station_no} is out of "
+                f"{open_network} ({self.cpes_per_station} CPEs per station from "
+                f"{self._cpe_fixed_ip_start}), change cpe_fixed_ip_start or "
+                "cpes_per_station in the provisioner config"
+            )
+            raise ConfigurationFailure(msg)
+        return ipv4_address, self._cpe_fixed_ip_start_v6 + offset
+
+    def _validate_cpe_addresses(self) -> None:
+        cpe_pool = AddressPool(
+            self.open_pool.network, self._cpe_fixed_ip_start, self._cpe_fixed_ip_start
+        )
+        if self._cpe_fixed_ip_start not in self.open_pool.network or (
+            cpe_pool.overlaps(self.open_pool)
+        ):
+            msg = (
+                f"Fixed CPE addresses from {self._cpe_fixed_ip_start} are not in "
+                f"{self.open_pool.network} after the pool {self.open_pool.start}-"
+                f"{self.open_pool.end}"
+            )
+            raise ConfigurationFailure(msg)
+
+    def _validate(self) -> None:
+        """Check the plan for overlapping networks and reservations.
+
+        :raises ConfigurationFailure: on overlapping networks, prefixes or
+            fixed addresses
+        """
+        ipv4_networks = [
+            self.prov_network,
+            self.cm_pool.network,
+            self.mta_pool.network,
+            self.open_pool.network,
+        ]
+        for first, second in combinations(ipv4_networks, 2):
+            if first.overlaps(second):
+                msg = f"Provisioner networks {first} and {second} overlap"
+                raise ConfigurationFailure(msg)
+        for pool in (self.cm_pool_v6, self.open_pool_v6, self.open_host_pool_v6):
+            if pool.start not in pool.network or pool.end not in pool.network:
+                msg = f"Pool {pool.start}-{pool.end} is outside of {pool.network}"
+                raise ConfigurationFailure(msg)
+        self._validate_cpe_addresses()
+        if self._prefix_count <= _DYNAMIC_PREFIX_COUNT:
+            msg = (
+                f"{self._erouter_network} is too small for {_DYNAMIC_PREFIX_COUNT}"
+                f" dynamic /{_DELEGATED_PREFIX_LENGTH} prefixes"
+            )
+            raise ConfigurationFailure(msg)
+        if not 0 <= self.max_stations <= self._prefix_count - _DYNAMIC_PREFIX_COUNT:
+            msg = (
+                f"{self._erouter_network} cannot delegate a /"
+                f"{_DELEGATED_PREFIX_LENGTH} to {self.max_stations} stations"
+            )
+            raise ConfigurationFailure(msg)
+        self._validate_erouter_addresses()
+
+    def _validate_erouter_addresses(self) -> None:
+        if not self.max_stations:
+            return
+        fixed_pool = AddressPool(
+            self.open_pool_v6.network,
+            self._erouter_fixed_ip_start,
+            self._erouter_fixed_ip_start + (self.max_stations - 1),
+        )
+        for pool in (self.cm_pool_v6, self.open_pool_v6, self.open_host_pool_v6):
+            if fixed_pool.overlaps(pool):
+                msg = (
+                    f"Fixed eRouter addresses {fixed_pool.start}-{fixed_pool.end} "
+                    f"of {self.max_stations} stations overlap pool {pool.start}-"
+                    f"{pool.end}, change erouter_fixed_ip_start or max_stations"
+                )
+                raise ConfigurationFailure(msg)
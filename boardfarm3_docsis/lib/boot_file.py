@@ -0,0 +1,433 @@
+"""DOCSIS config text file parser, AST and serializer.
+
+Boot files are parsed once into statements and comments, edited
+structurally and serialized back to text:
+
+.. code-block:: python
+
+    boot_file = BootFile(board.sw.get_boot_file())
+    for statement in boot_file.get_statements("GlobalPrivacyEnable"):
+        statement.values = ["0"]
+    boot_file.to_text()
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_TOKEN_REGEX = re.compile(
+    r'(?P<comment>/\*.*?\*/|//[^\n]*)|(?P<token>"[^"]*"|[{};]|[^\s{};"]+)',
+    re.DOTALL,
+)
+# the MIC hooks, config TLVs are inserted before them
+CM_MIC_COMMENT = "CmMic"
+
+
+@dataclass
+class ConfigComment:
+    """Comment of a DOCSIS config text file, with its delimiters."""
+
+    text: str
+
+
+@dataclass
+class ConfigStatement:
+    """Statement of a DOCSIS config text file.
+
+    Blocks, e.g. VendorSpecific, have children and no values. A comment on
+    the same line after the statement, or after the closing brace of a
+    block, belongs to the statement.
+    """
+
+    name: str
+    values: list[str] = field(default_factory=list)
+    children: list[ConfigNode] | None = None
+    comment: str | None = None
+
+    @property
+    def statements(self) -> list[ConfigStatement]:
+        """Child statements of a block, without the comments.
+
+        :return: child statements, empty for scalar statements
+        :rtype: list[ConfigStatement]
+        """
+        return [
+            child for child in self.children or [] if isinstance(child, ConfigStatement)
+        ]
+
+    def get_children(self, name: str) -> list[ConfigStatement]:
+        """Return the child statements of a name.
+
+        :param name: statement name, e.g. VendorIdentifier
+        :type name: str
+        :return: child statements of that name, in file order
+        :rtype: list[ConfigStatement]
+        """
+        return [child for child in self.statements if child.name == name]
+
+
+ConfigNode = ConfigStatement | ConfigComment
+
+
+class _Parser:
+    """Recursive descent parser of DOCSIS config text files."""
+
+    def __init__(self, config: str, keep_comments: bool) -> None:
+        self._config = config
+        self._tokens = [
+            (str(match.lastgroup), match[str(match.lastgroup)], match.start())
+            for match in _TOKEN_REGEX.finditer(config)
+        ]
+        self._keep_comments = keep_comments
+        self._position = 0
+        self._comments: list[ConfigNode] = []
+
+    def _peek(self) -> str | None:
+        """Return the next token, collecting the comments before it.
+
+        :return: next token, None at the end of the config
+        :rtype: str | None
+        """
+        while self._position < len(self._tokens):
+            kind, text, _ = self._tokens[self._position]
+            if kind == "token":
+                return text
+            if self._keep_comments:
+                self._comments.append(ConfigComment(text))
+            self._position += 1
+        return None
+
+    def _parse_trailing_comment(self, statement: ConfigStatement) -> None:
+        """Attach a comment on the same line as the end of a statement.
+
+        :param statement: statement just parsed, up to its ; or }
+        :type statement: ConfigStatement
+        """
+        if self._position >= len(self._tokens):
+            return
+        kind, text, start = self._tokens[self._position]
+        _, previous, previous_start = self._tokens[self._position - 1]
+        if (
+            kind == "comment"
+            and "\n" not in self._config[previous_start + len(previous) : start]
+        ):
+            if self._keep_comments:
+                statement.comment = text
+            self._position += 1
+
+    def _flush_comments(self, nodes: list[ConfigNode]) -> None:
+        nodes.extend(self._comments)
+        self._comments = []
+
+    def _parse_values(self, statement: ConfigStatement) -> None:
+        while (token := self._peek()) not in {None, ";"}:
+            if token in {"{", "}"}:
+                msg = f"Unexpected {token} in {statement.name}"
+                raise ValueError(msg)
+            statement.values.append(str(token))
+            self._position += 1
+        if token is None:
+            msg = f"Missing ; after {statement.name}"
+            raise ValueError(msg)
+        self._position += 1
+
+    def parse_block(self) -> list[ConfigNode]:
+        """Parse statements up to the end of the enclosing block.
+
+        :raises ValueError: on syntax errors
+        :return: statements and comments of the block
+        :rtype: list[ConfigNode]
+        """
+        nodes: list[ConfigNode] = []
+        while (token := self._peek()) not in {None, "}"}:
+            self._flush_comments(nodes)
+            statement = ConfigStatement(str(token))
+            self._position += 1
+            if self._peek() == "{":
+                self._position += 1
+                statement.children = self.parse_block()
+                if self._peek() is None:
+                    msg = f"Unterminated {statement.name} block"
+                    raise ValueError(msg)
+                self._position += 1
+            else:
+                self._parse_values(statement)
+            self._parse_trailing_comment(statement)
+            nodes.append(statement)
+        self._flush_comments(nodes)
+        return nodes
+
+    def parse(self) -> list[ConfigNode]:
+        """Parse the whole config.
+
+        :raises ValueError: on syntax errors
+        :return: top level statements and comments
+        :rtype: list[ConfigNode]
+        """
+        nodes = self.parse_block()
+        if self._peek() is not None:
+            msg = "Unbalanced } in config"
+            raise ValueError(msg)
+        return nodes
+
+
+def parse_config(config: str, keep_comments: bool = False) -> list[ConfigNode]:
+    """Parse a DOCSIS config text file.
+
+    :param config: config text
+    :type config: str
+    :param keep_comments: keep the comments in the AST, defaults to False
+    :type keep_comments: bool
+    :raises ValueError: on syntax errors
+    :return: top level statements, usually a single Main block
+    :rtype: list[ConfigNode]
+    """
+    return _Parser(config, keep_comments).parse()
+
+
+def _serialize(nodes: list[ConfigNode], depth: int, lines: list[str]) -> None:
+    prefix = "\t" * depth
+    for node in nodes:
+        if isinstance(node, ConfigComment):
+            lines.append(f"{prefix}{node.text}")
+            continue
+        comment = f" {node.comment}" if node.comment else ""
+        if node.children is None:
+            lines.append(f"{prefix}{' '.join([node.name, *node.values])};{comment}")
+        else:
+            lines.extend([f"{prefix}{node.name}", f"{prefix}{{"])
+            _serialize(node.children, depth + 1, lines)
+            lines.append(f"{prefix}}}{comment}")
+
+
+def serialize_config(nodes: list[ConfigNode]) -> str:
+    """Serialize an AST back to config text.
+
+    The output is tab indented with one statement or comment per line, the
+    trailing comment of a statement on the same line, so that parsing it
+    again gives the same AST.
+
+    :param nodes: top level statements and comments
+    :type nodes: list[ConfigNode]
+    :return: config text
+    :rtype: str
+    """
+    lines: list[str] = []
+    _serialize(nodes, 0, lines)
+    return "\n".join(lines) + "\n"
+
+
+def _normalize_vendor_id(vendor_id: str) -> str:
+    return vendor_id.lower().removeprefix("0x")
+
+
+class BootFile:
+    """CM config text file, parsed once and indexed for structural edits.
+
+    Statements are indexed by name and VendorSpecific blocks by vendor
+    identifier. Statement values can be edited in place, insertions and
+    removals go through the methods of this class.
+    """
+
+    def __init__(self, config: str) -> None:
+        """Parse a CM config text file.
+
+        :param config: config text
+        :type config: str
+        :raises ValueError: on syntax errors
+        """
+        self._nodes = parse_config(config, keep_comments=True)
+        self._index: dict[str, list[ConfigStatement]] | None = None
+        self._vendor_index: dict[str, list[ConfigStatement]] = {}
+        self._parents: dict[int, ConfigStatement | None] = {}
+
+    @property
+    def main(self) -> ConfigStatement:
+        """Main block of the config.
+
+        :raises ValueError: when the config has no Main block
+        :return: Main block
+        :rtype: ConfigStatement
+        """
+        for node in self._nodes:
+            if isinstance(node, ConfigStatement) and node.children is not None:
+                return node
+        msg = "Config has no Main block"
+        raise ValueError(msg)
+
+    def _walk(
+        self, nodes: list[ConfigNode], parent: ConfigStatement | None
+    ) -> Iterator[tuple[ConfigStatement, ConfigStatement | None]]:
+        for node in nodes:
+            if isinstance(node, ConfigStatement):
+                yield node, parent
+                if node.children is not None:
+                    yield from self._walk(node.children, node)
+
+    def _get_index(self) -> dict[str, list[ConfigStatement]]:
+        if self._index is None:
+            self._index, self._vendor_index, self._parents = {}, {}, {}
+            for statement, parent in self._walk(self._nodes, None):
+                self._index.setdefault(statement.name, []).append(statement)
+                self._parents[id(statement)] = parent
+                if (
+                    statement.name == "VendorIdentifier"
+                    and statement.values
+                    and parent is not None
+                ):
+                    self._vendor_index.setdefault(
+                        _normalize_vendor_id(statement.values[0]), []
+                    ).append(parent)
+        return self._index
+
+    def get_statements(self, name: str) -> list[ConfigStatement]:
+        """Return the statements of a name, at any depth.
+
+        :param name: statement name, e.g. InitializationMode
+        :type name: str
+        :return: statements of that name, in file order
+        :rtype: list[ConfigStatement]
+        """
+        return list(self._get_index().get(name, []))
+
+    def get_vendor_blocks(self, vendor_id: str) -> list[ConfigStatement]:
+        """Return the VendorSpecific blocks of a vendor.
+
+        :param vendor_id: vendor identifier, e.g. 0x0050F1
+        :type vendor_id: str
+        :return: VendorSpecific blocks of that vendor, in file order
+        :rtype: list[ConfigStatement]
+        """
+        self._get_index()
+        return list(self._vendor_index.get(_normalize_vendor_id(vendor_id), []))
+
+    def get_vendor_id(self) -> str | None:
+        """Return the first vendor identifier of the config.
+
+        :return: hexadecimal vendor identifier as written, without the 0x
+            prefix, None if the config has none
+        :rtype: str | None
+        """
+        for statement in self.get_statements("VendorIdentifier"):
+            if statement.values:
+                vendor_id = statement.values[0]
+                return (
+                    vendor_id[2:] if vendor_id.lower().startswith("0x") else vendor_id
+                )
+        return None
+
+    def _find_comment(self, text: str) -> tuple[list[ConfigNode], int] | None:
+        pending = [self._nodes]
+        while pending:
+            nodes = pending.pop(0)
+            for position, node in enumerate(nodes):
+                if isinstance(node, ConfigComment) and text in node.text:
+                    return nodes, position
+                if isinstance(node, ConfigStatement) and node.children is not None:
+                    pending.append(node.children)
+        return None
+
+    def has_comment(self, text: str) -> bool:
+        """Check whether a comment contains the given text.
+
+        :param text: text to look for, e.g. CmMic
+        :type text: str
+        :return: True if a comment, trailing comments included, contains the
+            text
+        :rtype: bool
+        """
+        return self._find_comment(text) is not None or any(
+            text in (statement.comment or "")
+            for statement, _ in self._walk(self._nodes, None)
+        )
+
+    def insert(self, nodes: list[ConfigNode], before_comment: str = "") -> None:
+        """Insert statements and comments in the Main block.
+
+        The nodes go before the first comment containing ``before_comment``,
+        or else before the CM MIC hook, or else at the end of the Main block.
+
+        :param nodes: statements and comments to insert
+        :type nodes: list[ConfigNode]
+        :param before_comment: text of the comment to insert before,
+            defaults to the CM MIC hook
+        :type before_comment: str
+        """
+        location = (before_comment and self._find_comment(before_comment)) or (
+            self._find_comment(CM_MIC_COMMENT)
+        )
+        if location:
+            siblings, position = location
+        else:
+            siblings = self.main.children or []
+            position = len(siblings)
+        siblings[position:position] = nodes
+        self._index = None
+
+    def insert_after(self, statement: ConfigStatement, nodes: list[ConfigNode]) -> None:
+        """Insert statements and comments after a statement.
+
+        The nodes go after the trailing comment of the statement, if any.
+
+        :param statement: statement of this config
+        :type statement: ConfigStatement
+        :param nodes: statements and comments to insert
+        :type nodes: list[ConfigNode]
+        """
+        self._get_index()
+        parent = self._parents[id(statement)]
+        siblings = self._nodes if parent is None else parent.children or []
+        position = next(
+            index for index, node in enumerate(siblings) if node is statement
+        )
+        siblings[position + 1 : position + 1] = nodes
+        self._index = None
+
+    def remove(self, statement: ConfigStatement) -> None:
+        """Remove a statement, and the blocks it leaves empty.
+
+        A block is empty once it has no statement left, or only its
+        VendorIdentifier for a VendorSpecific block.
+
+        :param statement: statement of this config
+        :type statement: ConfigStatement
+        """
+        self._get_index()
+        parent = self._parents[id(statement)]
+        siblings = self._nodes if parent is None else parent.children or []
+        siblings[:] = [node for node in siblings if node is not statement]
+        self._index = None
+        if (
+            parent is not None
+            and parent is not self.main
+            and all(child.name == "VendorIdentifier" for child in parent.statements)
+        ):
+            self.remove(parent)
+
+    def remove_comments(self, text: str) -> None:
+        """Remove the comments containing the given text.
+
+        Trailing comments are removed from their statements.
+
+        :param text: text to look for
+        :type text: str
+        """
+        while location := self._find_comment(text):
+            siblings, position = location
+            del siblings[position]
+        for statement, _ in self._walk(self._nodes, None):
+            if text in (statement.comment or ""):
+                statement.comment = None
+
+    def to_text(self) -> str:
+        """Serialize the config back to text.
+
+        :return: config text
+        :rtype: str
+        """
+        return serialize_config(self._nodes)
@@ -0,0 +1,231 @@
+"""Session store of the boot files of the cable modems."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from boardfarm3_docsis.lib.boot_file import BootFile
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3_docsis.templates.cable_modem import CableModem
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BootFileSnapshot:
+    """Immutable version of the boot files of a board.
+
+    The MTA boot file is fetched and the facts derived from the CM boot file
+    are computed on first access.
+    """
+
+    cm_mac: str
+    version: int
+    cm_boot_file: str
+    fetch_mta_boot_file: Callable[[], str] = field(repr=False, compare=False)
+
+    @cached_property
+    def mta_boot_file(self) -> str:
+        """MTA boot file, fetched on first access.
+
+        :return: MTA boot file
+        :rtype: str
+        """
+        return self.fetch_mta_boot_file()
+
+    @cached_property
+    def digest(self) -> str:
+        """Hash of the CM and MTA boot files.
+
+        :return: SHA-256 hex digest
+        :rtype: str
+        """
+        digest = hashlib.sha256(self.cm_boot_file.encode())
+        digest.update(b"\0")
+        digest.update(self.mta_boot_file.encode())
+        return digest.hexdigest()
+
+    @cached_property
+    def _boot_file(self) -> BootFile:
+        return BootFile(self.cm_boot_file)
+
+    @cached_property
+    def vendor_id(self) -> str | None:
+        """First VendorIdentifier of the CM boot file, without the 0x prefix.
+
+        :return: hexadecimal vendor identifier, None if there is none
+        :rtype: str | None
+        """
+        return self._boot_file.get_vendor_id()
+
+    @cached_property
+    def is_bpi_privacy_disabled(self) -> bool:
+        """Whether GlobalPrivacyEnable is set to 0 in the CM boot file.
+
+        :return: True if BPI privacy is disabled
+        :rtype: bool
+        """
+        return any(
+            statement.values == ["0"]
+            for statement in self._boot_file.get_statements("GlobalPrivacyEnable")
+        )
+
+    @cached_property
+    def initialization_mode(self) -> str | None:
+        """First eRouter InitializationMode value of the CM boot file.
+
+        :return: InitializationMode value, None if there is none
+        :rtype: str | None
+        """
+        for statement in self._boot_file.get_statements("InitializationMode"):
+            if statement.values:
+                return statement.values[0]
+        return None
+
+
+class BootFileStore:
+    """Boot files of the boards, fetched once per session.
+
+    Every board boot file is fetched on first use only, and again on the
+    first use after ``invalidate()``, e.g. once the board is provisioned.
+    The MTA boot file is only fetched when it is used. A new version is
+    recorded when the CM boot file changed or when ``update()`` is given new
+    boot files, the previous versions are kept.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty boot file store."""
+        self._versions: dict[str, list[BootFileSnapshot]] = {}
+        self._invalidated: set[str] = set()
+        self._lock = threading.Lock()
+
+    def _add_version(
+        self,
+        cm_mac: str,
+        cm_boot_file: str,
+        fetch_mta_boot_file: Callable[[], str],
+        is_mta_updated: bool = False,
+    ) -> BootFileSnapshot:
+        self._invalidated.discard(cm_mac)
+        versions = self._versions.setdefault(cm_mac, [])
+        if (
+            versions
+            and versions[-1].cm_boot_file == cm_boot_file
+            and not is_mta_updated
+        ):
+            # same version, with the MTA boot file fetched again
+            versions[-1] = BootFileSnapshot(
+                cm_mac, versions[-1].version, cm_boot_file, fetch_mta_boot_file
+            )
+            return versions[-1]
+        snapshot = BootFileSnapshot(
+            cm_mac, len(versions) + 1, cm_boot_file, fetch_mta_boot_file
+        )
+        versions.append(snapshot)
+        _LOGGER.debug("Boot files of %s at version %s", cm_mac, snapshot.version)
+        return snapshot
+
+    def get(self, board: CableModem) -> BootFileSnapshot:
+        """Return the current boot files of a board, fetching them once.
+
+        :param board: Cable Modem device instance
+        :type board: CableModem
+        :return: current boot files of the board
+        :rtype: BootFileSnapshot
+        """
+        with self._lock:
+            if (
+                versions := self._versions.get(board.hw.mac_address)
+            ) and board.hw.mac_address not in self._invalidated:
+                return versions[-1]
+            return self._add_version(
+                board.hw.mac_address,
+                board.sw.get_boot_file(),
+                board.sw.get_mta_boot_file,
+            )
+
+    def refresh(self, board: CableModem) -> BootFileSnapshot:
+        """Fetch the boot files of a board again.
+
+        :param board: Cable Modem device instance
+        :type board: CableModem
+        :return: current boot files, a new version if the CM boot file changed
+        :rtype: BootFileSnapshot
+        """
+        with self._lock:
+            return self._add_version(
+                board.hw.mac_address,
+                board.sw.get_boot_file(),
+                board.sw.get_mta_boot_file,
+            )
+
+    def update(
+        self,
+        board: CableModem,
+        cm_boot_file: str | None = None,
+        mta_boot_file: str | None = None,
+    ) -> BootFileSnapshot:
+        """Record new boot files for a board, e.g. after provisioning.
+
+        :param board: Cable Modem device instance
+        :type board: CableModem
+        :param cm_boot_file: CM boot file, defaults to the current one
+        :type cm_boot_file: str | None
+        :param mta_boot_file: MTA boot file, defaults to the current one
+        :type mta_boot_file: str | None
+        :return: current boot files, a new version if they changed
+        :rtype: BootFileSnapshot
+        """
+        current = self.get(board)
+        is_mta_updated = (
+            mta_boot_file is not None and mta_boot_file != current.mta_boot_file
+        )
+        with self._lock:
+            return self._add_version(
+                board.hw.mac_address,
+                current.cm_boot_file if cm_boot_file is None else cm_boot_file,
+                (
+                    (lambda: current.mta_boot_file)
+                    if mta_boot_file is None
+                    else (lambda: mta_boot_file)
+                ),
+                is_mta_updated,
+            )
+
+    def invalidate(self, board: CableModem) -> None:
+        """Fetch the boot files of a board again on their next use.
+
+        :param board: Cable Modem device instance
+        :type board: CableModem
+        """
+        with self._lock:
+            self._invalidated.add(board.hw.mac_address)
+
+    def get_versions(self, board: CableModem) -> list[BootFileSnapshot]:
+        """Return all the recorded versions of a board boot files.
+
+        :param board: Cable Modem device instance
+        :type board: CableModem
+        :return: versions, oldest first
+        :rtype: list[BootFileSnapshot]
+        """
+        with self._lock:
+            return list(self._versions.get(board.hw.mac_address, []))
+
+    def clear(self) -> None:
+        """Forget the boot files of all the boards."""
+        with self._lock:
+            self._versions.clear()
+            self._invalidated.clear()
+
+
+# boot files of the boards of the test session
+BOOT_FILE_STORE = BootFileStore()
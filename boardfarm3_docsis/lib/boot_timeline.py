@@ -0,0 +1,202 @@
+"""Boot timeline of the cable modems of a test session.
+
+The MAC state transitions observed on the CMTS, the boot log markers and
+the boot stages run by the use cases are timestamped per board, so that a
+slow boot can be split into ranging, DHCP, TFTP and our own finalization
+time:
+
+.. code-block:: python
+
+    BOOT_TIMELINE.record_reset(cm_mac)
+    BOOT_TIMELINE.record_mac_state(cm_mac, "init(r1)")
+    with BOOT_TIMELINE.stage(cm_mac, "finalize_boot"):
+        board.sw.finalize_boot()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+RESET_EVENT = "reset"
+MAC_STATE_EVENT = "mac_state"
+STAGE_EVENT = "stage"
+BOOT_LOG_EVENT = "boot_log"
+
+
+@dataclass
+class BootEvent:
+    """Timestamped event of a board boot.
+
+    The duration of a MAC state lasts until the next MAC state observed,
+    the duration of a stage until the stage completes. A boot log marker
+    has no duration, it showed up within the ``window`` seconds after its
+    start, the boot logs being read in slices.
+    """
+
+    kind: str
+    name: str
+    start: float
+    duration: float | None = None
+    window: float | None = None
+
+
+class BootTimelineRecorder:
+    """Per board timelines of the boot events, keyed by CM MAC address."""
+
+    def __init__(self) -> None:
+        """Initialize an empty boot timeline recorder."""
+        self._timelines: dict[str, list[BootEvent]] = {}
+        self._mac_states: dict[str, BootEvent] = {}
+        self._lock = threading.Lock()
+
+    def _add_event(self, cm_mac: str, event: BootEvent) -> None:
+        if event.kind in {RESET_EVENT, MAC_STATE_EVENT}:
+            if previous := self._mac_states.pop(cm_mac, None):
+                previous.duration = event.start - previous.start
+            if event.kind == MAC_STATE_EVENT:
+                self._mac_states[cm_mac] = event
+        self._timelines.setdefault(cm_mac, []).append(event)
+
+    def record_reset(self, cm_mac: str) -> None:
+        """Record the reset of a board, the start of a new boot.
+
+        :param cm_mac: CM MAC address of the board
+        :type cm_mac: str
+        """
+        with self._lock:
+            self._add_event(cm_mac, BootEvent(RESET_EVENT, RESET_EVENT, time.time()))
+
+    def record_mac_state(self, cm_mac: str, mac_state: str | None) -> None:
+        """Record a MAC state observed on the CMTS, if it changed.
+
+        :param cm_mac: CM MAC address of the board
+        :type cm_mac: str
+        :param mac_state: MAC state, e.g. init(r1), None if the cable modem is
+            not found on the CMTS
+        :type mac_state: str | None
+        """
+        name = mac_state or "unknown"
+        with self._lock:
+            current = self._mac_states.get(cm_mac)
+            if current is None or current.name != name:
+                self._add_event(cm_mac, BootEvent(MAC_STATE_EVENT, name, time.time()))
+
+    def record_boot_log(
+        self, cm_mac: str, name: str, start: float, window: float
+    ) -> None:
+        """Record a marker found in the boot logs of a board.
+
+        :param cm_mac: CM MAC address of the board
+        :type cm_mac: str
+        :param name: name of the marker
+        :type name: str
+        :param start: start time of the boot log slice holding the marker
+        :type start: float
+        :param window: seconds of the boot log slice holding the marker
+        :type window: float
+        """
+        with self._lock:
+            self._add_event(
+                cm_mac, BootEvent(BOOT_LOG_EVENT, name, start, window=window)
+            )
+
+    @contextmanager
+    def stage(self, cm_mac: str, name: str) -> Iterator[None]:
+        """Record the duration of a boot stage, e.g. finalize_boot.
+
+        :param cm_mac: CM MAC address of the board
+        :type cm_mac: str
+        :param name: name of the stage
+        :type name: str
+        :yield: while the stage runs
+        """
+        event = BootEvent(STAGE_EVENT, name, time.time())
+        with self._lock:
+            self._add_event(cm_mac, event)
+        try:
+            yield
+        finally:
+            event.duration = time.time() - event.start
+
+    def get_timelines(self) -> dict[str, list[dict[str, Any]]]:
+        """Return the boot timelines, relative to the first event of each board.
+
+        :return: events of each board, keyed by CM MAC address
+        :rtype: dict[str, list[dict[str, Any]]]
+        """
+        with self._lock:
+            timelines: dict[str, list[dict[str, Any]]] = {}
+            for cm_mac, events in self._timelines.items():
+                origin = events[0].start
+                timelines[cm_mac] = [
+                    {
+                        **asdict(event),
+                        "start": round(event.start - origin, 3),
+                        "duration": (
+                            None if event.duration is None else round(event.duration, 3)
+                        ),
+                        "window": (
+                            None if event.window is None else round(event.window, 3)
+                        ),
+                    }
+                    for event in events
+                ]
+            return timelines
+
+    def get_summary(self) -> pd.DataFrame:
+        """Return the time spent by each board in each MAC state and stage.
+
+        :return: seconds per CM MAC address (rows) and event name (columns)
+        :rtype: pd.DataFrame
+        """
+        rows = [
+            {"cm_mac": cm_mac, "event": event["name"], "duration": event["duration"]}
+            for cm_mac, events in self.get_timelines().items()
+            for event in events
+            if event["duration"] is not None
+        ]
+        if not rows:
+            return pd.DataFrame()
+        summary = pd.DataFrame(rows).pivot_table(
+            index="cm_mac", columns="event", values="duration", aggfunc="sum"
+        )
+        return summary.round(1)
+
+    def dump(self, path: str | None = None) -> None:
+        """Log the summary table and write the timelines as JSON.
+
+        :param path: JSON file to write, defaults to logging the summary only
+        :type path: str | None
+        """
+        if not self._timelines:
+            return
+        _LOGGER.info("Boot timeline summary (s):\n%s", self.get_summary().to_string())
+        if path:
+            Path(path).write_text(
+                json.dumps(self.get_timelines(), indent=4), encoding="utf-8"
+            )
+            _LOGGER.info("Boot timelines written to %s", path)
+
+    def clear(self) -> None:
+        """Forget the timelines of all the boards."""
+        with self._lock:
+            self._timelines.clear()
+            self._mac_states.clear()
+
+
+# boot timelines of the boards of the test session
+BOOT_TIMELINE = BootTimelineRecorder()
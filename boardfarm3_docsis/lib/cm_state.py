@@ -0,0 +1,160 @@
+"""Cable modem MAC state helpers."""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+# pylint: disable-next=too-many-return-statements
+def check_mac_state(  # noqa: PLR0911
+    mac_state: str | None,
+    ignore_bpi: bool = False,
+    ignore_partial: bool = False,
+    ignore_cpe: bool = False,
+) -> tuple[bool, str]:
+    """Check whether a CMTS MAC state is online.
+
+    :param mac_state: MAC state reported by the CMTS, e.g. online(pt)
+    :type mac_state: str | None
+    :param ignore_bpi: ignore BPI, defaults to False
+    :type ignore_bpi: bool
+    :param ignore_partial: ignore partial online, defaults to False
+    :type ignore_partial: bool
+    :param ignore_cpe: ignore CPE, defaults to False
+    :type ignore_cpe: bool
+    :return: whether the cable modem is online, and a description of the state
+    :rtype: tuple[bool, str]
+    """
+    if mac_state is None:
+        return False, "Cable modem status is unknown"
+    if "offline" in mac_state:
+        return False, f"Cable modem is {mac_state}"
+    if "init" in mac_state:
+        return False, f"Cable modem is initializing: {mac_state}"
+    if "online" not in mac_state:
+        return False, f"Cable modem in unknown state: {mac_state}"
+    if not ignore_bpi and re.search(r"online\(p(t|k)", mac_state) is None:
+        return False, f"Cable modem in BPI is disabled: {mac_state}"
+    if not ignore_partial and re.search(r"p-online", mac_state) is not None:
+        return False, f"Cable modem in partial service: {mac_state}"
+    if not ignore_cpe and re.search(r"online\(d", mac_state) is not None:
+        return False, f"Cable modem is prohibited from forwarding data: {mac_state}"
+    return True, f"Cable modem is online: {mac_state}"
+
+
+# what a cable modem stuck in a MAC state is waiting for
+_MAC_STATE_DIAGNOSES = {
+    "offline": "no ranging request, check the RF path and the CMTS interface",
+    "init(r1)": "initial ranging, check the upstream channel and power",
+    "init(r2)": "ranging, check the upstream channel and power",
+    "init(rc)": "ranging complete, no DHCP discover yet",
+    "init(d)": "DHCP discover unanswered, check the provisioner",
+    "init(dr)": "DHCP request unanswered, check the provisioner",
+    "init(i)": "DHCP incomplete, check the provisioner",
+    "init(io)": "IP address assigned, waiting for the options",
+    "init(o)": "config file download, check the TFTP server and the boot file",
+    "init(t)": "time of day request unanswered, check the ToD server",
+}
+
+
+class RegistrationAction(Enum):
+    """Action to take on a cable modem registration."""
+
+    WAIT = "wait"
+    RESET = "reset"
+    FAIL = "fail"
+
+
+@dataclass(frozen=True)
+class RegistrationVerdict:
+    """Action to take on a cable modem registration, and why."""
+
+    action: RegistrationAction
+    diagnosis: str = ""
+
+
+@dataclass(frozen=True)
+class RegistrationPolicy:
+    """Time budgets of the cable modem registration.
+
+    A cable modem staying in a MAC state longer than its budget, or going
+    back offline more than ``max_offline_cycles`` times, is reset on the
+    CMTS up to ``max_resets`` times before the registration is failed.
+    """
+
+    state_budgets: dict[str, float] = field(
+        default_factory=lambda: {
+            "offline": 600,
+            "init(r1)": 300,
+            "init(d)": 300,
+            "init(o)": 300,
+        }
+    )
+    default_budget: float = 600
+    max_offline_cycles: int = 3
+    max_resets: int = 2
+
+
+class RegistrationWatchdog:
+    """Follow the MAC states of a cable modem against a registration policy."""
+
+    def __init__(self, policy: RegistrationPolicy | None = None) -> None:
+        """Initialize the watchdog, the registration starts on first observation.
+
+        :param policy: registration policy, defaults to RegistrationPolicy()
+        :type policy: RegistrationPolicy | None
+        """
+        self._policy = policy or RegistrationPolicy()
+        self._resets = 0
+        self._mac_state: str | None = None
+        self._since = 0.0
+        self._offline_cycles = 0
+
+    def notify_reset(self) -> None:
+        """Restart the budgets, e.g. after the cable modem was reset."""
+        self._mac_state = None
+        self._offline_cycles = 0
+
+    def observe(
+        self, mac_state: str | None, now: float | None = None
+    ) -> RegistrationVerdict:
+        """Check a MAC state observed on the CMTS against the policy.
+
+        :param mac_state: MAC state, None if the cable modem is not found
+        :type mac_state: str | None
+        :param now: monotonic time of the observation, defaults to now
+        :type now: float | None
+        :return: whether to keep waiting, reset the cable modem or give up
+        :rtype: RegistrationVerdict
+        """
+        now = time.monotonic() if now is None else now
+        mac_state = mac_state or "offline"
+        if mac_state != self._mac_state:
+            if mac_state == "offline" and self._mac_state is not None:
+                self._offline_cycles += 1
+            self._mac_state, self._since = mac_state, now
+        diagnosis = self._diagnose(mac_state, now)
+        if diagnosis is None:
+            return RegistrationVerdict(RegistrationAction.WAIT)
+        if self._resets >= self._policy.max_resets:
+            return RegistrationVerdict(RegistrationAction.FAIL, diagnosis)
+        self._resets += 1
+        self.notify_reset()
+        return RegistrationVerdict(RegistrationAction.RESET, diagnosis)
+
+    def _diagnose(self, mac_state: str, now: float) -> str | None:
+        if "online" in mac_state:
+            return None
+        if self._offline_cycles > self._policy.max_offline_cycles:
+            return f"flapping, went offline {self._offline_cycles} times"
+        elapsed = now - self._since
+        budget = self._policy.state_budgets.get(mac_state, self._policy.default_budget)
+        hint = _MAC_STATE_DIAGNOSES.get(mac_state, "unknown MAC state")
+        return (
+            f"stuck in {mac_state} for {elapsed:.0f}s (budget {budget:.0f}s): {hint}"
+            if elapsed > budget
+            else None
+        )
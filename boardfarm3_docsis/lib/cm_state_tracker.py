@@ -0,0 +1,254 @@
+"""Background tracker of the cable modem MAC state transitions of a CMTS."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import netaddr
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_mac_address(mac_address: str) -> str:
+    """Return a MAC address in lower case colon separated format.
+
+    :param mac_address: MAC address in any format, e.g. 0050.f100.0001
+    :type mac_address: str
+    :return: MAC address, e.g. 00:50:f1:00:00:01
+    :rtype: str
+    """
+    return str(netaddr.EUI(mac_address, dialect=netaddr.mac_unix_expanded))
+
+
+@dataclass(frozen=True)
+class CmStateTransition:
+    """MAC state transition of a cable modem.
+
+    A None state means the cable modem is not in the CMTS modem table.
+    """
+
+    cm_mac: str
+    previous: str | None
+    current: str | None
+    timestamp: float
+
+
+# pylint: disable-next=too-many-instance-attributes
+class CmStateTracker:
+    """Sample the modem table periodically and emit MAC state transitions.
+
+    The table is fetched in a background thread and diffed against the
+    previous sample. Transitions are kept in a bounded history and handed
+    to the subscribers, so that waiting use cases block on events instead
+    of polling the CMTS on their own.
+    """
+
+    def __init__(
+        self,
+        fetch_states: Callable[[], dict[str, str]],
+        interval: float = 5.0,
+        history_size: int = 4096,
+    ) -> None:
+        """Initialize the tracker, the sampling starts with ``start()``.
+
+        :param fetch_states: returns the MAC state of every cable modem of the
+            CMTS, keyed by MAC address
+        :type fetch_states: Callable[[], dict[str, str]]
+        :param interval: seconds between two samples, defaults to 5.0
+        :type interval: float
+        :param history_size: number of transitions kept, defaults to 4096
+        :type history_size: int
+        """
+        self._fetch_states = fetch_states
+        self._interval = interval
+        self._history: deque[CmStateTransition] = deque(maxlen=history_size)
+        self._states: dict[str, str] = {}
+        self._subscribers: list[Callable[[CmStateTransition], None]] = []
+        self._queues: dict[asyncio.Queue, Callable[[CmStateTransition], None]] = {}
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background sampling is running.
+
+        :return: True if the sampler thread is alive
+        :rtype: bool
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the background sampling, if not running yet."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cm-state-tracker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop the background sampling.
+
+        :param timeout: seconds to wait for the sampler thread, defaults to
+            waiting until the current sample completes
+        :type timeout: float | None
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.sample()
+            # pylint: disable-next=broad-exception-caught
+            except Exception:  # noqa: BLE001
+                _LOGGER.warning("Failed to sample the CMTS modem table", exc_info=True)
+            self._stop_event.wait(self._interval)
+
+    def sample(self) -> list[CmStateTransition]:
+        """Fetch the modem table once and emit the transitions found.
+
+        :return: transitions since the previous sample
+        :rtype: list[CmStateTransition]
+        """
+        states = {
+            normalize_mac_address(mac): state
+            for mac, state in self._fetch_states().items()
+        }
+        timestamp = time.time()
+        with self._condition:
+            transitions = [
+                CmStateTransition(
+                    mac, self._states.get(mac), states.get(mac), timestamp
+                )
+                for mac in {**self._states, **states}
+                if self._states.get(mac) != states.get(mac)
+            ]
+            self._states = states
+            self._history.extend(transitions)
+            subscribers = list(self._subscribers)
+            self._condition.notify_all()
+        for transition in transitions:
+            for callback in subscribers:
+                self._notify(callback, transition)
+        return transitions
+
+    @staticmethod
+    def _notify(
+        callback: Callable[[CmStateTransition], None], transition: CmStateTransition
+    ) -> None:
+        try:
+            callback(transition)
+        # pylint: disable-next=broad-exception-caught
+        except Exception:  # noqa: BLE001
+            _LOGGER.warning("CM state subscriber failed", exc_info=True)
+
+    def get_state(self, mac_address: str) -> str | None:
+        """Return the last sampled MAC state of a cable modem.
+
+        :param mac_address: cable modem MAC address
+        :type mac_address: str
+        :return: MAC state, None if not in the last sample
+        :rtype: str | None
+        """
+        with self._condition:
+            return self._states.get(normalize_mac_address(mac_address))
+
+    def get_history(self, mac_address: str | None = None) -> list[CmStateTransition]:
+        """Return the recorded transitions, oldest first.
+
+        :param mac_address: cable modem MAC address, defaults to all of them
+        :type mac_address: str | None
+        :return: transitions still in the history
+        :rtype: list[CmStateTransition]
+        """
+        with self._condition:
+            if mac_address is None:
+                return list(self._history)
+            cm_mac = normalize_mac_address(mac_address)
+            return [event for event in self._history if event.cm_mac == cm_mac]
+
+    def subscribe(self, callback: Callable[[CmStateTransition], None]) -> None:
+        """Call a function on every transition, from the sampler thread.
+
+        :param callback: function called with each transition
+        :type callback: Callable[[CmStateTransition], None]
+        """
+        with self._condition:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[CmStateTransition], None]) -> None:
+        """Stop calling a subscribed function.
+
+        :param callback: function given to ``subscribe()``
+        :type callback: Callable[[CmStateTransition], None]
+        """
+        with self._condition:
+            self._subscribers.remove(callback)
+
+    def subscribe_queue(
+        self, loop: asyncio.AbstractEventLoop | None = None
+    ) -> asyncio.Queue[CmStateTransition]:
+        """Return an asyncio queue receiving every transition.
+
+        :param loop: event loop of the queue, defaults to the running loop
+        :type loop: asyncio.AbstractEventLoop | None
+        :return: queue of transitions
+        :rtype: asyncio.Queue[CmStateTransition]
+        """
+        event_loop = loop or asyncio.get_running_loop()
+        queue: asyncio.Queue[CmStateTransition] = asyncio.Queue()
+
+        def _put(transition: CmStateTransition) -> None:
+            event_loop.call_soon_threadsafe(queue.put_nowait, transition)
+
+        with self._condition:
+            self._queues[queue] = _put
+        self.subscribe(_put)
+        return queue
+
+    def unsubscribe_queue(self, queue: asyncio.Queue[CmStateTransition]) -> None:
+        """Stop feeding a queue returned by ``subscribe_queue()``.
+
+        :param queue: subscribed queue
+        :type queue: asyncio.Queue[CmStateTransition]
+        """
+        with self._condition:
+            callback = self._queues.pop(queue)
+        self.unsubscribe(callback)
+
+    def wait_for_state(
+        self,
+        mac_address: str,
+        predicate: Callable[[str | None], bool],
+        timeout: float,
+    ) -> bool:
+        """Block until the sampled MAC state of a cable modem matches.
+
+        :param mac_address: cable modem MAC address
+        :type mac_address: str
+        :param predicate: returns True for the awaited MAC states
+        :type predicate: Callable[[str | None], bool]
+        :param timeout: seconds to wait
+        :type timeout: float
+        :return: True if the state matched before the timeout
+        :rtype: bool
+        """
+        cm_mac = normalize_mac_address(mac_address)
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: predicate(self._states.get(cm_mac)), timeout
+            )
@@ -0,0 +1,199 @@
+"""Incremental multi-pattern matching of console output.
+
+All the markers are matched in a single pass over the output with an
+Aho-Corasick automaton. The automaton state is kept between chunks, so the
+console output is matched as it arrives, even when a marker is split over
+two reads.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import pexpect
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3.lib.boardfarm_pexpect import BoardfarmPexpect
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MultiPatternMatcher:
+    """Aho-Corasick automaton over a set of named literal patterns."""
+
+    def __init__(self, patterns: dict[str, str]) -> None:
+        """Build the automaton.
+
+        :param patterns: literal patterns, keyed by name
+        :type patterns: dict[str, str]
+        :raises ValueError: on empty patterns
+        """
+        self._goto: list[dict[str, int]] = [{}]
+        self._outputs: list[list[str]] = [[]]
+        for name, pattern in patterns.items():
+            if not pattern:
+                msg = f"Empty pattern {name!r}"
+                raise ValueError(msg)
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._outputs.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._outputs[state].append(name)
+        self._fail = [0] * len(self._goto)
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, child in self._goto[state].items():
+                pending.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] += self._outputs[self._fail[child]]
+        self._state = 0
+        self._position = 0
+
+    def reset(self) -> None:
+        """Restart matching at the beginning of a new input."""
+        self._state = 0
+        self._position = 0
+
+    def feed(self, text: str) -> list[tuple[str, int]]:
+        """Match the next chunk of the input.
+
+        :param text: next chunk of the input
+        :type text: str
+        :return: name and end offset in the whole input of each match
+        :rtype: list[tuple[str, int]]
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = self._state
+        matches: list[tuple[str, int]] = []
+        for index, char in enumerate(text, self._position + 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                matches.extend((name, index) for name in outputs[state])
+        self._state = state
+        self._position += len(text)
+        return matches
+
+
+@dataclass(frozen=True)
+class MarkerMatch:
+    """First occurrence of a marker in the console output.
+
+    The marker is stamped once the chunk holding it is read, it showed up
+    within the ``window`` seconds before ``elapsed``.
+    """
+
+    name: str
+    offset: int
+    elapsed: float
+    window: float
+
+
+@dataclass
+class ConsoleMatchResult:
+    """Markers found while watching a console."""
+
+    missing: list[str]
+    matches: dict[str, MarkerMatch] = field(default_factory=dict)
+    failure: MarkerMatch | None = None
+    log: str = ""
+
+    @property
+    def is_successful(self) -> bool:
+        """Whether all the markers were found and no failure marker.
+
+        :return: True if all the markers were found and no failure marker
+        :rtype: bool
+        """
+        return not self.missing and self.failure is None
+
+
+def watch_logs(
+    read_logs: Callable[[float], str | None],
+    markers: dict[str, str],
+    timeout: float,
+    failure_markers: dict[str, str] | None = None,
+) -> ConsoleMatchResult:
+    """Read logs chunk by chunk until all the markers or a failure marker are found.
+
+    The markers are timestamped at the resolution of the chunks: each one
+    is stamped with the time its chunk was read, and the time that chunk
+    took to read as window.
+
+    :param read_logs: return the logs read for at most the given seconds,
+        None once no more logs can be read
+    :type read_logs: Callable[[float], str | None]
+    :param markers: markers to wait for, keyed by name
+    :type markers: dict[str, str]
+    :param timeout: seconds to wait for the markers
+    :type timeout: float
+    :param failure_markers: markers ending the wait as failed, keyed by name
+    :type failure_markers: dict[str, str] | None
+    :return: timestamped markers found and the logs read
+    :rtype: ConsoleMatchResult
+    """
+    failure_markers = failure_markers or {}
+    matcher = MultiPatternMatcher({**markers, **failure_markers})
+    result = ConsoleMatchResult(missing=list(markers))
+    chunks: list[str] = []
+    start = time.monotonic()
+    while result.missing and result.failure is None:
+        read_start = time.monotonic()
+        remaining = start + timeout - read_start
+        if remaining <= 0 or (chunk := read_logs(remaining)) is None:
+            break
+        chunks.append(chunk)
+        read_end = time.monotonic()
+        for name, offset in matcher.feed(chunk):
+            match = MarkerMatch(name, offset, read_end - start, read_end - read_start)
+            if name in failure_markers:
+                result.failure = result.failure or match
+            elif name not in result.matches:
+                _LOGGER.debug("Found %s after %.1fs", name, match.elapsed)
+                result.matches[name] = match
+                result.missing.remove(name)
+    result.log = "".join(chunks)
+    return result
+
+
+def watch_console(
+    console: BoardfarmPexpect,
+    markers: dict[str, str],
+    timeout: float,
+    failure_markers: dict[str, str] | None = None,
+) -> ConsoleMatchResult:
+    """Read a console until all the markers or a failure marker are found.
+
+    :param console: console to read
+    :type console: BoardfarmPexpect
+    :param markers: markers to wait for, keyed by name
+    :type markers: dict[str, str]
+    :param timeout: seconds to wait for the markers
+    :type timeout: float
+    :param failure_markers: markers ending the wait as failed, keyed by name
+    :type failure_markers: dict[str, str] | None
+    :return: timestamped markers found and the console output read
+    :rtype: ConsoleMatchResult
+    """
+
+    def _read_console(remaining: float) -> str | None:
+        index = console.expect(
+            [r"(?s).+", pexpect.TIMEOUT, pexpect.EOF], timeout=remaining
+        )
+        return str(console.after) if index == 0 else None
+
+    return watch_logs(_read_console, markers, timeout, failure_markers)
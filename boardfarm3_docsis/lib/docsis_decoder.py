@@ -0,0 +1,371 @@
+"""Streaming decoder of encoded DOCSIS cable modem config files.
+
+The TLVs are read one at a time from the encoded file and the sub-TLVs of
+aggregates, e.g. VendorSpecific blocks, are only decoded when accessed.
+"""
+
+from __future__ import annotations
+
+import io
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import cached_property
+from ipaddress import IPv4Address
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+from boardfarm3_docsis.exceptions import ConfigDecodingError
+from boardfarm3_docsis.lib.docsis_native_encoder import CM_SYMBOLS, TlvSymbol
+from boardfarm3_docsis.lib.docsis_tlv import (
+    BER_INTEGER,
+    BER_IP_ADDRESS,
+    BER_OBJECT_IDENTIFIER,
+    BER_OCTET_STRING,
+    BER_SEQUENCE,
+    CM_MIC_TLV,
+    CMTS_MIC_TLV,
+    END_OF_DATA_MARKER,
+    get_cm_mic,
+    get_cmts_mic,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+VENDOR_SPECIFIC_TLV = 43
+VENDOR_IDENTIFIER_TLV = 8
+GLOBAL_PRIVACY_ENABLE_TLV = 29
+
+_UNSIGNED_BER_TAGS = {0x41, 0x42, 0x43, 0x46}
+_MIC_NAMES = {CM_MIC_TLV: "CmMic", CMTS_MIC_TLV: "CmtsMic"}
+
+
+def _get_symbols_by_code(symbols: dict[str, TlvSymbol]) -> dict[int, tuple]:
+    # the first name wins, e.g. eRouter is both a top level and a vendor TLV
+    by_code: dict[int, tuple] = {}
+    for name, symbol in symbols.items():
+        by_code.setdefault(symbol.code, (name, symbol))
+    return by_code
+
+
+def _read_ber(data: bytes, offset: int) -> tuple[int, bytes, int]:
+    """Read a BER element.
+
+    :param data: BER encoded data
+    :type data: bytes
+    :param offset: element offset
+    :type offset: int
+    :raises ConfigDecodingError: when the element is truncated
+    :return: tag, content and offset of the next element
+    :rtype: tuple[int, bytes, int]
+    """
+    try:
+        tag, length = data[offset], data[offset + 1]
+        offset += 2
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[offset : offset + size], "big")
+            offset += size
+    except IndexError as exc:
+        msg = f"Truncated BER element at offset {offset}"
+        raise ConfigDecodingError(msg) from exc
+    if offset + length > len(data):
+        msg = f"Truncated BER element at offset {offset}"
+        raise ConfigDecodingError(msg)
+    return tag, data[offset : offset + length], offset + length
+
+
+def decode_ber_oid(content: bytes) -> str:
+    """Decode the content of a BER object identifier.
+
+    :param content: BER content, without tag and length
+    :type content: bytes
+    :return: dotted OID
+    :rtype: str
+    """
+    arcs: list[int] = []
+    arc = 0
+    for byte in content:
+        arc = (arc << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+    if not arcs:
+        return ""
+    first = min(arcs[0] // 40, 2)
+    return ".".join(str(arc) for arc in [first, arcs[0] - first * 40, *arcs[1:]])
+
+
+# pylint: disable-next=too-many-return-statements
+def decode_snmp_varbind(data: bytes) -> tuple[str, str, str | bytes | int]:
+    """Decode the SNMP VarBind of a SnmpMibObject TLV.
+
+    :param data: BER VarBind sequence
+    :type data: bytes
+    :raises ConfigDecodingError: when the VarBind is malformed
+    :return: numeric OID, value type and value
+    :rtype: tuple[str, str, str | bytes | int]
+    """
+    tag, sequence, _ = _read_ber(data, 0)
+    if tag != BER_SEQUENCE:
+        msg = f"Expected an SNMP VarBind sequence, got tag {tag:#x}"
+        raise ConfigDecodingError(msg)
+    tag, oid, offset = _read_ber(sequence, 0)
+    if tag != BER_OBJECT_IDENTIFIER:
+        msg = f"Expected an OID, got tag {tag:#x}"
+        raise ConfigDecodingError(msg)
+    tag, content, _ = _read_ber(sequence, offset)
+    if tag == BER_INTEGER:
+        return decode_ber_oid(oid), "Integer", int.from_bytes(content, signed=True)
+    if tag in _UNSIGNED_BER_TAGS:
+        return decode_ber_oid(oid), "Unsigned", int.from_bytes(content)
+    if tag == BER_OCTET_STRING:
+        return decode_ber_oid(oid), "String", content
+    if tag == BER_IP_ADDRESS:
+        return decode_ber_oid(oid), "IPAddress", str(IPv4Address(content))
+    if tag == BER_OBJECT_IDENTIFIER:
+        return decode_ber_oid(oid), "ObjectID", decode_ber_oid(content)
+    return decode_ber_oid(oid), f"Tag{tag:#x}", content
+
+
+@dataclass
+class DecodedTlv:
+    """TLV of an encoded config file, with its sub-TLVs decoded on access."""
+
+    code: int
+    raw_value: bytes
+    offset: int
+    symbol: TlvSymbol | None = field(default=None, repr=False)
+    name: str = ""
+
+    @property
+    def is_aggregate(self) -> bool:
+        """Whether the TLV is made of sub-TLVs.
+
+        :return: True for aggregates, e.g. VendorSpecific
+        :rtype: bool
+        """
+        return self.symbol is not None and self.symbol.kind == "aggregate"
+
+    @cached_property
+    def children(self) -> list[DecodedTlv]:
+        """Sub-TLVs of an aggregate TLV, decoded on first access.
+
+        :return: sub-TLVs, empty for scalar TLVs
+        :rtype: list[DecodedTlv]
+        """
+        if not self.is_aggregate or self.symbol is None:
+            return []
+        return list(
+            iter_decoded_tlvs(
+                io.BytesIO(self.raw_value),
+                self.symbol.children,
+                self.offset + 2,
+                stop_at_end_marker=False,
+            )
+        )
+
+    def get_children(self, code: int) -> list[DecodedTlv]:
+        """Return the sub-TLVs of a type.
+
+        :param code: sub-TLV type
+        :type code: int
+        :return: sub-TLVs of that type, in file order
+        :rtype: list[DecodedTlv]
+        """
+        return [child for child in self.children if child.code == code]
+
+    @property
+    def value(self) -> int | str | bytes | tuple | list[DecodedTlv]:
+        """Typed value of the TLV.
+
+        Integers for integer TLVs, text for strings and IP addresses, the
+        (OID, type, value) tuple for SnmpMibObject, the sub-TLVs for
+        aggregates and the raw bytes for anything else.
+
+        :return: typed value
+        :rtype: int | str | bytes | tuple | list[DecodedTlv]
+        """
+        kind = self.symbol.kind if self.symbol else ""
+        if kind == "aggregate":
+            return self.children
+        converters: dict[str, Callable[[bytes], int | str | tuple]] = {
+            "uchar": int.from_bytes,
+            "ushort": int.from_bytes,
+            "uint": int.from_bytes,
+            "string": lambda value: value.rstrip(b"\0").decode(errors="replace"),
+            "strzero": lambda value: value.rstrip(b"\0").decode(errors="replace"),
+            "hexstr": bytes.hex,
+            "ip": lambda value: str(IPv4Address(value)),
+            "snmp": decode_snmp_varbind,
+        }
+        return (
+            converters[kind](self.raw_value) if kind in converters else self.raw_value
+        )
+
+
+def iter_decoded_tlvs(
+    stream: BinaryIO,
+    symbols: dict[str, TlvSymbol] | None = None,
+    base_offset: int = 0,
+    stop_at_end_marker: bool = True,
+) -> Iterator[DecodedTlv]:
+    """Read the TLVs of an encoded config one at a time.
+
+    :param stream: binary stream positioned at the first TLV
+    :type stream: BinaryIO
+    :param symbols: config text names of the TLVs, defaults to the cable
+        modem top level TLVs
+    :type symbols: dict[str, TlvSymbol] | None
+    :param base_offset: file offset of the stream start, defaults to 0
+    :type base_offset: int
+    :param stop_at_end_marker: stop at the end of data marker, defaults to
+        True
+    :type stop_at_end_marker: bool
+    :raises ConfigDecodingError: when a TLV is truncated
+    :yield: decoded TLVs, in file order
+    :rtype: Iterator[DecodedTlv]
+    """
+    by_code = _get_symbols_by_code(CM_SYMBOLS if symbols is None else symbols)
+    if symbols is None:
+        by_code.update({code: (name, None) for code, name in _MIC_NAMES.items()})
+    offset = base_offset
+    while header := stream.read(2):
+        if stop_at_end_marker and header[:1] == END_OF_DATA_MARKER:
+            return
+        if len(header) < 2:  # noqa: PLR2004
+            msg = f"Truncated TLV at offset {offset}"
+            raise ConfigDecodingError(msg)
+        value = stream.read(header[1])
+        if len(value) < header[1]:
+            msg = f"Truncated TLV {header[0]} at offset {offset}"
+            raise ConfigDecodingError(msg)
+        name, symbol = by_code.get(header[0], (f"GenericTLV{header[0]}", None))
+        yield DecodedTlv(header[0], value, offset, symbol, name)
+        offset += 2 + len(value)
+
+
+class DecodedCmConfig:
+    """Encoded cable modem config file, decoded into a tree of TLVs.
+
+    .. code-block:: python
+
+        config = DecodedCmConfig.from_file(encoded_cm_config)
+        config.get_vendor_ids()  # ["0050f1"]
+        config.get_first(29).value  # GlobalPrivacyEnable
+    """
+
+    def __init__(self, data: bytes | BinaryIO) -> None:
+        """Decode an encoded config.
+
+        :param data: CM config file content or a binary stream
+        :type data: bytes | BinaryIO
+        """
+        stream = io.BytesIO(data) if isinstance(data, bytes) else data
+        self._tlvs = list(iter_decoded_tlvs(stream))
+        self._index: dict[int, list[DecodedTlv]] = defaultdict(list)
+        for tlv in self._tlvs:
+            self._index[tlv.code].append(tlv)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> DecodedCmConfig:
+        """Decode an encoded config file, e.g. the one served by TFTP.
+
+        :param path: CM config file path
+        :type path: str | Path
+        :return: decoded config
+        :rtype: DecodedCmConfig
+        """
+        with Path(path).open("rb") as config_file:
+            return cls(config_file)
+
+    @property
+    def tlvs(self) -> list[DecodedTlv]:
+        """Top level TLVs, in file order.
+
+        :return: top level TLVs
+        :rtype: list[DecodedTlv]
+        """
+        return list(self._tlvs)
+
+    def get_tlvs(self, code: int) -> list[DecodedTlv]:
+        """Return the top level TLVs of a type.
+
+        :param code: TLV type
+        :type code: int
+        :return: TLVs of that type, in file order
+        :rtype: list[DecodedTlv]
+        """
+        return list(self._index.get(code, []))
+
+    def get_first(self, code: int) -> DecodedTlv | None:
+        """Return the first top level TLV of a type.
+
+        :param code: TLV type
+        :type code: int
+        :return: first TLV of that type, None if missing
+        :rtype: DecodedTlv | None
+        """
+        tlvs = self._index.get(code)
+        return tlvs[0] if tlvs else None
+
+    def get_vendor_ids(self) -> list[str]:
+        """Return the vendor identifiers of the VendorSpecific blocks.
+
+        :return: hexadecimal vendor identifiers, e.g. 0050f1
+        :rtype: list[str]
+        """
+        return [
+            child.raw_value.hex()
+            for block in self.get_tlvs(VENDOR_SPECIFIC_TLV)
+            for child in block.get_children(VENDOR_IDENTIFIER_TLV)
+        ]
+
+    def get_vendor_blocks(self, vendor_id: str) -> list[DecodedTlv]:
+        """Return the VendorSpecific blocks of a vendor.
+
+        :param vendor_id: hexadecimal vendor identifier, e.g. 0050f1
+        :type vendor_id: str
+        :return: VendorSpecific TLVs of that vendor
+        :rtype: list[DecodedTlv]
+        """
+        return [
+            block
+            for block in self.get_tlvs(VENDOR_SPECIFIC_TLV)
+            if any(
+                child.raw_value.hex() == vendor_id.lower().removeprefix("0x")
+                for child in block.get_children(VENDOR_IDENTIFIER_TLV)
+            )
+        ]
+
+    def is_bpi_privacy_disabled(self) -> bool:
+        """Check whether GlobalPrivacyEnable is set to 0.
+
+        :return: True if BPI privacy is disabled
+        :rtype: bool
+        """
+        tlv = self.get_first(GLOBAL_PRIVACY_ENABLE_TLV)
+        return tlv is not None and tlv.value == 0
+
+    def verify_mics(self, shared_secret: bytes = b"") -> bool:
+        """Check the CM MIC and CMTS MIC of the config.
+
+        :param shared_secret: CMTS shared secret, defaults to none
+        :type shared_secret: bytes
+        :return: True if both MICs are present and valid
+        :rtype: bool
+        """
+        cm_mic, cmts_mic = self.get_first(CM_MIC_TLV), self.get_first(CMTS_MIC_TLV)
+        if cm_mic is None or cmts_mic is None:
+            return False
+        preceding = b"".join(
+            bytes((tlv.code, len(tlv.raw_value))) + tlv.raw_value
+            for tlv in self._tlvs
+            if tlv.offset < cm_mic.offset
+        )
+        cm_mic_tlv = bytes((CM_MIC_TLV, len(cm_mic.raw_value))) + cm_mic.raw_value
+        return (
+            get_cm_mic(preceding) == cm_mic.raw_value
+            and get_cmts_mic(preceding + cm_mic_tlv, shared_secret)
+            == cmts_mic.raw_value
+        )
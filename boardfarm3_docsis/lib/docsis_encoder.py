@@ -1,25 +1,84 @@
 """DOCSIS Config file encoder module."""
 
+from __future__ import annotations
+
+import asyncio
 import logging
+import os
+import shlex
+import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
 
-import pexpect
-from boardfarm3.lib.connections.local_cmd import LocalCmd
-
-from boardfarm3_docsis.exceptions import ConfigEncodingError
+from boardfarm3_docsis.exceptions import ConfigEncodingError, NativeEncodingError
+from boardfarm3_docsis.lib.docsis_native_encoder import NativeCmConfigEncoder
+from boardfarm3_docsis.lib.encoder_cache import CacheStats, EncoderCache
+from boardfarm3_docsis.lib.mib_table import DEFAULT_MIB_TABLE_DIR, get_mib_table
 
 _LOGGER = logging.getLogger(__name__)
 
+EncoderEngine = Literal["compiler", "native"]
+# handed to the compiler when the config only has numeric OIDs
+_NO_MIBS_DIR = str(Path(DEFAULT_MIB_TABLE_DIR) / "no-mibs")
+
+
+@dataclass(frozen=True)
+class EncodeJob:
+    """Config file to encode in a batch."""
+
+    config: str
+    is_mta: bool = False
+
+
+@dataclass(frozen=True)
+class EncodeResult:
+    """Outcome of a batch encoding job."""
+
+    job: EncodeJob
+    path: Path | None = None
+    error: ConfigEncodingError | None = None
+
 
 class DocsisConfigEncoder:
     """DOCSIS config file encoder.
 
     Requires the docsis compiler to be installed locally.
+
+    Encoded files are cached on disk, so encoding the same config again
+    only costs a file copy.
+
+    Cable modem configs can also be encoded in-process by the ``native``
+    engine, which falls back to the docsis compiler for unsupported TLVs.
+
+    Symbolic SnmpMibObject OIDs are resolved from a MIB OID table compiled
+    once per MIB set, so the docsis compiler does not load any MIB.
     """
 
-    def __init__(self) -> None:
-        """Initialize docsis config encoder."""
+    def __init__(
+        self,
+        use_cache: bool = True,
+        cache: EncoderCache | None = None,
+        engine: EncoderEngine = "compiler",
+        resolve_oids: bool = True,
+    ) -> None:
+        """Initialize docsis config encoder.
+
+        :param use_cache: reuse previously encoded files, defaults to True
+        :type use_cache: bool
+        :param cache: encoder cache, defaults to the host wide cache
+        :type cache: EncoderCache | None
+        :param engine: default cable modem config engine, defaults to compiler
+        :type engine: EncoderEngine
+        :param resolve_oids: resolve the symbolic OIDs before running the
+            docsis compiler, defaults to True
+        :type resolve_oids: bool
+        """
+        self._cache = (cache or EncoderCache()) if use_cache else None
+        self._engine = engine
+        self._resolve_oids = resolve_oids
         self._encoder_cmd = "docsis"
         self._cfg_dict = {
             "cm": {
@@ -34,9 +93,105 @@ class DocsisConfigEncoder:
             },
         }
 
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """Hit and miss counters of the encoder cache.
+
+        :return: cache counters, None if caching is disabled
+        :rtype: CacheStats | None
+        """
+        return self._cache.stats if self._cache else None
+
+    def _get_cached_config(
+        self, config: str, mibs_path: list[str], prefix: str
+    ) -> tuple[str, Path | None]:
+        """Look the config up in the encoder cache.
+
+        :param config: config text
+        :type config: str
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :param prefix: cm or mta
+        :type prefix: str
+        :return: cache key, empty if caching is disabled, and a private copy
+            of the cached file on cache hit
+        :rtype: tuple[str, Path | None]
+        """
+        if not self._cache:
+            return "", None
+        encoded_ext = self._cfg_dict[prefix]["encoded_ext"]
+        cache_key = self._cache.get_key(
+            config,
+            mibs_path,
+            self._cfg_dict[prefix]["option"],
+            self._cfg_dict[prefix]["key_file"],
+        )
+        return cache_key, self._cache.get(
+            cache_key, encoded_ext, prefix=f"{prefix}-config-"
+        )
+
     def _encode_config(self, config: str, mibs_path: list[str], is_mta: bool) -> Path:
-        mibs_argument = ":".join(mibs_path)
         prefix = "mta" if is_mta else "cm"
+        cache_key, cached_file = self._get_cached_config(config, mibs_path, prefix)
+        if cached_file:
+            return cached_file
+        cfg_file_path = self._run_encoder(config, mibs_path, prefix)
+        if self._cache:
+            self._cache.put(
+                cache_key, self._cfg_dict[prefix]["encoded_ext"], cfg_file_path
+            )
+        return cfg_file_path
+
+    async def _encode_config_async(
+        self, config: str, mibs_path: list[str], is_mta: bool
+    ) -> Path:
+        prefix = "mta" if is_mta else "cm"
+        cache_key, cached_file = self._get_cached_config(config, mibs_path, prefix)
+        if cached_file:
+            return cached_file
+        cfg_file_path = await self._run_encoder_async(config, mibs_path, prefix)
+        if self._cache:
+            self._cache.put(
+                cache_key, self._cfg_dict[prefix]["encoded_ext"], cfg_file_path
+            )
+        return cfg_file_path
+
+    def _resolve_config_oids(
+        self, config: str, mibs_path: list[str]
+    ) -> tuple[str, list[str]]:
+        """Rewrite the symbolic OIDs of a config to numeric ones.
+
+        :param config: config text
+        :type config: str
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :return: config text and mibs directory paths to encode it with
+        :rtype: tuple[str, list[str]]
+        """
+        if not self._resolve_oids:
+            return config, mibs_path
+        config, is_numeric = get_mib_table(mibs_path).resolve_config(config)
+        if not is_numeric:
+            return config, mibs_path
+        Path(_NO_MIBS_DIR).mkdir(parents=True, exist_ok=True)
+        return config, [_NO_MIBS_DIR]
+
+    def _get_encoder_command(
+        self, mibs_path: list[str], prefix: str, config_path: str, cfg_file_path: Path
+    ) -> list[str]:
+        key_file = self._cfg_dict[prefix]["key_file"]
+        return [
+            self._encoder_cmd,
+            "-M",
+            ":".join(mibs_path),
+            *self._cfg_dict[prefix]["option"].split(),
+            config_path,
+            *([key_file] if key_file else []),
+            str(cfg_file_path),
+        ]
+
+    def _run_encoder(self, config: str, mibs_path: list[str], prefix: str) -> Path:
+        config, mibs_path = self._resolve_config_oids(config, mibs_path)
         with tempfile.NamedTemporaryFile(
             mode="w",
             prefix=f"{prefix}-config-",
@@ -51,24 +206,78 @@ class DocsisConfigEncoder:
                     self._cfg_dict[prefix]["encoded_ext"],
                 ),
             )
-            command = (
-                f"{self._encoder_cmd} -M {mibs_argument} "
-                f"{self._cfg_dict[prefix]['option']} {named_temp_file.name} "
-                f"{self._cfg_dict[prefix]['key_file']} {cfg_file_path}"
+            command = self._get_encoder_command(
+                mibs_path, prefix, named_temp_file.name, cfg_file_path
             )
-            _LOGGER.debug("Encoding modem config: %s", command)
-            session = LocalCmd(
-                "docsis-encoder",
+            _LOGGER.debug("Encoding modem config: %s", shlex.join(command))
+            process = subprocess.run(  # noqa: S603
                 command,
-                save_console_logs="",
-                args=[],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                check=False,
             )
-            session.expect(pexpect.EOF)
-            if session.wait() != 0:
-                raise ConfigEncodingError(named_temp_file.name)
+            if process.returncode != 0:
+                raise ConfigEncodingError(
+                    named_temp_file.name, process.stderr.decode(errors="replace")
+                )
         return cfg_file_path
 
-    def encode_cm_config(self, cm_config: str, mibs_path: list[str]) -> Path:
+    async def _run_encoder_async(
+        self, config: str, mibs_path: list[str], prefix: str
+    ) -> Path:
+        config, mibs_path = self._resolve_config_oids(config, mibs_path)
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            prefix=f"{prefix}-config-",
+            suffix=".txt",
+            encoding="utf-8",
+        ) as named_temp_file:
+            named_temp_file.write(config)
+            named_temp_file.flush()
+            cfg_file_path = Path(
+                named_temp_file.name.replace(
+                    ".txt",
+                    self._cfg_dict[prefix]["encoded_ext"],
+                ),
+            )
+            command = self._get_encoder_command(
+                mibs_path, prefix, named_temp_file.name, cfg_file_path
+            )
+            _LOGGER.debug("Encoding modem config: %s", shlex.join(command))
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                raise ConfigEncodingError(
+                    named_temp_file.name, stderr.decode(errors="replace")
+                )
+        return cfg_file_path
+
+    def _encode_native(self, config: str, mibs_path: list[str]) -> Path:
+        key_file = self._cfg_dict["cm"]["key_file"]
+        shared_secret = Path(key_file).read_bytes().rstrip(b"\r\n") if key_file else b""
+        encoder = NativeCmConfigEncoder(
+            lambda name: get_mib_table(mibs_path).get_mib_oid(name)
+        )
+        encoded = encoder.encode(config, shared_secret)
+        with tempfile.NamedTemporaryFile(
+            prefix="cm-config-",
+            suffix=self._cfg_dict["cm"]["encoded_ext"],
+            delete=False,
+        ) as cfg_file:
+            cfg_file.write(encoded)
+        return Path(cfg_file.name)
+
+    def encode_cm_config(
+        self,
+        cm_config: str,
+        mibs_path: list[str],
+        engine: EncoderEngine | None = None,
+    ) -> Path:
         """Encode a given cable modem config text file(boot file).
 
         Override this method for bespoke compilations (e.g, different encriptions)
@@ -77,10 +286,17 @@ class DocsisConfigEncoder:
         :type cm_config: str
         :param mibs_path: mibs directory paths
         :type mibs_path: list[str]
+        :param engine: encoder engine, defaults to the encoder default engine
+        :type engine: EncoderEngine | None
         :raises: ConfigEncodingError when docsis encoding failed
         :return: path to the docsis encoded config file
         :rtype: Path
         """
+        if (engine or self._engine) == "native":
+            try:
+                return self._encode_native(cm_config, mibs_path)
+            except NativeEncodingError as exc:
+                _LOGGER.debug("Falling back to the docsis compiler: %s", exc)
         return self._encode_config(config=cm_config, mibs_path=mibs_path, is_mta=False)
 
     def encode_mta_config(self, mta_config: str, mibs_path: list[str]) -> Path:
@@ -97,3 +313,100 @@ class DocsisConfigEncoder:
         :type: Path
         """
         return self._encode_config(config=mta_config, mibs_path=mibs_path, is_mta=True)
+
+    async def encode_cm_config_async(
+        self,
+        cm_config: str,
+        mibs_path: list[str],
+        engine: EncoderEngine | None = None,
+    ) -> Path:
+        """Encode a given cable modem config text file(boot file), using asyncio.
+
+        The docsis compiler runs as a subprocess, the event loop is free to
+        drive the devices in the meantime.
+
+        :param cm_config: cable modem config text file path
+        :type cm_config: str
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :param engine: encoder engine, defaults to the encoder default engine
+        :type engine: EncoderEngine | None
+        :raises: ConfigEncodingError when docsis encoding failed
+        :return: path to the docsis encoded config file
+        :rtype: Path
+        """
+        if (engine or self._engine) == "native":
+            try:
+                return self._encode_native(cm_config, mibs_path)
+            except NativeEncodingError as exc:
+                _LOGGER.debug("Falling back to the docsis compiler: %s", exc)
+        return await self._encode_config_async(
+            config=cm_config, mibs_path=mibs_path, is_mta=False
+        )
+
+    async def encode_mta_config_async(
+        self, mta_config: str, mibs_path: list[str]
+    ) -> Path:
+        """Encode a given MTA config text file, using asyncio.
+
+        :param mta_config: MTA config text file path
+        :type mta_config: str
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :raises: ConfigEncodingError when docsis encoding failed
+        :return: path to the docsis encoded MTA file
+        :rtype: Path
+        """
+        return await self._encode_config_async(
+            config=mta_config, mibs_path=mibs_path, is_mta=True
+        )
+
+    def _encode_job(self, job: EncodeJob, mibs_path: list[str]) -> EncodeResult:
+        try:
+            if job.is_mta:
+                return EncodeResult(
+                    job, path=self.encode_mta_config(job.config, mibs_path)
+                )
+            return EncodeResult(job, path=self.encode_cm_config(job.config, mibs_path))
+        except ConfigEncodingError as exc:
+            _LOGGER.warning("Batch encoding job failed: %s", exc)
+            return EncodeResult(job, error=exc)
+
+    def encode_many(
+        self,
+        jobs: list[EncodeJob],
+        mibs_path: list[str],
+        max_workers: int | None = None,
+    ) -> list[EncodeResult]:
+        """Encode several CM and MTA config files concurrently.
+
+        A failing job does not stop the batch, its error is reported in its
+        result instead.
+
+        .. code-block:: python
+
+            results = encoder.encode_many(
+                [EncodeJob(cm_config), EncodeJob(mta_config, is_mta=True)],
+                mibs_path,
+            )
+            failed = [result for result in results if result.error]
+
+        :param jobs: config files to encode
+        :type jobs: list[EncodeJob]
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :param max_workers: maximum number of concurrent encoder processes,
+            defaults to the number of CPUs, up to 8
+        :type max_workers: int | None
+        :return: results in the order of the jobs
+        :rtype: list[EncodeResult]
+        """
+        if not jobs:
+            return []
+        workers = min(max_workers or min(os.cpu_count() or 1, 8), len(jobs))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="docsis-encoder"
+        ) as executor:
+            return list(
+                executor.map(lambda job: self._encode_job(job, mibs_path), jobs)
+            )
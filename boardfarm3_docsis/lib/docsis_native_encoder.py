@@ -0,0 +1,286 @@
+"""In-process encoder for DOCSIS cable modem config files.
+
+Covers the TLVs used by the boardfarm boot files. Anything else raises
+NativeEncodingError, so that callers can fall back to the docsis compiler.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from ipaddress import IPv4Address
+from typing import TYPE_CHECKING
+
+from boardfarm3_docsis.exceptions import NativeEncodingError
+from boardfarm3_docsis.lib.boot_file import ConfigStatement, parse_config
+from boardfarm3_docsis.lib.docsis_tlv import (
+    encode_snmp_varbind,
+    encode_tlv,
+    encode_uint,
+    finalize_cm_config,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_NUMERIC_OID_REGEX = re.compile(r"\.?\d+(\.\d+)+")
+
+
+@dataclass(frozen=True)
+class TlvSymbol:
+    """Config text name of a TLV.
+
+    The kind is one of uchar, ushort, uint, hexstr, string, strzero, ip,
+    snmp or aggregate for TLVs made of sub-TLVs.
+    """
+
+    code: int
+    kind: str
+    children: dict[str, TlvSymbol] = field(default_factory=dict)
+
+
+def _flow_symbols(ref_name: str, direction_specific: dict[str, TlvSymbol]) -> dict:
+    return {
+        ref_name: TlvSymbol(1, "ushort"),
+        f"{ref_name[:2]}ServiceFlowId": TlvSymbol(2, "uint"),
+        "ServiceClassName": TlvSymbol(4, "strzero"),
+        "QosParamSetType": TlvSymbol(6, "uchar"),
+        "TrafficPriority": TlvSymbol(7, "uchar"),
+        "MaxRateSustained": TlvSymbol(8, "uint"),
+        "MaxTrafficBurst": TlvSymbol(9, "uint"),
+        "MinReservedRate": TlvSymbol(10, "uint"),
+        "MinResRatePacketSize": TlvSymbol(11, "ushort"),
+        "ActiveTimeout": TlvSymbol(12, "ushort"),
+        "AdmittedTimeout": TlvSymbol(13, "ushort"),
+        **direction_specific,
+    }
+
+
+_EROUTER = TlvSymbol(
+    202,
+    "aggregate",
+    {
+        "InitializationMode": TlvSymbol(1, "uchar"),
+        "TR69ManagementServer": TlvSymbol(
+            2,
+            "aggregate",
+            {
+                "EnableCWMP": TlvSymbol(1, "uchar"),
+                "URL": TlvSymbol(2, "string"),
+                "Username": TlvSymbol(3, "string"),
+                "Password": TlvSymbol(4, "string"),
+                "ConnectionRequestUsername": TlvSymbol(5, "string"),
+                "ConnectionRequestPassword": TlvSymbol(6, "string"),
+                "ACSOverride": TlvSymbol(7, "uchar"),
+            },
+        ),
+        "InitializationModeOverride": TlvSymbol(3, "uchar"),
+    },
+)
+
+CM_SYMBOLS: dict[str, TlvSymbol] = {
+    "DownstreamFrequency": TlvSymbol(1, "uint"),
+    "UpstreamChannelId": TlvSymbol(2, "uchar"),
+    "NetworkAccess": TlvSymbol(3, "uchar"),
+    "ClassOfService": TlvSymbol(
+        4,
+        "aggregate",
+        {
+            "ClassID": TlvSymbol(1, "uchar"),
+            "MaxRateDown": TlvSymbol(2, "uint"),
+            "MaxRateUp": TlvSymbol(3, "uint"),
+            "PriorityUp": TlvSymbol(4, "uchar"),
+            "GuaranteedUp": TlvSymbol(5, "uint"),
+            "MaxBurstUp": TlvSymbol(6, "ushort"),
+            "PrivacyEnable": TlvSymbol(7, "uchar"),
+        },
+    ),
+    "SwUpgradeFilename": TlvSymbol(9, "string"),
+    "SnmpMibObject": TlvSymbol(11, "snmp"),
+    "MaxCPE": TlvSymbol(18, "uchar"),
+    "SwUpgradeServer": TlvSymbol(21, "ip"),
+    "UsServiceFlow": TlvSymbol(
+        24,
+        "aggregate",
+        _flow_symbols(
+            "UsServiceFlowRef",
+            {
+                "MaxConcatenatedBurst": TlvSymbol(14, "ushort"),
+                "SchedulingType": TlvSymbol(15, "uchar"),
+                "RequestOrTxPolicy": TlvSymbol(16, "uint"),
+                "NominalPollInterval": TlvSymbol(17, "uint"),
+                "ToleratedPollJitter": TlvSymbol(18, "uint"),
+                "UnsolicitedGrantSize": TlvSymbol(19, "ushort"),
+                "NominalGrantInterval": TlvSymbol(20, "uint"),
+                "ToleratedGrantJitter": TlvSymbol(21, "uint"),
+                "GrantsPerInterval": TlvSymbol(22, "uchar"),
+            },
+        ),
+    ),
+    "DsServiceFlow": TlvSymbol(
+        25,
+        "aggregate",
+        _flow_symbols("DsServiceFlowRef", {"MaxDsLatency": TlvSymbol(14, "uint")}),
+    ),
+    "MaxClassifiers": TlvSymbol(28, "ushort"),
+    "GlobalPrivacyEnable": TlvSymbol(29, "uchar"),
+    "VendorSpecific": TlvSymbol(
+        43,
+        "aggregate",
+        {"VendorIdentifier": TlvSymbol(8, "hexstr"), "eRouter": _EROUTER},
+    ),
+    "eRouter": _EROUTER,
+}
+
+
+def _unquote(token: str) -> bytes:
+    if len(token) < 2 or token[0] != '"' or token[-1] != '"':  # noqa: PLR2004
+        msg = f"Expected a quoted string, got {token}"
+        raise NativeEncodingError(msg)
+    return token[1:-1].encode()
+
+
+def _parse_hex(token: str) -> bytes:
+    if not token.lower().startswith("0x"):
+        msg = f"Expected a hex string, got {token}"
+        raise NativeEncodingError(msg)
+    try:
+        return bytes.fromhex(token[2:])
+    except ValueError as exc:
+        raise NativeEncodingError(str(exc)) from exc
+
+
+# pylint: disable-next=too-few-public-methods
+class NativeCmConfigEncoder:
+    """Encode cable modem config files without the docsis compiler.
+
+    Supported TLVs: SnmpMibObject, VendorSpecific, GenericTLV, class of
+    service and service flows, NetworkAccess, GlobalPrivacyEnable, eRouter
+    and a few other scalar TLVs. The CM and CMTS MICs are always added.
+    """
+
+    def __init__(self, oid_resolver: Callable[[str], str] | None = None) -> None:
+        """Initialize the native cable modem config encoder.
+
+        :param oid_resolver: returns the numeric OID of a MIB object name,
+            defaults to accepting numeric OIDs only
+        :type oid_resolver: Callable[[str], str] | None
+        """
+        self._oid_resolver = oid_resolver
+
+    def _resolve_oid(self, oid: str) -> str:
+        if _NUMERIC_OID_REGEX.fullmatch(oid):
+            return oid.lstrip(".")
+        if self._oid_resolver is None:
+            msg = f"Cannot resolve {oid} without a MIB resolver"
+            raise NativeEncodingError(msg)
+        name, _, suffix = oid.partition(".")
+        try:
+            base = self._oid_resolver(name)
+        except ValueError as exc:
+            raise NativeEncodingError(str(exc)) from exc
+        return f"{base}.{suffix}" if suffix else base
+
+    def _encode_snmp_object(self, values: list[str]) -> bytes:
+        if len(values) != 3:  # noqa: PLR2004
+            msg = f"Unsupported SnmpMibObject {' '.join(values)}"
+            raise NativeEncodingError(msg)
+        oid, asn_type, value = values
+        raw_value: str | bytes = value
+        if asn_type == "String":
+            raw_value = _unquote(value)
+        elif asn_type == "HexString":
+            raw_value = _parse_hex(value)
+        return encode_snmp_varbind(self._resolve_oid(oid), asn_type, raw_value)
+
+    @staticmethod
+    def _encode_generic_tlv(values: list[str]) -> bytes:
+        fields = dict(zip(values[::2], values[1::2], strict=False))
+        if len(values) % 2 or "TlvCode" not in fields:
+            msg = f"Unsupported GenericTLV {' '.join(values)}"
+            raise NativeEncodingError(msg)
+        if "TlvString" in fields:
+            value = _unquote(fields["TlvString"])
+        elif "TlvStringZero" in fields:
+            value = _unquote(fields["TlvStringZero"]) + b"\0"
+        elif "TlvValue" in fields:
+            value = _parse_hex(fields["TlvValue"])
+            if "TlvLength" in fields and int(fields["TlvLength"]) != len(value):
+                msg = f"GenericTLV length mismatch in {' '.join(values)}"
+                raise NativeEncodingError(msg)
+        else:
+            msg = f"Unsupported GenericTLV {' '.join(values)}"
+            raise NativeEncodingError(msg)
+        return encode_tlv(int(fields["TlvCode"]), value)
+
+    @staticmethod
+    def _encode_scalar(symbol: TlvSymbol, values: list[str]) -> bytes:
+        if len(values) != 1:
+            msg = f"Expected a single value, got {values}"
+            raise NativeEncodingError(msg)
+        value = values[0]
+        sizes = {"uchar": 1, "ushort": 2, "uint": 4}
+        if symbol.kind in sizes:
+            number = int(value, 16) if value.lower().startswith("0x") else int(value)
+            return encode_uint(number, sizes[symbol.kind])
+        converters: dict[str, Callable[[str], bytes]] = {
+            "hexstr": _parse_hex,
+            "string": _unquote,
+            "strzero": lambda token: _unquote(token) + b"\0",
+            "ip": lambda token: IPv4Address(token).packed,
+        }
+        return converters[symbol.kind](value)
+
+    def _encode_statement(
+        self, statement: ConfigStatement, symbols: dict[str, TlvSymbol]
+    ) -> bytes:
+        if statement.name == "GenericTLV":
+            return self._encode_generic_tlv(statement.values)
+        if (symbol := symbols.get(statement.name)) is None:
+            msg = f"{statement.name} is not supported by the native encoder"
+            raise NativeEncodingError(msg)
+        if symbol.kind == "snmp":
+            value = self._encode_snmp_object(statement.values)
+        elif symbol.kind == "aggregate":
+            if statement.children is None:
+                msg = f"{statement.name} must be a block"
+                raise NativeEncodingError(msg)
+            value = b"".join(
+                self._encode_statement(child, symbol.children)
+                for child in statement.statements
+            )
+        else:
+            value = self._encode_scalar(symbol, statement.values)
+        return encode_tlv(symbol.code, value)
+
+    def encode(self, config: str, shared_secret: bytes = b"") -> bytes:
+        """Encode a cable modem config text file.
+
+        :param config: config text, a single Main block
+        :type config: str
+        :param shared_secret: CMTS shared secret, defaults to none
+        :type shared_secret: bytes
+        :raises NativeEncodingError: when the config uses unsupported TLVs
+        :return: encoded config file content
+        :rtype: bytes
+        """
+        try:
+            statements = parse_config(config)
+        except ValueError as exc:
+            raise NativeEncodingError(str(exc)) from exc
+        main = statements[0] if len(statements) == 1 else None
+        if (
+            not isinstance(main, ConfigStatement)
+            or main.name != "Main"
+            or main.children is None
+        ):
+            msg = "Config must contain a single Main block"
+            raise NativeEncodingError(msg)
+        try:
+            data = b"".join(
+                self._encode_statement(statement, CM_SYMBOLS)
+                for statement in main.statements
+            )
+        except ValueError as exc:
+            raise NativeEncodingError(str(exc)) from exc
+        return finalize_cm_config(data, shared_secret)
@@ -0,0 +1,207 @@
+"""Binary patching of encoded DOCSIS cable modem config files."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from boardfarm3_docsis.lib.docsis_tlv import (
+    encode_tlv,
+    finalize_cm_config,
+    iter_tlvs,
+    split_cm_config,
+)
+
+VENDOR_SPECIFIC_TLV = 43
+VENDOR_IDENTIFIER_TLV = 8
+
+
+def _set_tlv(tlvs: list[tuple[int, bytes]], code: int, value: bytes) -> None:
+    """Replace the first TLV of a type in place, drop the other ones.
+
+    The TLV is appended if the list has none of that type.
+
+    :param tlvs: TLVs to edit
+    :type tlvs: list[tuple[int, bytes]]
+    :param code: TLV type
+    :type code: int
+    :param value: new TLV value
+    :type value: bytes
+    """
+    indexes = [index for index, (tlv_code, _) in enumerate(tlvs) if tlv_code == code]
+    if not indexes:
+        tlvs.append((code, value))
+        return
+    tlvs[indexes[0]] = (code, value)
+    for index in reversed(indexes[1:]):
+        del tlvs[index]
+
+
+class CmConfigPatcher:
+    """Edit the TLVs of an encoded cable modem config file.
+
+    The TLVs are edited in place and the CM and CMTS MICs are computed
+    again on encoding, no config text nor docsis compiler is involved.
+
+    .. code-block:: python
+
+        patcher = CmConfigPatcher.from_file(encoded_cm_config)
+        patcher.set_tlv(29, bytes(1))  # GlobalPrivacyEnable 0
+        patcher.set_vendor_tlv(bytes.fromhex("0050f1"), 202, erouter_tlvs)
+        patcher.write(variant_path)
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the patcher with an encoded config.
+
+        :param data: CM config file content
+        :type data: bytes
+        """
+        self._tlvs = split_cm_config(data)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> CmConfigPatcher:
+        """Initialize the patcher with an encoded config file.
+
+        :param path: CM config file path
+        :type path: str | Path
+        :return: config patcher
+        :rtype: CmConfigPatcher
+        """
+        return cls(Path(path).read_bytes())
+
+    @property
+    def tlvs(self) -> list[tuple[int, bytes]]:
+        """Top level TLVs of the config, without MICs.
+
+        :return: type and value of the TLVs, in file order
+        :rtype: list[tuple[int, bytes]]
+        """
+        return list(self._tlvs)
+
+    def set_tlv(self, code: int, value: bytes) -> CmConfigPatcher:
+        """Replace a top level TLV, or append it if missing.
+
+        Other TLVs of the same type are removed.
+
+        :param code: TLV type
+        :type code: int
+        :param value: TLV value
+        :type value: bytes
+        :return: the patcher
+        :rtype: CmConfigPatcher
+        """
+        _set_tlv(self._tlvs, code, value)
+        return self
+
+    def append_tlv(self, code: int, value: bytes) -> CmConfigPatcher:
+        """Append a top level TLV.
+
+        :param code: TLV type
+        :type code: int
+        :param value: TLV value
+        :type value: bytes
+        :return: the patcher
+        :rtype: CmConfigPatcher
+        """
+        self._tlvs.append((code, value))
+        return self
+
+    def remove_tlv(self, code: int) -> CmConfigPatcher:
+        """Remove all the top level TLVs of a type.
+
+        :param code: TLV type
+        :type code: int
+        :return: the patcher
+        :rtype: CmConfigPatcher
+        """
+        self._tlvs = [tlv for tlv in self._tlvs if tlv[0] != code]
+        return self
+
+    def _get_vendor_block(self, vendor_id: bytes) -> int:
+        for index, (code, value) in enumerate(self._tlvs):
+            if code == VENDOR_SPECIFIC_TLV and (
+                VENDOR_IDENTIFIER_TLV,
+                vendor_id,
+            ) in iter_tlvs(value):
+                return index
+        self._tlvs.append(
+            (VENDOR_SPECIFIC_TLV, encode_tlv(VENDOR_IDENTIFIER_TLV, vendor_id))
+        )
+        return len(self._tlvs) - 1
+
+    def _edit_vendor_block(
+        self, vendor_id: bytes, code: int, value: bytes, replace: bool
+    ) -> CmConfigPatcher:
+        index = self._get_vendor_block(vendor_id)
+        sub_tlvs = iter_tlvs(self._tlvs[index][1])
+        if replace:
+            _set_tlv(sub_tlvs, code, value)
+        else:
+            sub_tlvs.append((code, value))
+        self._tlvs[index] = (
+            VENDOR_SPECIFIC_TLV,
+            b"".join(encode_tlv(*sub_tlv) for sub_tlv in sub_tlvs),
+        )
+        return self
+
+    def set_vendor_tlv(
+        self, vendor_id: bytes, code: int, value: bytes
+    ) -> CmConfigPatcher:
+        """Replace a TLV of a VendorSpecific block, or append it if missing.
+
+        The first VendorSpecific block of the vendor is edited, a new block
+        is appended if there is none.
+
+        :param vendor_id: VendorIdentifier, e.g. bytes.fromhex("0050f1")
+        :type vendor_id: bytes
+        :param code: TLV type within the block
+        :type code: int
+        :param value: TLV value
+        :type value: bytes
+        :return: the patcher
+        :rtype: CmConfigPatcher
+        """
+        return self._edit_vendor_block(vendor_id, code, value, replace=True)
+
+    def append_vendor_tlv(
+        self, vendor_id: bytes, code: int, value: bytes
+    ) -> CmConfigPatcher:
+        """Append a TLV to a VendorSpecific block.
+
+        :param vendor_id: VendorIdentifier, e.g. bytes.fromhex("0050f1")
+        :type vendor_id: bytes
+        :param code: TLV type within the block
+        :type code: int
+        :param value: TLV value
+        :type value: bytes
+        :return: the patcher
+        :rtype: CmConfigPatcher
+        """
+        return self._edit_vendor_block(vendor_id, code, value, replace=False)
+
+    def encode(self, shared_secret: bytes = b"") -> bytes:
+        """Encode the patched config with fresh MICs.
+
+        :param shared_secret: CMTS shared secret, defaults to none
+        :type shared_secret: bytes
+        :return: CM config file content
+        :rtype: bytes
+        """
+        return finalize_cm_config(
+            b"".join(encode_tlv(code, value) for code, value in self._tlvs),
+            shared_secret,
+        )
+
+    def write(self, path: str | Path, shared_secret: bytes = b"") -> Path:
+        """Write the patched config to a file.
+
+        :param path: destination file path
+        :type path: str | Path
+        :param shared_secret: CMTS shared secret, defaults to none
+        :type shared_secret: bytes
+        :return: destination file path
+        :rtype: Path
+        """
+        path = Path(path)
+        path.write_bytes(self.encode(shared_secret))
+        return path
@@ -0,0 +1,301 @@
+"""DOCSIS config file TLV and BER encoding primitives."""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from ipaddress import IPv4Address
+
+from boardfarm3_docsis.exceptions import NativeEncodingError
+
+CM_MIC_TLV = 6
+CMTS_MIC_TLV = 7
+END_OF_DATA_MARKER = b"\xff"
+_MAX_TLV_CODE = _MAX_TLV_LENGTH = 0xFF
+
+# TLVs covered by the CMTS MIC, in digest order
+CMTS_MIC_DIGEST_ORDER = (
+    1,
+    2,
+    3,
+    4,
+    17,
+    43,
+    6,
+    18,
+    19,
+    20,
+    22,
+    23,
+    24,
+    25,
+    28,
+    29,
+    26,
+    35,
+    36,
+    37,
+    40,
+)
+
+# ASN.1 BER tags of the SNMP value types
+BER_INTEGER = 0x02
+BER_OCTET_STRING = 0x04
+BER_NULL = 0x05
+BER_OBJECT_IDENTIFIER = 0x06
+BER_SEQUENCE = 0x30
+BER_IP_ADDRESS = 0x40
+BER_COUNTER32 = 0x41
+BER_GAUGE32 = 0x42
+BER_TIMETICKS = 0x43
+BER_COUNTER64 = 0x46
+
+
+def encode_tlv(code: int, value: bytes) -> bytes:
+    """Encode a TLV with a one byte type and length.
+
+    :param code: TLV type
+    :type code: int
+    :param value: TLV value
+    :type value: bytes
+    :raises NativeEncodingError: when the value does not fit in a TLV
+    :return: encoded TLV
+    :rtype: bytes
+    """
+    if not 0 <= code <= _MAX_TLV_CODE or len(value) > _MAX_TLV_LENGTH:
+        msg = f"TLV {code} of {len(value)} bytes needs an extended encoding"
+        raise NativeEncodingError(msg)
+    return bytes((code, len(value))) + value
+
+
+def iter_tlvs(data: bytes) -> list[tuple[int, bytes]]:
+    """Split an encoded config into its top level TLVs.
+
+    :param data: encoded TLVs, without end of data marker and padding
+    :type data: bytes
+    :raises NativeEncodingError: when a TLV is truncated
+    :return: type and value of the TLVs, in file order
+    :rtype: list[tuple[int, bytes]]
+    """
+    tlvs = []
+    offset = 0
+    while offset < len(data):
+        if offset + 2 > len(data) or offset + 2 + data[offset + 1] > len(data):
+            msg = f"Truncated TLV at offset {offset}"
+            raise NativeEncodingError(msg)
+        code, length = data[offset], data[offset + 1]
+        tlvs.append((code, data[offset + 2 : offset + 2 + length]))
+        offset += 2 + length
+    return tlvs
+
+
+def encode_uint(value: int, size: int) -> bytes:
+    """Encode an unsigned integer TLV value.
+
+    :param value: integer value
+    :type value: int
+    :param size: value size in bytes
+    :type size: int
+    :raises NativeEncodingError: when the value does not fit
+    :return: big endian value
+    :rtype: bytes
+    """
+    try:
+        return value.to_bytes(size, "big")
+    except OverflowError as exc:
+        msg = f"{value} does not fit in {size} bytes"
+        raise NativeEncodingError(msg) from exc
+
+
+def encode_ber_length(length: int) -> bytes:
+    """Encode a BER length in its shortest form.
+
+    :param length: content length
+    :type length: int
+    :return: BER length
+    :rtype: bytes
+    """
+    if length < 0x80:  # noqa: PLR2004
+        return bytes((length,))
+    size = (length.bit_length() + 7) // 8
+    return bytes((0x80 | size,)) + length.to_bytes(size, "big")
+
+
+def encode_ber(tag: int, content: bytes) -> bytes:
+    """Encode a BER element.
+
+    :param tag: BER tag
+    :type tag: int
+    :param content: element content
+    :type content: bytes
+    :return: BER element
+    :rtype: bytes
+    """
+    return bytes((tag,)) + encode_ber_length(len(content)) + content
+
+
+def encode_ber_integer(value: int, tag: int = BER_INTEGER) -> bytes:
+    """Encode an integer in its shortest two's complement form.
+
+    Unsigned SNMP types get a leading zero byte when their high bit is set.
+
+    :param value: integer value
+    :type value: int
+    :param tag: BER tag, defaults to INTEGER
+    :type tag: int
+    :return: BER element
+    :rtype: bytes
+    """
+    size = (value if value >= 0 else ~value).bit_length() // 8 + 1
+    return encode_ber(tag, value.to_bytes(size, "big", signed=True))
+
+
+def encode_ber_oid(oid: str) -> bytes:
+    """Encode a numeric object identifier.
+
+    :param oid: dotted OID, e.g. 1.3.6.1.2.1.1.4.0
+    :type oid: str
+    :raises NativeEncodingError: when the OID is not numeric
+    :return: BER element
+    :rtype: bytes
+    """
+    try:
+        arcs = [int(arc) for arc in oid.strip(".").split(".")]
+    except ValueError as exc:
+        msg = f"OID {oid!r} is not numeric"
+        raise NativeEncodingError(msg) from exc
+    if len(arcs) < 2:  # noqa: PLR2004
+        msg = f"OID {oid!r} is too short"
+        raise NativeEncodingError(msg)
+    content = bytearray()
+    for arc in [arcs[0] * 40 + arcs[1], *arcs[2:]]:
+        chunk = [arc & 0x7F]
+        remaining = arc >> 7
+        while remaining:
+            chunk.append(0x80 | (remaining & 0x7F))
+            remaining >>= 7
+        content.extend(reversed(chunk))
+    return encode_ber(BER_OBJECT_IDENTIFIER, bytes(content))
+
+
+# pylint: disable-next=too-many-return-statements
+def encode_snmp_value(asn_type: str, value: str | bytes) -> bytes:
+    """Encode an SNMP value given in the docsis config text syntax.
+
+    :param asn_type: value type, e.g. Integer, String, IPAddress
+    :type asn_type: str
+    :param value: value, raw bytes for String and HexString
+    :type value: str | bytes
+    :raises NativeEncodingError: when the type is not supported
+    :return: BER element
+    :rtype: bytes
+    """
+    integer_tags = {
+        "Integer": BER_INTEGER,
+        "Counter32": BER_COUNTER32,
+        "Counter": BER_COUNTER32,
+        "Gauge32": BER_GAUGE32,
+        "Gauge": BER_GAUGE32,
+        "Unsigned32": BER_GAUGE32,
+        "TimeTicks": BER_TIMETICKS,
+        "Counter64": BER_COUNTER64,
+    }
+    if asn_type in integer_tags:
+        return encode_ber_integer(int(value), integer_tags[asn_type])
+    if asn_type in {"String", "HexString"}:
+        raw = value if isinstance(value, bytes) else value.encode()
+        return encode_ber(BER_OCTET_STRING, raw)
+    if asn_type == "IPAddress":
+        return encode_ber(BER_IP_ADDRESS, IPv4Address(str(value)).packed)
+    if asn_type == "ObjectID":
+        return encode_ber_oid(str(value))
+    msg = f"SNMP type {asn_type} is not supported"
+    raise NativeEncodingError(msg)
+
+
+def encode_snmp_varbind(oid: str, asn_type: str, value: str | bytes) -> bytes:
+    """Encode an SNMP VarBind, the value of a SnmpMibObject TLV.
+
+    :param oid: numeric OID
+    :type oid: str
+    :param asn_type: value type, e.g. Integer, String, IPAddress
+    :type asn_type: str
+    :param value: value, raw bytes for String and HexString
+    :type value: str | bytes
+    :return: BER VarBind sequence
+    :rtype: bytes
+    """
+    return encode_ber(
+        BER_SEQUENCE, encode_ber_oid(oid) + encode_snmp_value(asn_type, value)
+    )
+
+
+def get_cm_mic(data: bytes) -> bytes:
+    """Compute the CM MIC of the given TLVs.
+
+    :param data: encoded TLVs preceding the CM MIC
+    :type data: bytes
+    :return: MD5 digest
+    :rtype: bytes
+    """
+    return hashlib.md5(data, usedforsecurity=False).digest()
+
+
+def get_cmts_mic(data: bytes, shared_secret: bytes) -> bytes:
+    """Compute the CMTS MIC of the given TLVs.
+
+    :param data: encoded TLVs, including the CM MIC
+    :type data: bytes
+    :param shared_secret: CMTS shared secret, empty if none
+    :type shared_secret: bytes
+    :return: HMAC-MD5 digest
+    :rtype: bytes
+    """
+    tlvs = iter_tlvs(data)
+    digest = hmac.new(shared_secret, digestmod="md5")
+    for code in CMTS_MIC_DIGEST_ORDER:
+        for tlv_code, value in tlvs:
+            if tlv_code == code:
+                digest.update(encode_tlv(tlv_code, value))
+    return digest.digest()
+
+
+def finalize_cm_config(data: bytes, shared_secret: bytes = b"") -> bytes:
+    """Add the MICs, end of data marker and padding to CM config TLVs.
+
+    :param data: encoded config TLVs
+    :type data: bytes
+    :param shared_secret: CMTS shared secret, defaults to none
+    :type shared_secret: bytes
+    :return: CM config file content
+    :rtype: bytes
+    """
+    data += encode_tlv(CM_MIC_TLV, get_cm_mic(data))
+    data += encode_tlv(CMTS_MIC_TLV, get_cmts_mic(data, shared_secret))
+    data += END_OF_DATA_MARKER
+    return data + b"\x00" * (-len(data) % 4)
+
+
+def split_cm_config(data: bytes) -> list[tuple[int, bytes]]:
+    """Split an encoded CM config file into its TLVs.
+
+    The MICs, end of data marker and padding are left out, so that the
+    TLVs can be edited and finalized again.
+
+    :param data: CM config file content
+    :type data: bytes
+    :raises NativeEncodingError: when a TLV is truncated
+    :return: type and value of the TLVs, in file order
+    :rtype: list[tuple[int, bytes]]
+    """
+    end = 0
+    while end < len(data) and data[end] != END_OF_DATA_MARKER[0]:
+        if end + 2 > len(data):
+            msg = f"Truncated TLV at offset {end}"
+            raise NativeEncodingError(msg)
+        end += 2 + data[end + 1]
+    return [
+        (code, value)
+        for code, value in iter_tlvs(data[:end])
+        if code not in {CM_MIC_TLV, CMTS_MIC_TLV}
+    ]
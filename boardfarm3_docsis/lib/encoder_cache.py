@@ -0,0 +1,229 @@
+"""Content addressed on-disk cache of encoded DOCSIS config files."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = str(Path(tempfile.gettempdir()) / "boardfarm3_docsis-encoder-cache")
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+# MIB directory keys, with the directory modification times they were
+# computed at
+_MIBS_DIR_KEYS: dict[str, tuple[tuple[tuple[str, int], ...], str]] = {}
+_MIBS_DIR_KEYS_LOCK = threading.Lock()
+
+
+def _get_dir_mtimes(mibs_dir: str) -> tuple[tuple[str, int], ...]:
+    mtimes = []
+    for dir_path, dir_names, _ in os.walk(mibs_dir):
+        dir_names.sort()
+        with suppress(OSError):
+            mtimes.append((dir_path, Path(dir_path).stat().st_mtime_ns))
+    return tuple(mtimes)
+
+
+def _get_mibs_dir_key(mibs_dir: str) -> str:
+    dir_mtimes = _get_dir_mtimes(mibs_dir)
+    with _MIBS_DIR_KEYS_LOCK:
+        cached_key = _MIBS_DIR_KEYS.get(mibs_dir)
+    if cached_key and cached_key[0] == dir_mtimes:
+        return cached_key[1]
+    digest = hashlib.sha256()
+    for mib_file in sorted(Path(mibs_dir).glob("**/*")):
+        with suppress(OSError):
+            if mib_file.is_file():
+                stat = mib_file.stat()
+                digest.update(
+                    f"{mib_file}@{stat.st_size}@{stat.st_mtime_ns}\0".encode()
+                )
+    with _MIBS_DIR_KEYS_LOCK:
+        _MIBS_DIR_KEYS[mibs_dir] = (dir_mtimes, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def get_mibs_key(mibs_path: list[str]) -> str:
+    """Compute the key of a MIB set.
+
+    Every MIB file contributes its path, size and modification time. The
+    files are only listed again when the modification time of one of the
+    MIB directories changes, i.e. when a file is added, removed or replaced,
+    so a MIB file edited in place is only picked up with the next change of
+    its directory.
+
+    :param mibs_path: mibs directory paths
+    :type mibs_path: list[str]
+    :return: MIB set key
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for mibs_dir in mibs_path:
+        digest.update(f"{mibs_dir}\0{_get_mibs_dir_key(mibs_dir)}\0".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of an encoder cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class EncoderCache:
+    """Content addressed cache of encoded config files.
+
+    Entries are keyed by a hash of everything the encoder output depends on
+    and shared by all the processes of a host. Entries are written
+    atomically and the least recently used ones are evicted once the cache
+    grows over ``max_size`` bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Initialize the encoder cache.
+
+        :param cache_dir: cache directory, defaults to DEFAULT_CACHE_DIR
+        :type cache_dir: str
+        :param max_size: maximum size of the cache in bytes, defaults to
+            DEFAULT_CACHE_SIZE
+        :type max_size: int
+        """
+        self._cache_dir = Path(cache_dir)
+        self._max_size = max_size
+        self._stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit and miss counters of this process.
+
+        :return: cache counters
+        :rtype: CacheStats
+        """
+        return self._stats
+
+    @staticmethod
+    def get_key(
+        config: str,
+        mibs_path: list[str],
+        options: str,
+        key_file: str,
+    ) -> str:
+        """Compute the cache key of an encoder call.
+
+        The MIB set contributes its key, see get_mibs_key, and the key file
+        its content, so that changes on disk invalidate the entries.
+
+        :param config: config text
+        :type config: str
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :param options: encoder command line options
+        :type options: str
+        :param key_file: shared secret file path, empty if unused
+        :type key_file: str
+        :return: cache key
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        for part in (config, options, key_file):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(get_mibs_key(mibs_path).encode())
+        if key_file and Path(key_file).is_file():
+            digest.update(Path(key_file).read_bytes())
+        return digest.hexdigest()
+
+    def get(self, key: str, suffix: str, prefix: str = "") -> Path | None:
+        """Return a private copy of the cached file of a key.
+
+        An entry evicted by another process before it is opened is a miss.
+
+        :param key: cache key
+        :type key: str
+        :param suffix: encoded file extension
+        :type suffix: str
+        :param prefix: name prefix of the copy, defaults to ""
+        :type prefix: str
+        :return: copy of the cached file, owned by the caller, None on cache
+            miss
+        :rtype: Path | None
+        """
+        entry = self._cache_dir / f"{key}{suffix}"
+        try:
+            cached_file = entry.open("rb")
+        except FileNotFoundError:
+            with self._stats_lock:
+                self._stats.misses += 1
+            return None
+        with (
+            cached_file,
+            tempfile.NamedTemporaryFile(
+                prefix=prefix, suffix=suffix, delete=False
+            ) as file_copy,
+        ):
+            shutil.copyfileobj(cached_file, file_copy)
+        # refresh the entry for the LRU eviction
+        with suppress(FileNotFoundError):
+            os.utime(entry)
+        with self._stats_lock:
+            self._stats.hits += 1
+        _LOGGER.debug("Encoder cache hit %s", entry.name)
+        return Path(file_copy.name)
+
+    def put(self, key: str, suffix: str, encoded_file: Path) -> Path:
+        """Add an encoded file to the cache.
+
+        :param key: cache key
+        :type key: str
+        :param suffix: encoded file extension
+        :type suffix: str
+        :param encoded_file: encoded file to store, left untouched
+        :type encoded_file: Path
+        :return: path to the cached file
+        :rtype: Path
+        """
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._cache_dir / f"{key}{suffix}"
+        with tempfile.NamedTemporaryFile(
+            dir=self._cache_dir, suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_file.write(encoded_file.read_bytes())
+        Path(temp_file.name).replace(entry)
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self._cache_dir.iterdir():
+            if entry.suffix == ".tmp":
+                continue
+            with suppress(FileNotFoundError):
+                entries.append((entry.stat(), entry))
+        cache_size = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if cache_size <= self._max_size:
+                break
+            entry.unlink(missing_ok=True)
+            cache_size -= stat.st_size
+            with self._stats_lock:
+                self._stats.evictions += 1
+            _LOGGER.debug("Evicted %s from the encoder cache", entry.name)
+
+    def clear(self) -> None:
+        """Remove all the cached files."""
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
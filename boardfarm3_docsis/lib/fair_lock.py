@@ -0,0 +1,328 @@
+"""Host side FIFO lock shared by boardfarm sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from boardfarm3.exceptions import FileLockTimeout
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_LOCK_DIR = str(Path(tempfile.gettempdir()) / "boardfarm3_docsis-locks")
+
+
+@dataclass(frozen=True)
+class LockHolder:
+    """Identity of a lock holder or waiter."""
+
+    identity: str
+    hostname: str
+    pid: int
+    queued_at: float
+
+
+@dataclass
+class LockStats:
+    """Wait and hold time metrics of a lock, in seconds."""
+
+    acquisitions: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    total_hold: float = 0.0
+    max_hold: float = 0.0
+    stale_locks_broken: int = 0
+
+
+# pylint: disable-next=too-many-instance-attributes
+class FairLock:
+    """FIFO lock shared by all the processes of a host.
+
+    Every contender drops a ticket file in the queue directory of the lock.
+    Tickets are named after the time they were queued, so the oldest ticket
+    is the lock holder and the other ones are served in arrival order.
+
+    Waiters refresh their ticket while polling and the holder refreshes it
+    from a heartbeat thread for as long as it holds the lock. A ticket of
+    this host is stale when its process no longer exists, a ticket of
+    another host when it was not refreshed within ``stale_timeout``. Stale
+    tickets are removed by the next waiter.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lock_dir: str = DEFAULT_LOCK_DIR,
+        stale_timeout: float = 600,
+        poll_interval: float = 0.2,
+    ) -> None:
+        """Initialize the fair lock.
+
+        :param name: lock name, shared by all the contenders
+        :type name: str
+        :param lock_dir: directory holding the lock queues, defaults to
+            DEFAULT_LOCK_DIR
+        :type lock_dir: str
+        :param stale_timeout: seconds after which an unrefreshed ticket of
+            another host is considered stale, defaults to 600
+        :type stale_timeout: float
+        :param poll_interval: seconds between two queue checks, defaults to 0.2
+        :type poll_interval: float
+        """
+        self._name = re.sub(r"[^\w.-]", "_", name)
+        self._queue_dir = Path(lock_dir) / self._name
+        self._stale_timeout = stale_timeout
+        self._poll_interval = poll_interval
+        self._hostname = socket.gethostname()
+        self._ticket: Path | None = None
+        self._acquired_at = 0.0
+        self._stats = LockStats()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    @property
+    def name(self) -> str:
+        """Name of the lock.
+
+        :return: lock name
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def stats(self) -> LockStats:
+        """Wait and hold time metrics of this process.
+
+        :return: lock metrics
+        :rtype: LockStats
+        """
+        return self._stats
+
+    @property
+    def is_held(self) -> bool:
+        """Whether this instance currently holds the lock.
+
+        :return: True if the lock is held
+        :rtype: bool
+        """
+        return self._ticket is not None and self._acquired_at > 0
+
+    def _queue(self) -> list[Path]:
+        return sorted(self._queue_dir.glob("*.ticket"))
+
+    @staticmethod
+    def _read_ticket(ticket: Path) -> LockHolder | None:
+        try:
+            return LockHolder(**json.loads(ticket.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def holder(self) -> LockHolder | None:
+        """Return the current holder of the lock.
+
+        :return: holder details, None if the lock is free
+        :rtype: LockHolder | None
+        """
+        for ticket in self._queue():
+            if (holder := self._read_ticket(ticket)) is not None:
+                return holder
+        return None
+
+    def _is_stale(self, ticket: Path, holder: LockHolder | None) -> bool:
+        if holder is not None and holder.hostname == self._hostname:
+            return not self._is_alive(holder.pid)
+        try:
+            age = time.time() - ticket.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return holder is None or age > self._stale_timeout
+
+    @staticmethod
+    def _is_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _enqueue(self, identity: str) -> Path:
+        self._queue_dir.mkdir(parents=True, exist_ok=True)
+        holder = LockHolder(identity, self._hostname, os.getpid(), time.time())
+        ticket = self._queue_dir / (
+            f"{time.time_ns():020d}-{self._hostname}-{holder.pid}.ticket"
+        )
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            dir=self._queue_dir,
+            suffix=".tmp",
+            encoding="utf-8",
+            delete=False,
+        ) as temp_file:
+            json.dump(holder.__dict__, temp_file)
+        Path(temp_file.name).replace(ticket)
+        return ticket
+
+    def _is_first_in_queue(self, ticket: Path) -> bool:
+        """Check whether the given ticket is at the head of the queue.
+
+        Stale tickets ahead of the given ticket are removed.
+
+        :param ticket: ticket of this process
+        :type ticket: Path
+        :return: True if the ticket holds the lock
+        :rtype: bool
+        """
+        for head in self._queue():
+            if head == ticket:
+                return True
+            holder = self._read_ticket(head)
+            if not self._is_stale(head, holder):
+                return False
+            _LOGGER.warning("Breaking stale lock %s held by %s", self._name, holder)
+            with suppress(FileNotFoundError):
+                head.unlink()
+            self._stats.stale_locks_broken += 1
+        return False
+
+    def _on_acquired(self, ticket: Path, wait_time: float) -> None:
+        ticket.touch()
+        self._ticket = ticket
+        self._acquired_at = time.monotonic()
+        self._heartbeat_stop.clear()
+        self._heartbeat = threading.Thread(
+            target=self._refresh_ticket,
+            args=(ticket,),
+            name=f"fair-lock-{self._name}",
+            daemon=True,
+        )
+        self._heartbeat.start()
+        self._stats.acquisitions += 1
+        self._stats.total_wait += wait_time
+        self._stats.max_wait = max(self._stats.max_wait, wait_time)
+        _LOGGER.info("Acquired lock %s after %.2f seconds", self._name, wait_time)
+
+    def _refresh_ticket(self, ticket: Path) -> None:
+        # keep the ticket fresh for the contenders of other hosts
+        while not self._heartbeat_stop.wait(self._stale_timeout / 4):
+            with suppress(FileNotFoundError):
+                os.utime(ticket)
+
+    def _on_timeout(self, ticket: Path, timeout: float) -> None:
+        ticket.unlink(missing_ok=True)
+        err_msg = (
+            f"Failed to acquire lock {self._name} within {timeout} seconds, "
+            f"held by {self.holder()}"
+        )
+        raise FileLockTimeout(err_msg)
+
+    def _wait_step(
+        self,
+        ticket: Path,
+        start_time: float,
+        timeout: float,
+        logged_holder: LockHolder | None,
+    ) -> LockHolder | None:
+        if time.monotonic() - start_time > timeout:
+            self._on_timeout(ticket, timeout)
+        if (holder := self.holder()) != logged_holder:
+            _LOGGER.info("Waiting for lock %s held by %s", self._name, holder)
+        ticket.touch()
+        return holder
+
+    def acquire(self, identity: str, timeout: float = 600) -> None:
+        """Wait in the queue until the lock is acquired.
+
+        :param identity: name of the contender, e.g. the board name
+        :type identity: str
+        :param timeout: maximum time to wait in seconds, defaults to 600
+        :type timeout: float
+        """
+        start_time = time.monotonic()
+        ticket = self._enqueue(identity)
+        holder = None
+        while not self._is_first_in_queue(ticket):
+            holder = self._wait_step(ticket, start_time, timeout, holder)
+            time.sleep(self._poll_interval)
+        self._on_acquired(ticket, time.monotonic() - start_time)
+
+    async def acquire_async(self, identity: str, timeout: float = 600) -> None:
+        """Wait in the queue until the lock is acquired, using asyncio.
+
+        :param identity: name of the contender, e.g. the board name
+        :type identity: str
+        :param timeout: maximum time to wait in seconds, defaults to 600
+        :type timeout: float
+        """
+        start_time = time.monotonic()
+        ticket = self._enqueue(identity)
+        holder = None
+        while not self._is_first_in_queue(ticket):
+            holder = self._wait_step(ticket, start_time, timeout, holder)
+            await asyncio.sleep(self._poll_interval)
+        self._on_acquired(ticket, time.monotonic() - start_time)
+
+    def release(self) -> None:
+        """Release the lock held by this instance."""
+        if not self.is_held:
+            return
+        hold_time = time.monotonic() - self._acquired_at
+        self._stats.total_hold += hold_time
+        self._stats.max_hold = max(self._stats.max_hold, hold_time)
+        self._heartbeat_stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        self._ticket.unlink(missing_ok=True)
+        self._ticket = None
+        self._acquired_at = 0
+        _LOGGER.info("Released lock %s after %.2f seconds", self._name, hold_time)
+
+    @contextmanager
+    def hold(self, identity: str, timeout: float = 600) -> Iterator[None]:
+        """Hold the lock for the duration of the context.
+
+        :param identity: name of the contender, e.g. the board name
+        :type identity: str
+        :param timeout: maximum time to wait in seconds, defaults to 600
+        :type timeout: float
+        :yield: once the lock is acquired
+        """
+        self.acquire(identity, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def hold_async(
+        self, identity: str, timeout: float = 600
+    ) -> AsyncIterator[None]:
+        """Hold the lock for the duration of the async context.
+
+        :param identity: name of the contender, e.g. the board name
+        :type identity: str
+        :param timeout: maximum time to wait in seconds, defaults to 600
+        :type timeout: float
+        :yield: once the lock is acquired
+        """
+        await self.acquire_async(identity, timeout)
+        try:
+            yield
+        finally:
+            self.release()
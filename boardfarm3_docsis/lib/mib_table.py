@@ -0,0 +1,155 @@
+"""MIB name to OID resolution table, compiled once per MIB set."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import tempfile
+import threading
+from contextlib import suppress
+from functools import lru_cache
+from pathlib import Path
+
+from boardfarm3.lib.mibs_compiler import MibsCompiler
+
+from boardfarm3_docsis.lib.encoder_cache import get_mibs_key
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MIB_TABLE_DIR = str(
+    Path(tempfile.gettempdir()) / "boardfarm3_docsis-mib-tables"
+)
+
+_NUMERIC_OID_REGEX = re.compile(r"^\.?\d+(\.\d+)*$")
+# SnmpMibObject <oid> <type> <value> and ObjectID typed values
+_SNMP_OID_REGEX = re.compile(
+    r"(?P<keyword>\bSnmpMibObject\s+)(?P<oid>[^\s;]+)"
+    r"|(?P<type>\bObjectID\s+)(?P<value>[^\s;]+)"
+)
+_TABLE_LOCK = threading.Lock()
+
+
+class _MibsTableCompiler(MibsCompiler):
+    """MIBs compiler exposing every compiled OID."""
+
+    @property
+    def oids(self) -> dict[str, str]:
+        """MIB name to OID mapping of the compiled MIBs.
+
+        :return: OIDs by MIB name
+        :rtype: dict[str, str]
+        """
+        return {name: item["oid"] for name, item in self._mibs_dict.items()}
+
+
+def _is_numeric_oid(oid: str) -> bool:
+    return _NUMERIC_OID_REGEX.match(oid) is not None
+
+
+class MibOidTable:
+    """MIB name to OID table of a MIB set.
+
+    Compiling the MIB files is done once per MIB set and host, the table is
+    stored on disk keyed by the MIB directories content, see get_mibs_key.
+    """
+
+    def __init__(
+        self, mibs_path: list[str], table_dir: str = DEFAULT_MIB_TABLE_DIR
+    ) -> None:
+        """Load the OID table of a MIB set, compile it on first use.
+
+        :param mibs_path: mibs directory paths
+        :type mibs_path: list[str]
+        :param table_dir: table storage directory, defaults to
+            DEFAULT_MIB_TABLE_DIR
+        :type table_dir: str
+        """
+        table_file = Path(table_dir) / f"{get_mibs_key(mibs_path)}.json"
+        oids: dict[str, str] | None = None
+        with suppress(OSError, ValueError):
+            oids = json.loads(table_file.read_text(encoding="utf-8"))
+        if oids is None:
+            _LOGGER.debug("Compiling the MIB OID table of %s", mibs_path)
+            oids = _MibsTableCompiler(mibs_path).oids
+            table_file.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                mode="w",
+                dir=table_file.parent,
+                suffix=".tmp",
+                encoding="utf-8",
+                delete=False,
+            ) as temp_file:
+                json.dump(oids, temp_file)
+            Path(temp_file.name).replace(table_file)
+        self._oids = oids
+
+    def get_mib_oid(self, mib_name: str) -> str:
+        """Get OID of given MIB.
+
+        :param mib_name: MIB name
+        :type mib_name: str
+        :raises ValueError: when unable to find given mib
+        :return: OID of the given MIB
+        :rtype: str
+        """
+        if mib_name in self._oids:
+            return self._oids[mib_name]
+        msg = f"Unable to find OID of {mib_name!r} MIB"
+        raise ValueError(msg)
+
+    def resolve(self, oid: str) -> str:
+        """Resolve a symbolic OID, e.g. sysContact.0, to its numeric form.
+
+        :param oid: symbolic or numeric OID
+        :type oid: str
+        :return: numeric OID, the given OID if it cannot be resolved
+        :rtype: str
+        """
+        if _is_numeric_oid(oid):
+            return oid
+        name, _, index = oid.partition(".")
+        if name not in self._oids:
+            return oid
+        return f"{self._oids[name]}.{index}" if index else self._oids[name]
+
+    def resolve_config(self, config: str) -> tuple[str, bool]:
+        """Rewrite the symbolic SnmpMibObject OIDs of a config to numeric ones.
+
+        :param config: config text
+        :type config: str
+        :return: rewritten config and whether it is free of symbolic OIDs,
+            i.e. the encoder does not need to load any MIB
+        :rtype: tuple[str, bool]
+        """
+        unresolved = False
+
+        def _rewrite(match: re.Match[str]) -> str:
+            nonlocal unresolved
+            prefix, oid = (
+                ("keyword", "oid") if match.group("keyword") else ("type", "value")
+            )
+            numeric_oid = self.resolve(match.group(oid))
+            unresolved = unresolved or not _is_numeric_oid(numeric_oid)
+            return f"{match.group(prefix)}{numeric_oid}"
+
+        return _SNMP_OID_REGEX.sub(_rewrite, config), not unresolved
+
+
+@lru_cache(maxsize=8)
+def _load_mib_table(mibs_path: tuple[str, ...], _mibs_key: str) -> MibOidTable:
+    return MibOidTable(list(mibs_path))
+
+
+def get_mib_table(mibs_path: list[str]) -> MibOidTable:
+    """Return the OID table of a MIB set, shared within the process.
+
+    The table is loaded again once the MIB set changes.
+
+    :param mibs_path: mibs directory paths
+    :type mibs_path: list[str]
+    :return: MIB OID table
+    :rtype: MibOidTable
+    """
+    with _TABLE_LOCK:
+        return _load_mib_table(tuple(mibs_path), get_mibs_key(mibs_path))
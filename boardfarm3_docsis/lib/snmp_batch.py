@@ -0,0 +1,254 @@
+"""Multi-varbind SNMP requests, run with the net-snmp command line tools.
+
+Several objects are read or written with a single PDU, i.e. a single
+``snmpget`` or ``snmpset`` command with one varbind per object, and the
+output is parsed back per varbind.
+"""
+
+from __future__ import annotations
+
+import re
+import shlex
+from dataclasses import dataclass
+from ipaddress import ip_address
+from typing import TYPE_CHECKING
+
+from boardfarm3.exceptions import SNMPError
+
+if TYPE_CHECKING:
+    from boardfarm3.lib.mibs_compiler import MibsCompiler
+
+_OID_REGEX = re.compile(r"^([1-9]\d{0,6}|0)(\.([1-9]\d{0,6}|0)){3,30}$")
+_VARBIND_REGEX = re.compile(r"^\.?(?P<oid>[\d.]+)\s+=\s+(?P<result>.*)$", re.MULTILINE)
+_TYPED_VALUE_REGEX = re.compile(r"^(?P<type>[\w-]+):\s*(?P<value>.*)$")
+_ERROR_REASON_REGEX = re.compile(r"^Reason:\s*(?P<reason>.+)$", re.MULTILINE)
+_FAILED_OBJECT_REGEX = re.compile(r"^Failed object:\s*\.?(?P<oid>[\d.]+)", re.MULTILINE)
+# encoded size budget of the varbinds of a request, below the 1472 bytes of
+# UDP payload of an Ethernet frame, with room for the message headers
+MAX_VARBINDS_SIZE = 1200
+# estimated encoded size of a varbind, besides the OID sub-identifiers
+_VARBIND_OVERHEAD = 8
+# snmpset type letters of the MIBInfo types and of the SMI types
+SNMP_SET_TYPES = {
+    "integer": "i",
+    "integer32": "i",
+    "unsigned": "u",
+    "unsigned32": "u",
+    "gauge32": "u",
+    "timeticks": "t",
+    "ipaddress": "a",
+    "objectid": "o",
+    "objectidentifier": "o",
+    "string": "s",
+    "octetstring": "s",
+    "hexstring": "x",
+    "decimalstring": "d",
+    "bits": "b",
+    "counter64": "U",
+    "integer64": "I",
+    "float": "F",
+    "double": "D",
+}
+
+
+@dataclass(frozen=True)
+class VarbindResult:
+    """Result of one varbind of a multi-varbind SNMP request."""
+
+    oid: str
+    value: str = ""
+    type: str = ""
+    error: str | None = None
+
+    @property
+    def is_successful(self) -> bool:
+        """Whether the varbind succeeded.
+
+        :return: True if the agent returned a value for the varbind
+        :rtype: bool
+        """
+        return self.error is None
+
+
+def is_numeric_oid(mib_name: str) -> bool:
+    """Check whether a MIB name is already a numeric OID.
+
+    :param mib_name: MIB name or numeric OID
+    :type mib_name: str
+    :return: True for a numeric OID
+    :rtype: bool
+    """
+    return _OID_REGEX.match(mib_name) is not None
+
+
+def resolve_oid(mib_name: str, index: int, mibs_compiler: MibsCompiler) -> str:
+    """Return the numeric OID of a MIB object instance.
+
+    :param mib_name: MIB name or numeric OID
+    :type mib_name: str
+    :param index: MIB index
+    :type index: int
+    :param mibs_compiler: MIBs compiler of the board
+    :type mibs_compiler: MibsCompiler
+    :raises SNMPError: when the MIB is not in the loaded MIB libraries
+    :return: numeric OID of the instance
+    :rtype: str
+    """
+    if is_numeric_oid(mib_name):
+        return f"{mib_name}.{index}"
+    try:
+        return f"{mibs_compiler.get_mib_oid(mib_name)}.{index}"
+    except ValueError as exception:
+        msg = f"MIB not available, Error: {exception}"
+        raise SNMPError(msg) from exception
+
+
+def get_set_type(mib_type: str) -> str:
+    """Return the snmpset type letter of a MIB type.
+
+    :param mib_type: MIB type, e.g. Integer or HexString, or a type letter
+    :type mib_type: str
+    :raises ValueError: on unknown MIB types
+    :return: snmpset type letter, e.g. i or x
+    :rtype: str
+    """
+    if mib_type in SNMP_SET_TYPES.values():
+        return mib_type
+    try:
+        return SNMP_SET_TYPES[mib_type.replace(" ", "").replace("_", "").lower()]
+    except KeyError as exc:
+        msg = f"Unknown SNMP type {mib_type!r}"
+        raise ValueError(msg) from exc
+
+
+def format_set_varbind(oid: str, mib_type: str, value: str | int) -> str:
+    """Return an snmpset varbind argument.
+
+    Hex strings may be given with a 0x prefix, or as an IP address which
+    is encoded in network order.
+
+    :param oid: numeric OID of the instance
+    :type oid: str
+    :param mib_type: MIB type, e.g. Integer or HexString, or a type letter
+    :type mib_type: str
+    :param value: value to set
+    :type value: str | int
+    :return: OID, type letter and value quoted for the shell
+    :rtype: str
+    """
+    set_type = get_set_type(mib_type)
+    text = str(value)
+    if set_type == "x":
+        try:
+            text = ip_address(text).packed.hex()
+        except ValueError:
+            text = text.removeprefix("0x").removeprefix("0X")
+        text = text.replace(" ", "").upper()
+    return f"{oid} {set_type} {shlex.quote(text)}"
+
+
+def build_snmp_command(  # pylint: disable=too-many-arguments  # noqa: PLR0913
+    action: str,
+    target_ip: str,
+    varbinds: list[str],
+    community: str = "private",
+    timeout: int = 10,
+    retries: int = 3,
+    extra_args: str = "",
+) -> str:
+    """Return a net-snmp command with several varbinds.
+
+    :param action: net-snmp command, e.g. snmpget or snmpset
+    :type action: str
+    :param target_ip: IP address of the SNMP agent
+    :type target_ip: str
+    :param varbinds: command line varbinds, e.g. OIDs or OID type value
+    :type varbinds: list[str]
+    :param community: SNMP community, defaults to "private"
+    :type community: str
+    :param timeout: seconds, defaults to 10
+    :type timeout: int
+    :param retries: number of retries, defaults to 3
+    :type retries: int
+    :param extra_args: extra net-snmp arguments, defaults to ""
+    :type extra_args: str
+    :return: net-snmp command
+    :rtype: str
+    """
+    options = f" {extra_args.strip()}" if extra_args.strip() else ""
+    return (
+        f"{action} -v 2c -On{options} -c {community} -t {timeout} -r {retries}"
+        f" {target_ip} {' '.join(varbinds)}"
+    )
+
+
+def chunk_oids(
+    oids: list[str], max_varbinds: int, max_size: int = MAX_VARBINDS_SIZE
+) -> list[list[str]]:
+    """Split the OIDs of a request into chunks fitting in one PDU.
+
+    The encoded size of a GET varbind is estimated from the number of
+    sub-identifiers of its OID. The size of the response is not known in
+    advance, so a response still too big is split again on tooBig.
+
+    :param oids: numeric OIDs to request
+    :type oids: list[str]
+    :param max_varbinds: maximum number of varbinds of a PDU
+    :type max_varbinds: int
+    :param max_size: estimated maximum encoded size of the varbinds of a PDU,
+        defaults to MAX_VARBINDS_SIZE
+    :type max_size: int
+    :return: OIDs of each PDU
+    :rtype: list[list[str]]
+    """
+    chunks: list[list[str]] = []
+    size = 0
+    for oid in oids:
+        oid_size = oid.count(".") + 1 + _VARBIND_OVERHEAD
+        if not chunks or len(chunks[-1]) >= max_varbinds or size + oid_size > max_size:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(oid)
+        size += oid_size
+    return chunks
+
+
+def get_error_reason(output: str) -> tuple[str, str | None] | None:
+    """Return the error of a failed SNMP request.
+
+    :param output: net-snmp command output
+    :type output: str
+    :return: error reason and failed OID if known, None if no error
+    :rtype: tuple[str, str | None] | None
+    """
+    if match := _ERROR_REASON_REGEX.search(output):
+        failed_object = _FAILED_OBJECT_REGEX.search(output)
+        return match["reason"].strip(), failed_object["oid"] if failed_object else None
+    if "Timeout" in output or "No Response" in output:
+        return output.strip(), None
+    return None
+
+
+def parse_varbinds(oids: list[str], output: str) -> dict[str, VarbindResult]:
+    """Parse the output of a multi-varbind request, one result per OID.
+
+    :param oids: numeric OIDs of the request
+    :type oids: list[str]
+    :param output: net-snmp command output, with numeric OIDs (-On)
+    :type output: str
+    :return: result of each OID, with an error when it has no value
+    :rtype: dict[str, VarbindResult]
+    """
+    results: dict[str, VarbindResult] = {}
+    for match in _VARBIND_REGEX.finditer(output):
+        oid, result = match["oid"], match["result"].strip()
+        if typed_value := _TYPED_VALUE_REGEX.match(result):
+            results[oid] = VarbindResult(
+                oid, typed_value["value"].strip().strip('"'), typed_value["type"]
+            )
+        else:
+            results[oid] = VarbindResult(oid, error=result)
+    return {
+        oid: results.get(oid, VarbindResult(oid, error="No value returned"))
+        for oid in oids
+    }
@@ -0,0 +1,120 @@
+"""Session registry of the SNMP clients of the cable modems."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from boardfarm3.lib.SNMPv2 import SNMPv2
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from boardfarm3.templates.cpe import CPE
+    from boardfarm3.templates.wan import WAN
+
+    from boardfarm3_docsis.templates.cmts import CMTS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnmpContextRegistry:
+    """SNMP clients of the boards, keyed by CM MAC address.
+
+    The CM management IP address is read from the CMTS once per board and
+    the SNMPv2 clients are reused per WAN device name, until the board is
+    reset or reprovisioned and its entry is invalidated.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty SNMP context registry."""
+        self._ip_addresses: dict[str, str] = {}
+        self._clients: dict[str, dict[str, SNMPv2]] = {}
+        self._lock = threading.Lock()
+
+    def get_cm_ip_address(self, board: CPE, cmts: CMTS) -> str:
+        """Return the CM management IP address, read from the CMTS once.
+
+        :param board: CPE device instance
+        :type board: CPE
+        :param cmts: CMTS device instance
+        :type cmts: CMTS
+        :return: CM management IP address
+        :rtype: str
+        """
+        cm_mac = board.hw.mac_address
+        with self._lock:
+            if (ip_address := self._ip_addresses.get(cm_mac)) is not None:
+                return ip_address
+        ip_address = cmts.get_cable_modem_ip_address(cm_mac)
+        with self._lock:
+            return self._ip_addresses.setdefault(cm_mac, ip_address)
+
+    def get_snmp(self, board: CPE, wan: WAN, cmts: CMTS) -> SNMPv2:
+        """Return the SNMPv2 client of a board, from a WAN device.
+
+        :param board: CPE device instance
+        :type board: CPE
+        :param wan: WAN device instance running the SNMP commands
+        :type wan: WAN
+        :param cmts: CMTS device instance
+        :type cmts: CMTS
+        :return: SNMPv2 client of the board
+        :rtype: SNMPv2
+        """
+        cm_mac = board.hw.mac_address
+        wan_name = wan.device_name  # type: ignore [attr-defined]
+        with self._lock:
+            if client := self._clients.get(cm_mac, {}).get(wan_name):
+                return client
+        client = SNMPv2(
+            wan,
+            self.get_cm_ip_address(board, cmts),
+            board.sw.get_mibs_compiler(),  # type: ignore [attr-defined]
+        )
+        with self._lock:
+            return self._clients.setdefault(cm_mac, {}).setdefault(wan_name, client)
+
+    @contextmanager
+    def session(self, board: CPE, wan: WAN, cmts: CMTS) -> Iterator[SNMPv2]:
+        """Provide the SNMPv2 client of a board, invalidated if the call fails.
+
+        A failed SNMP exchange may come from a stale CM IP address, so the
+        board entry is dropped and the next call reads it again.
+
+        :param board: CPE device instance
+        :type board: CPE
+        :param wan: WAN device instance running the SNMP commands
+        :type wan: WAN
+        :param cmts: CMTS device instance
+        :type cmts: CMTS
+        :yield: SNMPv2 client of the board
+        """
+        try:
+            yield self.get_snmp(board, wan, cmts)
+        except Exception:
+            self.invalidate(board.hw.mac_address)
+            raise
+
+    def invalidate(self, cm_mac: str) -> None:
+        """Forget the CM IP address and SNMP clients of a board.
+
+        :param cm_mac: CM MAC address of the board
+        :type cm_mac: str
+        """
+        with self._lock:
+            self._ip_addresses.pop(cm_mac, None)
+            self._clients.pop(cm_mac, None)
+        _LOGGER.debug("SNMP context of %s invalidated", cm_mac)
+
+    def clear(self) -> None:
+        """Forget the SNMP contexts of all the boards."""
+        with self._lock:
+            self._ip_addresses.clear()
+            self._clients.clear()
+
+
+# SNMP contexts of the boards of the test session
+SNMP_CONTEXTS = SnmpContextRegistry()
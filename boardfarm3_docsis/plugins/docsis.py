@@ -1,12 +1,14 @@
 """Boardfarm plugin for DOCSIS devices."""
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, Namespace
 
 from boardfarm3 import hookimpl
 from boardfarm3.devices.base_devices import BoardfarmDevice
 
 from boardfarm3_docsis.devices.isc_provisioner import ISCProvisioner
 from boardfarm3_docsis.devices.minicmts import MiniCMTS
+from boardfarm3_docsis.lib.boot_file_store import BOOT_FILE_STORE
+from boardfarm3_docsis.lib.boot_timeline import BOOT_TIMELINE
 
 
 @hookimpl
@@ -22,6 +24,11 @@ def boardfarm_add_cmdline_args(argparser: ArgumentParser) -> None:
         default=None,
         help="LDAP credential <username;password>",
     )
+    docsis_group.add_argument(
+        "--save-boot-timeline",
+        default=None,
+        help="JSON file to save the cable modem boot timelines to",
+    )
 
 
 @hookimpl
@@ -34,3 +41,25 @@ def boardfarm_add_devices() -> dict[str, type[BoardfarmDevice]]:
         "mini_cmts": MiniCMTS,
         "debian-isc-provisioner": ISCProvisioner,
     }
+
+
+@hookimpl
+def boardfarm_post_setup_env() -> None:
+    """Forget the boot files stored while the boards were deployed."""
+    BOOT_FILE_STORE.clear()
+
+
+@hookimpl
+def contingency_check() -> None:
+    """Forget the boot files stored by the previous test."""
+    BOOT_FILE_STORE.clear()
+
+
+@hookimpl
+def boardfarm_release_devices(cmdline_args: Namespace) -> None:
+    """Report the cable modem boot timelines at the end of the session.
+
+    :param cmdline_args: command line arguments
+    """
+    BOOT_TIMELINE.dump(getattr(cmdline_args, "save_boot_timeline", None))
+    BOOT_FILE_STORE.clear()
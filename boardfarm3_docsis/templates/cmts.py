@@ -34,6 +34,22 @@ class CMTS(LTS):
         """
         raise NotImplementedError
 
+    def get_cable_modem_states(self, mac_addresses: list[str]) -> dict[str, str | None]:
+        """Get the MAC state of several cable modems from one CMTS query.
+
+        Optional, CMTS devices reading a cable modem table with the MAC states,
+        e.g. online(pt) or init(r1), implement it. Otherwise the cable modems
+        are checked one by one with is_cable_modem_online(), and without any
+        registration watchdog.
+
+        :param mac_addresses: cable modem mac addresses
+        :type mac_addresses: list[str]
+        :returns: MAC state of each cable modem, None if not found on the CMTS
+        :rtype: dict[str, str | None]
+        :raises NotImplementedError: when the CMTS does not report MAC states
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def reset_cable_modem_status(self, mac_address: str) -> None:
         """Rest cable modem status on cmts.
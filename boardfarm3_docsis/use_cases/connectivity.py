@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import logging
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from boardfarm3.exceptions import UseCaseFailure
+from boardfarm3.exceptions import DeviceBootFailure, UseCaseFailure
 from boardfarm3.lib.device_manager import get_device_manager
 from boardfarm3.lib.utils import retry_on_exception
 from boardfarm3.templates.cpe import CPE
@@ -15,6 +17,14 @@ from boardfarm3.use_cases.device_getters import device_getter
 from boardfarm3.use_cases.networking import http_get
 from termcolor import colored
 
+from boardfarm3_docsis.lib.boot_timeline import BOOT_TIMELINE
+from boardfarm3_docsis.lib.cm_state import (
+    RegistrationAction,
+    RegistrationPolicy,
+    RegistrationWatchdog,
+    check_mac_state,
+)
+from boardfarm3_docsis.lib.snmp_context import SNMP_CONTEXTS
 from boardfarm3_docsis.templates.cable_modem import CableModem
 from boardfarm3_docsis.templates.cmts import CMTS
 from boardfarm3_docsis.use_cases.erouter import get_erouter_addresses
@@ -27,6 +37,8 @@ if TYPE_CHECKING:
 
 
 _LOGGER = logging.getLogger(__name__)
+# seconds to let the CMTS reset a cable modem before polling it again
+_CM_RESET_GRACE_PERIOD = 20
 
 
 def wait_for_board_boot_start(board: CPE | None = None) -> None:
@@ -67,17 +79,26 @@ def power_cycle(board: CPE | None = None) -> None:
     if board is None:
         board = get_device_manager().get_device_by_type(CPE)  # type: ignore[type-abstract]
     board.hw.power_cycle()
+    _record_reset(board.hw.mac_address)
     wait_for_board_boot_start(board=board)
 
 
-def is_board_online_after_reset() -> bool:
+def is_board_online_after_reset(policy: RegistrationPolicy | None = None) -> bool:
     """Check board online after reset.
 
+    When a policy is given, the cable modem registration is followed
+    against it: a modem stuck in a MAC state past its budget is reset on
+    the CMTS, and the wait fails early with a diagnosis once the resets
+    are exhausted.
+
     .. hint:: This Use Case implements statements from the test suite such as:
 
         - Verify CPE comes online after the factory reset
         - Verify DUT comes back online
 
+    :param policy: registration policy, defaults to None, i.e. no watchdog,
+        only used with a CMTS reporting MAC states
+    :type policy: RegistrationPolicy | None
     :return: True if board is online else false
     :rtype: bool
     """
@@ -93,42 +114,408 @@ def is_board_online_after_reset() -> bool:
             CMTS,  # type: ignore[type-abstract]
         )
         termination_sys.reset_cable_modem_status(mac_address=board.hw.mac_address)
+        _record_reset(board.hw.mac_address)
 
+    watchdog = None if policy is None else RegistrationWatchdog(policy)
     for _ in range(180):
         if termination_sys:
-            if not termination_sys.is_cable_modem_online(
-                mac_address=board.cm_mac,
-                ignore_partial=True,
-            ):
+            try:
+                is_online = _is_cable_modem_online(
+                    termination_sys, board.hw.mac_address, watchdog
+                )
+            except DeviceBootFailure as exc:
+                msg = f"\n\nFailed to Boot: {exc}"
+                _LOGGER.warning(colored(msg, color="yellow", attrs=["bold"]))
+                return False
+            if not is_online:
                 time.sleep(15)
                 continue
         elif not cpe.sw.is_online():
             time.sleep(15)
             continue
 
-        if cpe.sw.finalize_boot():
+        with BOOT_TIMELINE.stage(cpe.hw.mac_address, "finalize_boot"):
+            is_boot_finalized = cpe.sw.finalize_boot()
+        if is_boot_finalized:
             break
         _LOGGER.info("######Rebooting######")
         if termination_sys:
-            termination_sys.clear_cm_reset(board.cm_mac)
+            termination_sys.clear_cm_reset(board.hw.mac_address)
+            _record_reset(board.hw.mac_address)
+            if watchdog is not None:
+                watchdog.notify_reset()
         time.sleep(20)
 
     else:
         msg = "\n\nFailed to Boot: board not online on CMTS"
         _LOGGER.warning(colored(msg, color="yellow", attrs=["bold"]))
         return False
+    _install_applications(cpe)
+    return True
+
+
+def _record_reset(cm_mac: str) -> None:
+    """Record the reset of a cable modem, which may change its IP address.
+
+    :param cm_mac: CM MAC address
+    :type cm_mac: str
+    """
+    BOOT_TIMELINE.record_reset(cm_mac)
+    SNMP_CONTEXTS.invalidate(cm_mac)
+
+
+def wait_for_cable_modem_online(
+    board: CableModem,
+    cmts: CMTS | None = None,
+    timeout: float = 2700,
+    poll_interval: float = 15,
+) -> bool:
+    """Wait for a cable modem to be online on the CMTS, without resetting it.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Wait for the CM to come online
+
+    :param board: Cable Modem device instance
+    :type board: CableModem
+    :param cmts: CMTS device instance, defaults to None
+    :type cmts: CMTS | None
+    :param timeout: seconds to wait, defaults to 2700
+    :type timeout: float
+    :param poll_interval: seconds between two CMTS queries, defaults to 15
+    :type poll_interval: float
+    :return: True if the cable modem is online, even partially
+    :rtype: bool
+    """
+    if cmts is None:
+        cmts = get_device_manager().get_device_by_type(
+            CMTS,  # type: ignore[type-abstract]
+        )
+    deadline = time.monotonic() + timeout
+    while not _is_cable_modem_online(cmts, board.hw.mac_address):
+        if time.monotonic() + poll_interval > deadline:
+            return False
+        time.sleep(poll_interval)
+    return True
+
+
+def _get_cable_modem_states(
+    cmts: CMTS, cm_macs: list[str]
+) -> dict[str, str | None] | None:
+    """Read the MAC states of cable modems and record them to the boot timeline.
+
+    :param cmts: CMTS device instance
+    :type cmts: CMTS
+    :param cm_macs: CM MAC addresses
+    :type cm_macs: list[str]
+    :return: MAC state of each cable modem, None if the CMTS does not report
+        MAC states
+    :rtype: dict[str, str | None] | None
+    """
+    try:
+        mac_states = cmts.get_cable_modem_states(cm_macs)
+    except NotImplementedError:
+        return None
+    for cm_mac, mac_state in mac_states.items():
+        BOOT_TIMELINE.record_mac_state(cm_mac, mac_state)
+    return mac_states
+
+
+def _is_online(
+    cmts: CMTS, cm_mac: str, mac_states: dict[str, str | None] | None
+) -> bool:
+    """Check whether a cable modem is online, even partially.
+
+    :param cmts: CMTS device instance
+    :type cmts: CMTS
+    :param cm_mac: CM MAC address
+    :type cm_mac: str
+    :param mac_states: MAC states read from the CMTS, None to query the CMTS
+        for this cable modem
+    :type mac_states: dict[str, str | None] | None
+    :return: True if the cable modem is online, even partially
+    :rtype: bool
+    """
+    if mac_states is None:
+        return cmts.is_cable_modem_online(mac_address=cm_mac, ignore_partial=True)
+    return check_mac_state(mac_states.get(cm_mac), ignore_partial=True)[0]
+
+
+def _is_cable_modem_online(
+    cmts: CMTS, cm_mac: str, watchdog: RegistrationWatchdog | None = None
+) -> bool:
+    """Check whether a cable modem is online, recording its MAC state.
+
+    The CMTS is queried once, the MAC state decides whether the cable modem
+    is online and feeds the registration watchdog. The watchdog is not used
+    with a CMTS which does not report MAC states.
+
+    :param cmts: CMTS device instance
+    :type cmts: CMTS
+    :param cm_mac: CM MAC address
+    :type cm_mac: str
+    :param watchdog: registration watchdog of the cable modem, defaults to None
+    :type watchdog: RegistrationWatchdog | None
+    :return: True if the cable modem is online, even partially
+    :rtype: bool
+    """
+    mac_states = _get_cable_modem_states(cmts, [cm_mac])
+    is_online = _is_online(cmts, cm_mac, mac_states)
+    if watchdog is not None and mac_states is not None and not is_online:
+        _watch_registration(cmts, cm_mac, mac_states.get(cm_mac), watchdog)
+    return is_online
+
+
+def _watch_registration(
+    cmts: CMTS, cm_mac: str, mac_state: str | None, watchdog: RegistrationWatchdog
+) -> bool:
+    """Reset a stuck cable modem, or give up on it, as the watchdog decides.
+
+    :param cmts: CMTS device instance
+    :type cmts: CMTS
+    :param cm_mac: CM MAC address
+    :type cm_mac: str
+    :param mac_state: MAC state observed on the CMTS
+    :type mac_state: str | None
+    :param watchdog: registration watchdog of the cable modem
+    :type watchdog: RegistrationWatchdog
+    :raises DeviceBootFailure: when the registration is given up
+    :return: True if the cable modem was reset
+    :rtype: bool
+    """
+    verdict = watchdog.observe(mac_state)
+    if verdict.action is RegistrationAction.FAIL:
+        msg = f"{cm_mac} registration failed, {verdict.diagnosis}"
+        raise DeviceBootFailure(msg)
+    if verdict.action is RegistrationAction.RESET:
+        _LOGGER.warning("Resetting %s, %s", cm_mac, verdict.diagnosis)
+        cmts.clear_cm_reset(cm_mac)
+        _record_reset(cm_mac)
+        return True
+    return False
+
+
+def _install_applications(cpe: CPE) -> None:
+    """Install the applications listed in the CPE config, if any.
+
+    :param cpe: CPE device instance
+    :type cpe: CPE
+    """
     applist = cpe.config.get("install_applications", [])
     if applist:
         wan_server = get_device_manager().get_device_by_type(
             WAN,  # type: ignore[type-abstract]
         )
-        if hasattr(cpe.sw, "login_to_linux_consoles"):
-            retry_on_exception(cpe.sw.login_to_linux_consoles, (), 3, 20)
-        cpe.sw.install_app_via_wan(wan_server, applist)  # type: ignore [attr-defined]
+        with BOOT_TIMELINE.stage(cpe.hw.mac_address, "install_applications"):
+            if hasattr(cpe.sw, "login_to_linux_consoles"):
+                retry_on_exception(cpe.sw.login_to_linux_consoles, (), 3, 20)
+            cpe.sw.install_app_via_wan(wan_server, applist)  # type: ignore [attr-defined]
+
+
+@dataclass
+class BoardBootOutcome:
+    """Outcome of a board reset, see are_boards_online_after_reset."""
+
+    cm_mac: str
+    online: bool = False
+    duration: float = 0.0
+    reboots: int = 0
+    error: str | None = None
+
+
+def _finalize_boot(board: CableModem) -> bool:
+    """Finalize the boot of an online board and install its applications.
 
+    :param board: Cable Modem device instance
+    :type board: CableModem
+    :return: False if the board has to be rebooted
+    :rtype: bool
+    """
+    with BOOT_TIMELINE.stage(board.hw.mac_address, "finalize_boot"):
+        is_boot_finalized = board.sw.finalize_boot()
+    if not is_boot_finalized:
+        return False
+    _install_applications(board)
     return True
 
 
+# pylint: disable-next=too-many-instance-attributes
+class _FleetBootWaiter:
+    """Wait for several boards to come online, one CMTS query per tick."""
+
+    def __init__(
+        self,
+        boards: list[CableModem],
+        cmts: CMTS,
+        executor: ThreadPoolExecutor,
+        policy: RegistrationPolicy | None,
+    ) -> None:
+        self._boards = {board.hw.mac_address: board for board in boards}
+        self._watchdogs = (
+            {}
+            if policy is None
+            else {mac: RegistrationWatchdog(policy) for mac in self._boards}
+        )
+        self._cmts = cmts
+        self._executor = executor
+        self.outcomes = {mac: BoardBootOutcome(mac) for mac in self._boards}
+        self._reset_times: dict[str, float] = {}
+        self._not_before: dict[str, float] = {}
+        self._finalizing: dict[Future[bool], str] = {}
+
+    def reset(self) -> None:
+        """Reset all the cable modems on the CMTS."""
+        for mac in self._boards:
+            self._cmts.reset_cable_modem_status(mac_address=mac)
+            self._reset_times[mac] = time.monotonic()
+            _record_reset(mac)
+
+    @property
+    def pending(self) -> list[str]:
+        """MAC addresses of the boards which are not online yet.
+
+        :return: MAC addresses of the pending boards
+        :rtype: list[str]
+        """
+        return [
+            mac
+            for mac, outcome in self.outcomes.items()
+            if not outcome.online and outcome.error is None
+        ]
+
+    def poll(self) -> None:
+        """Query the CMTS and finalize the boot of the online boards.
+
+        The CMTS is queried once for all the boards, or once per board if it
+        does not report MAC states.
+        """
+        finalizing = set(self._finalizing.values())
+        now = time.monotonic()
+        waiting = [
+            mac
+            for mac in self.pending
+            if mac not in finalizing and self._not_before.get(mac, 0) <= now
+        ]
+        if not waiting:
+            return
+        mac_states = _get_cable_modem_states(self._cmts, waiting)
+        for mac in waiting:
+            if _is_online(self._cmts, mac, mac_states):
+                _LOGGER.info("Cable modem %s is online", mac)
+                future = self._executor.submit(_finalize_boot, self._boards[mac])
+                self._finalizing[future] = mac
+            # the watchdog needs the MAC states
+            elif mac_states is not None and mac in self._watchdogs:
+                self._watch_registration(mac, mac_states.get(mac))
+
+    def _watch_registration(self, mac: str, mac_state: str | None) -> None:
+        """Check the registration of a board which is not online yet.
+
+        :param mac: CM MAC address
+        :type mac: str
+        :param mac_state: MAC state observed on the CMTS
+        :type mac_state: str | None
+        """
+        try:
+            if _watch_registration(self._cmts, mac, mac_state, self._watchdogs[mac]):
+                self._not_before[mac] = time.monotonic() + _CM_RESET_GRACE_PERIOD
+        except DeviceBootFailure as exc:
+            _LOGGER.warning("Failed to Boot: %s", exc)
+            self.outcomes[mac].error = str(exc)
+
+    def collect(self, timeout: float) -> None:
+        """Wait for boot finalizations and record their outcome.
+
+        :param timeout: seconds to wait for a finalization to complete
+        :type timeout: float
+        """
+        if not self._finalizing:
+            time.sleep(timeout)
+            return
+        done, _ = wait(self._finalizing, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            mac = self._finalizing.pop(future)
+            outcome = self.outcomes[mac]
+            try:
+                outcome.online = future.result()
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exc:  # noqa: BLE001
+                _LOGGER.warning("Failed to finalize the boot of %s: %s", mac, exc)
+                outcome.error = str(exc)
+                continue
+            if outcome.online:
+                outcome.duration = time.monotonic() - self._reset_times[mac]
+                continue
+            _LOGGER.info("######Rebooting %s######", mac)
+            outcome.reboots += 1
+            self._cmts.clear_cm_reset(mac)
+            _record_reset(mac)
+            if mac in self._watchdogs:
+                self._watchdogs[mac].notify_reset()
+            self._not_before[mac] = time.monotonic() + _CM_RESET_GRACE_PERIOD
+
+
+def are_boards_online_after_reset(  # noqa: PLR0913
+    boards: list[CableModem] | None = None,
+    cmts: CMTS | None = None,
+    poll_interval: float = 15,
+    timeout: float = 2700,
+    max_workers: int | None = None,
+    policy: RegistrationPolicy | None = None,
+) -> dict[str, BoardBootOutcome]:
+    """Reset several boards and wait for all of them to come online.
+
+    The CMTS cable modem table is queried once per tick for all the boards,
+    if the CMTS reports MAC states, and each board boot is finalized in a
+    worker thread as soon as it is online, so that resetting a rack costs
+    about one boot time.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Verify all the CPEs come back online
+
+    :param boards: Cable Modem device instances, defaults to all of them
+    :type boards: list[CableModem] | None
+    :param cmts: CMTS device instance, defaults to None
+    :type cmts: CMTS | None
+    :param poll_interval: seconds between two CMTS queries, defaults to 15
+    :type poll_interval: float
+    :param timeout: seconds to wait for the boards, defaults to 2700
+    :type timeout: float
+    :param max_workers: maximum number of concurrent boot finalizations,
+        defaults to one per board
+    :type max_workers: int | None
+    :param policy: registration policy of each board, defaults to None,
+        i.e. no watchdog, only used with a CMTS reporting MAC states
+    :type policy: RegistrationPolicy | None
+    :return: outcome of each board, keyed by CM MAC address
+    :rtype: dict[str, BoardBootOutcome]
+    """
+    if boards is None:
+        boards = list(
+            get_device_manager()
+            .get_devices_by_type(
+                CableModem,  # type: ignore[type-abstract]
+            )
+            .values()
+        )
+    if cmts is None:
+        cmts = get_device_manager().get_device_by_type(
+            CMTS,  # type: ignore[type-abstract]
+        )
+    with ThreadPoolExecutor(max_workers=max_workers or len(boards) or 1) as executor:
+        waiter = _FleetBootWaiter(boards, cmts, executor, policy)
+        waiter.reset()
+        deadline = time.monotonic() + timeout
+        while waiter.pending and time.monotonic() < deadline:
+            waiter.poll()
+            waiter.collect(poll_interval)
+    for mac in waiter.pending:
+        msg = f"\n\nFailed to Boot: board {mac} not online on CMTS"
+        _LOGGER.warning(colored(msg, color="yellow", attrs=["bold"]))
+    return waiter.outcomes
+
+
 def has_ipv6_tunnel_interface_address(board: CPE | None = None) -> bool:
     """Check for the tunnel interface on DUT console.
 
@@ -234,6 +621,7 @@ def reset_board_via_cmts(board: CPE, cmts: CMTS) -> None:
     :type cmts: CMTS
     """
     cmts.clear_cm_reset(board.hw.mac_address)
+    _record_reset(board.hw.mac_address)
 
 
 def get_subnet_mask(device: LAN | WAN | WLAN, interface: str) -> str:
@@ -1,9 +1,16 @@
 """Use Cases to interact with DOCSIS devices such as CMTS and CM."""
 
+# pylint: disable=too-many-lines
+
 from __future__ import annotations
 
-import re
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from ipaddress import IPv4Network, IPv6Network, ip_network
+from itertools import product
 from re import findall as regex_findall
 from typing import TYPE_CHECKING
 
@@ -11,15 +18,88 @@ from boardfarm3.exceptions import DeviceBootFailure
 from boardfarm3.lib.regexlib import ValidIpv4AddressRegex_Nogroup
 from debtcollector import removals
 
-from boardfarm3_docsis.use_cases.connectivity import is_board_online_after_reset
+from boardfarm3_docsis.configs import DOCSIS_DEVICE_MIBS_PATH
+from boardfarm3_docsis.lib.boot_file import BootFile, ConfigComment, parse_config
+from boardfarm3_docsis.lib.boot_file_store import BOOT_FILE_STORE
+from boardfarm3_docsis.lib.boot_timeline import BOOT_TIMELINE
+from boardfarm3_docsis.lib.console_matcher import watch_logs
+from boardfarm3_docsis.lib.docsis_decoder import DecodedCmConfig
+from boardfarm3_docsis.lib.docsis_encoder import DocsisConfigEncoder, EncodeJob
+from boardfarm3_docsis.lib.snmp_context import SNMP_CONTEXTS
+from boardfarm3_docsis.use_cases.connectivity import wait_for_cable_modem_online
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
     from boardfarm3.templates.wan import WAN
 
+    from boardfarm3_docsis.lib.boot_file import ConfigNode
     from boardfarm3_docsis.templates.cable_modem import CableModem
     from boardfarm3_docsis.templates.cmts import CMTS
     from boardfarm3_docsis.templates.provisioner import Provisioner
 
+_LOGGER = logging.getLogger(__name__)
+
+_EROUTER_MODES = {"disabled": "0", "none": "0", "ipv4": "1", "ipv6": "2", "dual": "3"}
+_EROUTER_VARIANT_CACHE_SIZE = 64
+# provisioning_messages checked in the boot logs, in boot order
+_MTA_PROVISIONING_MARKERS = (
+    "verify_emta_cfg_file_download",
+    "verify_emta_config_apply",
+    "verify_emta_provisioning",
+)
+# seconds of boot logs read at once, the wait ends between two reads
+_BOOT_LOGS_READ_INTERVAL = 10
+_IPV6_LLC_FILTER = """
+SnmpMibObject docsDevFilterLLCIfIndex.3 Integer 0; /* all interfaces */
+SnmpMibObject docsDevFilterLLCProtocolType.3 Integer 1; /* ethertype */
+SnmpMibObject docsDevFilterLLCProtocol.3 Integer 34525; /* ipv6 */
+SnmpMibObject docsDevFilterLLCStatus.3 Integer 4; /* createAndGo */
+"""
+_TR69_VENDOR_BLOCK = """
+/* TR69 Management Server */
+VendorSpecific
+{
+    VendorIdentifier 0x###VENDOR_ID###;
+    eRouter
+    {
+        TR69ManagementServer
+        {
+            EnableCWMP 1;
+            URL "http://acs_server.boardfarm.com:9675";
+            ACSOverride 1;
+        }
+    }
+}
+"""
+_DSLITE_VENDOR_BLOCK = """
+VendorSpecific
+{
+    VendorIdentifier 0x###VENDOR_ID###;
+    eRouter
+    {
+        GenericTLV TlvCode 12 TlvString "Device.DSLite.Enable|boolean|true";
+        GenericTLV TlvCode 12 TlvString
+            "Device.DSLite.InterfaceSetting.1.Enable|boolean|true";
+        GenericTLV TlvCode 12 TlvString
+            "Device.DSLite.InterfaceSetting.1.X_LGI-COM_MssClampingEnable|boolean|true";
+        GenericTLV TlvCode 12 TlvString
+            "Device.DSLite.InterfaceSetting.1.X_LGI-COM_Tcpmss|unsigned|1420";
+    }
+}
+"""
+_INITIALIZATION_MODE_VENDOR_BLOCK = """
+VendorSpecific
+{
+    VendorIdentifier 0x###VENDOR_ID###;
+    eRouter
+    {
+        InitializationMode ###MODE###;
+    }
+}
+"""
+
 
 def is_route_present_on_cmts(
     route: IPv4Network | IPv6Network,
@@ -198,11 +278,29 @@ def is_bpi_privacy_disabled(board: CableModem) -> bool:
         err_msg = "The board object is None; it must be explicitely passed."
         raise ValueError(err_msg)
 
-    boot_file = board.sw.get_boot_file()
-    if boot_file == "":
+    boot_files = BOOT_FILE_STORE.get(board)
+    if boot_files.cm_boot_file == "":
         err_msg = "Bootfile content cannot be empty."
         raise ValueError(err_msg)
-    return bool(regex_findall(r"GlobalPrivacyEnable\s*0;", boot_file))
+    return boot_files.is_bpi_privacy_disabled
+
+
+def is_bpi_privacy_disabled_in_encoded_config(cm_config: str | Path | bytes) -> bool:
+    """Fetch the GlobalPrivacyEnable TLV value from an encoded CM config file.
+
+    Unlike ``is_bpi_privacy_disabled()``, this checks the encoded file, e.g. a
+    copy of the one served by TFTP, i.e. what the modem actually received.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Verify that BPI+ is disabled in the CM config file
+
+    :param cm_config: encoded CM config file path or content
+    :type cm_config: str | Path | bytes
+    :return: True if BPI is disabled.
+    :rtype: bool
+    """
+    return _decode_cm_config(cm_config).is_bpi_privacy_disabled()
 
 
 @removals.remove()
@@ -236,6 +334,8 @@ def provision_cable_modem(
         boot_file=cm_boot_file,
         boot_file_mta=emta_boot_file,
     )
+    SNMP_CONTEXTS.invalidate(board.hw.mac_address)
+    BOOT_FILE_STORE.invalidate(board)
 
 
 @removals.remove()
@@ -284,31 +384,22 @@ def provision_board_w_boot_files(
     board.sw.wait_for_boot()
 
 
-def _get_board_boot_logs(timeout: int, board: CableModem) -> str:
-    """Get the console log for the boot process.
-
-    :param timeout: time value to collect the logs for
-    :type timeout: int
-    :param board: Cable Modem device instance
-    :type board: CableModem
-    :return: console logs for given timeout
-    :rtype: str
-    """
-    return board.sw.get_board_logs(timeout)
-
-
-def _verify_cm_config_downloaded(boot_logs: str, board: CableModem) -> bool:
+def _verify_cm_config_downloaded(
+    boot_logs: str, board: CableModem, timeout: int
+) -> bool:
     """Verify if the CM config download is successful.
 
     :param boot_logs: The console logs collected post reboot
     :type boot_logs: str
     :param board: Cable Modem device instance
     :type board: CableModem
+    :param timeout: seconds to wait for the CM to be online
+    :type timeout: int
     :return: True if CM config download is successful else False
     :rtype: bool
     :raises DeviceBootFailure: if board is not online
     """
-    if is_board_online_after_reset():
+    if wait_for_cable_modem_online(board=board, timeout=timeout):
         if logs := board.sw.get_gateway_provision_log():
             return board.sw.verify_cm_cfg_file_read_log(logs)
         return board.sw.verify_cm_cfg_file_read_log(boot_logs)
@@ -316,68 +407,72 @@ def _verify_cm_config_downloaded(boot_logs: str, board: CableModem) -> bool:
     raise DeviceBootFailure(err_msg)
 
 
-def _verify_emta_config_downloaded(boot_logs: str, board: CableModem) -> bool:
-    """Verify if the MTA config file download is successful.
-
-    :param boot_logs: The console logs collected post reboot
-    :type boot_logs: str
-    :param board: Cable Modem device instance
-    :type board: CableModem
-    :return: True if MTA config download is successful else False
-    :rtype: bool
-    """
-    return board.sw.provisioning_messages["verify_emta_cfg_file_download"] in boot_logs
-
-
-def _verify_emta_config_applied(boot_logs: str, board: CableModem) -> bool:
-    """Verify if the MTA config is applied successfully.
-
-    :param boot_logs: The console logs collected post reboot
-    :type boot_logs: str
-    :param board: Cable Modem device instance
-    :type board: CableModem
-    :return: True if MTA config is applied successfully else False
-    :rtype: bool
-    """
-    return board.sw.provisioning_messages["verify_emta_config_apply"] in boot_logs
-
-
-def _verify_emta_provisioning(boot_logs: str, board: CableModem) -> bool:
-    """Verify if the MTA provisioning is successful.
-
-    :param boot_logs: The console logs collected post reboot
-    :type boot_logs: str
-    :param board: Cable Modem device instance
-    :type board: CableModem
-    :return: True if MTA provisioning is successful else False
-    :rtype: bool
-    """
-    return board.sw.provisioning_messages["verify_emta_provisioning"] in boot_logs
-
+def are_boot_logs_successful(
+    timeout: int,
+    board: CableModem,
+    failure_markers: dict[str, str] | None = None,
+) -> bool:
+    """Watch the boot logs and validate the boot stages and provisioning.
 
-def are_boot_logs_successful(timeout: int, board: CableModem) -> bool:
-    """Collect the boot logs and validate the boot stages and provisioning.
+    The board logs are read and matched _BOOT_LOGS_READ_INTERVAL seconds at
+    a time, and the wait ends as soon as all the MTA provisioning messages,
+    or a failure marker, are seen. The messages found are recorded to the
+    boot timeline with the slice they were read in, as the board logs give
+    no finer timestamps.
 
     :param timeout: time value to collect the logs for
     :type timeout: int
     :param board: Cable Modem device instance
     :type board: CableModem
+    :param failure_markers: console messages of a failed boot, keyed by name,
+        defaults to None
+    :type failure_markers: dict[str, str] | None
     :return: True if boot stages are verified and provisioning is successful else False
     :rtype: bool
     """
-    log = _get_board_boot_logs(timeout, board=board)
-    return all(
-        [
-            _verify_cm_config_downloaded(log, board=board),
-            _verify_emta_config_downloaded(log, board=board),
-            _verify_emta_config_applied(log, board=board),
-            _verify_emta_provisioning(log, board=board),
-        ],
+    markers = {
+        name: board.sw.provisioning_messages[name] for name in _MTA_PROVISIONING_MARKERS
+    }
+    watch_start = time.time()
+    result = watch_logs(
+        lambda remaining: board.sw.get_board_logs(
+            min(_BOOT_LOGS_READ_INTERVAL, math.ceil(remaining))
+        ),
+        markers,
+        timeout,
+        failure_markers,
     )
+    for match in [*result.matches.values(), result.failure]:
+        if match is not None:
+            BOOT_TIMELINE.record_boot_log(
+                board.hw.mac_address,
+                match.name,
+                watch_start + match.elapsed - match.window,
+                match.window,
+            )
+    for name, match in result.matches.items():
+        _LOGGER.info(
+            "Boot log %s found after %.1f-%.1fs",
+            name,
+            match.elapsed - match.window,
+            match.elapsed,
+        )
+    if result.failure is not None:
+        _LOGGER.warning(
+            "Boot log failure %s found after %.1f-%.1fs",
+            result.failure.name,
+            result.failure.elapsed - result.failure.window,
+            result.failure.elapsed,
+        )
+        return False
+    if result.missing:
+        _LOGGER.warning("Boot logs not found: %s", ", ".join(result.missing))
+        return False
+    return _verify_cm_config_downloaded(result.log, board=board, timeout=timeout)
 
 
 def _get_boot_file(board: CableModem) -> str:
-    return board.sw.get_boot_file()
+    return BOOT_FILE_STORE.get(board).cm_boot_file
 
 
 def add_tlvs_to_bootfile(
@@ -402,16 +497,18 @@ def add_tlvs_to_bootfile(
     :return: a copy of the env_helper bootfile with the TLVs added
     :rtype: str
     """
-    bootfile = config_file if config_file else _get_boot_file(board=board)
-    idx = bootfile.find("/* CmMic")
-    if idx < 0:
+    boot_file = BootFile(config_file if config_file else _get_boot_file(board=board))
+    if not boot_file.has_comment("/* CmMic"):
         msg = "Hook '/* CmMic' not found in boot file"
         raise ValueError(msg)
-
-    comment = "/* SW mibs */"
-    return (
-        bootfile[: idx - 1] + "\n\t" + comment + "\n\t" + multiline_tlv + bootfile[idx:]
+    boot_file.insert(
+        [
+            ConfigComment("/* SW mibs */"),
+            *parse_config(multiline_tlv, keep_comments=True),
+        ],
+        before_comment="/* CmMic",
     )
+    return boot_file.to_text()
 
 
 def get_vendor_id_from_cm_bootfile(board: CableModem) -> str:
@@ -423,15 +520,41 @@ def get_vendor_id_from_cm_bootfile(board: CableModem) -> str:
 
     :param board: Cable Modem device instance
     :type board: CableModem
+    :raises ValueError: when the boot file has no VendorIdentifier
     :return: hexadecimal value of vendor identifier
     :rtype: str
     """
-    return re.search("VendorIdentifier 0x([A-Za-z0-9]*);", _get_boot_file(board=board))[
-        1
-    ]
+    if (vendor_id := BOOT_FILE_STORE.get(board).vendor_id) is None:
+        msg = "No VendorIdentifier found in the CM boot file"
+        raise ValueError(msg)
+    return vendor_id
+
+
+def _decode_cm_config(cm_config: str | Path | bytes) -> DecodedCmConfig:
+    if isinstance(cm_config, bytes):
+        return DecodedCmConfig(cm_config)
+    return DecodedCmConfig.from_file(cm_config)
+
+
+def get_vendor_id_from_encoded_cm_config(cm_config: str | Path | bytes) -> str:
+    """Fetch the vendor identifier hexadecimal value from an encoded CM config.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Fetch the vendor identifier hexadecimal value from CM config file.
+
+    :param cm_config: encoded CM config file path or content
+    :type cm_config: str | Path | bytes
+    :raises ValueError: when the config has no VendorSpecific block
+    :return: hexadecimal value of vendor identifier, e.g. 0050f1
+    :rtype: str
+    """
+    if vendor_ids := _decode_cm_config(cm_config).get_vendor_ids():
+        return vendor_ids[0]
+    msg = "No VendorIdentifier found in the CM config file"
+    raise ValueError(msg)
 
 
-# pylint: disable-next=too-many-locals
 def update_erouter_mode(
     mode: str, board: CableModem, bootfile: str | None = None
 ) -> str:
@@ -441,6 +564,9 @@ def update_erouter_mode(
     bootfile param should be the current eRouter config and not the one in
     env_helper.
 
+    The variants are memoized per source bootfile, mode and vendor id, see
+    ``precompute_erouter_modes()``.
+
     .. hint:: This Use Case implements statements from the test suite such as:
 
         - Switch to modem mode using config file
@@ -458,74 +584,315 @@ def update_erouter_mode(
     :return: a copy of the env_helper bootfile with the new mode
     :rtype: str
     """
-    modes = {"disabled": "0", "none": "0", "ipv4": "1", "ipv6": "2", "dual": "3"}
-
-    if mode not in modes:
-        msg = f"Requested initialization mode: {mode} not in {modes}"
+    if mode not in _EROUTER_MODES:
+        msg = f"Requested initialization mode: {mode} not in {_EROUTER_MODES}"
         raise ValueError(msg)
-    if not bootfile:
-        bootfile = _get_boot_file(board=board)
-    vendor_id = get_vendor_id_from_cm_bootfile(board=board)
+    return _get_erouter_variant(
+        bootfile or _get_boot_file(board=board),
+        mode,
+        get_vendor_id_from_cm_bootfile(board=board),
+    )
 
-    if "InitializationMode 1" in bootfile:
-        # add the LLCfilters
-        pattern = r"SnmpMibObject\sdocsDevFilterLLCStatus+\.2\s\w+\s\d;\s.*"
-        _new_llc_index = (
-            "SnmpMibObject docsDevFilterLLCIfIndex.3 Integer 0 ; /* all interfaces */"
-            "SnmpMibObject docsDevFilterLLCProtocolType.3 Integer 1; /* ethertype */"
-            "SnmpMibObject docsDevFilterLLCProtocol.3 Integer 34525 ; /* ipv6 */"
-            "SnmpMibObject docsDevFilterLLCStatus.3 Integer 4; /* createAndGo */"
-        )
-        _from_llc = re.findall(pattern, bootfile)
-        _to_llc = str(_from_llc[0]) + _new_llc_index
-        bootfile = re.sub(re.escape(_from_llc[0]), _to_llc, bootfile)
-    if mode in {"ipv4", "ipv6", "dual"} and "TR69 Management Server" not in bootfile:
-        tr69_param = (
-            f"/* TR69 Management Server */\n\tVendorSpecific\n\t{{\n\t\t"
-            f"VendorIdentifier 0x{vendor_id};\n\t\teRouter\n\t\t{{\n\t\t\t"
-            f"TR69ManagementServer\n\t\t\t{{\n\t\t\t\tEnableCWMP 1;\n\t\t\t\t"
-            f'URL "http://acs_server.boardfarm.com:9675"'
-            f";\n\t\t\t\tACSOverride 1;"
-            f"\n\t\t\t}}\n\t\t}}\n\t}}\n\n\t/* MFG CVC Data */"
+
+def precompute_erouter_modes(
+    board: CableModem, bootfile: str | None = None
+) -> dict[str, str]:
+    """Generate the bootfile of every eRouter mode upfront.
+
+    The variants are memoized, so the later ``update_erouter_mode()`` calls
+    for this bootfile only cost a lookup.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Switch the provisioning mode via config file
+
+    .. code-block:: python
+
+        # example usage
+        bootfiles = precompute_erouter_modes(board)
+        provision_docsis_board(board, provisioner, wan, bootfiles["ipv6"], mta)
+
+    :param board: Cable Modem device instance
+    :type board: CableModem
+    :param bootfile: config file to derive the modes from, defaults to the
+        board bootfile
+    :type bootfile: str | None
+    :return: bootfile of every mode, by mode
+    :rtype: dict[str, str]
+    """
+    return {mode: update_erouter_mode(mode, board, bootfile) for mode in _EROUTER_MODES}
+
+
+# variants are keyed by source bootfile, mode and vendor id
+@lru_cache(maxsize=_EROUTER_VARIANT_CACHE_SIZE)
+def _get_erouter_variant(bootfile: str, mode: str, vendor_id: str) -> str:
+    """Switch a bootfile to the given eRouter mode.
+
+    :param bootfile: config file to be used before updating mode
+    :type bootfile: str
+    :param mode: one of "none", "disabled", "ipv4", "ipv6", "dual"
+    :type mode: str
+    :param vendor_id: vendor identifier of the eRouter TLVs
+    :type vendor_id: str
+    :return: the bootfile with the new mode
+    :rtype: str
+    """
+    boot_file = BootFile(bootfile)
+
+    if any(
+        statement.values == ["1"]
+        for statement in boot_file.get_statements("InitializationMode")
+    ):
+        _add_ipv6_llc_filter(boot_file)
+    if mode in {"ipv4", "ipv6", "dual"} and not boot_file.get_statements(
+        "TR69ManagementServer"
+    ):
+        boot_file.insert(
+            _get_vendor_block(_TR69_VENDOR_BLOCK, vendor_id),
+            before_comment="MFG CVC Data",
         )
-        pattern = r".*MFG CVC Data.*"
-        bootfile = re.sub(pattern, tr69_param, bootfile)
     if mode == "ipv6":
-        ipv6_params_to_add = (
-            f"VendorSpecific\n\t{{\n\t\tVendorIdentifier "
-            f"0x{vendor_id};\n\t\teRouter\n\t\t{{\n\t\t\tGenericTLV TlvCode 12"
-            f' TlvString "Device.DSLite.Enable|boolean|true"'
-            f";\n\t\t\tGenericTLV TlvCode 12 TlvString "
-            f'"Device.DSLite.InterfaceSetting.1.Enable|boolean|true";\n\t\t\t'
-            f"GenericTLV TlvCode 12 TlvString "
-            f'"Device.DSLite.InterfaceSetting.1.X_LGI-COM_MssClampingEnable|'
-            f'boolean|true";\n\t\t\tGenericTLV TlvCode 12 TlvString '
-            f'"Device.DSLite.InterfaceSetting.1.X_LGI-COM_Tcpmss|unsigned|1420"'
-            f";\n\t\t}}\n\t}}\n\n\t/* MFG CVC Data */"
+        boot_file.insert(
+            _get_vendor_block(_DSLITE_VENDOR_BLOCK, vendor_id),
+            before_comment="MFG CVC Data",
         )
-        pattern = r".*MFG CVC Data.*"
-        bootfile = re.sub(pattern, ipv6_params_to_add, bootfile)
-    if mode in {"disabled", "ipv4", "ipv6", "dual"}:
-        # simply swap the value in the bootfile
-        _from = "InitializationMode((\\s|\t){1,})\\d.*;"
-        _to = f"InitializationMode {modes[mode]};"
-        if mode == "disabled":
-            # remove TR69 management server section
-            _tr69_from = r"TR69 Management Server (.+)((?:\n.+)+)\n\n.* Plume"
-            _tr69_to = "Plume"
-            bootfile = re.sub(_tr69_from, _tr69_to, bootfile)
-    elif mode == "none":
-        # remove the InitialisationMode
-        _from = (
-            "VendorSpecific.*\n.*{.*\n.*VendorIdentifier"
-            rf" 0x{vendor_id};.*\n.*eRouter.*\n.*{{.*\n.*InitializationMode("
-            r"(\\s|\t){1,})\\d.*;.*\n.*}}*\n.*}}"
-        )
-        _to = "/* Removed */"
+    if mode == "disabled":
+        # remove TR69 management server section
+        for statement in boot_file.get_statements("TR69ManagementServer"):
+            boot_file.remove(statement)
+        boot_file.remove_comments("TR69 Management Server")
+    _set_initialization_mode(
+        boot_file, vendor_id, None if mode == "none" else _EROUTER_MODES[mode]
+    )
+    return boot_file.to_text()
+
+
+def _get_vendor_block(
+    template: str, vendor_id: str, mode: str = ""
+) -> list[ConfigNode]:
+    return parse_config(
+        template.replace("###VENDOR_ID###", vendor_id).replace("###MODE###", mode),
+        keep_comments=True,
+    )
+
+
+def _set_initialization_mode(
+    boot_file: BootFile, vendor_id: str, mode: str | None
+) -> None:
+    """Swap the eRouter InitializationMode value, or remove it.
+
+    :param boot_file: boot file to edit
+    :type boot_file: BootFile
+    :param vendor_id: vendor identifier of the eRouter TLVs
+    :type vendor_id: str
+    :param mode: InitializationMode value, None to remove it
+    :type mode: str | None
+    """
+    if mode is None:
+        for statement in [
+            statement
+            for vendor_block in boot_file.get_vendor_blocks(vendor_id)
+            for erouter in vendor_block.get_children("eRouter")
+            for statement in erouter.get_children("InitializationMode")
+        ]:
+            boot_file.remove(statement)
+    elif statements := boot_file.get_statements("InitializationMode"):
+        for statement in statements:
+            statement.values = [mode]
     else:
-        msg = f"Unexpected value: {mode=}"
+        boot_file.insert(
+            _get_vendor_block(_INITIALIZATION_MODE_VENDOR_BLOCK, vendor_id, mode)
+        )
+
+
+def _add_ipv6_llc_filter(boot_file: BootFile) -> None:
+    """Add the IPv6 LLC filter after the docsDevFilterLLC .2 entry.
+
+    :param boot_file: boot file to edit
+    :type boot_file: BootFile
+    :raises ValueError: when the boot file has no docsDevFilterLLC .2 entry
+    """
+    snmp_objects = boot_file.get_statements("SnmpMibObject")
+    if any(
+        statement.values[:1] == ["docsDevFilterLLCStatus.3"]
+        for statement in snmp_objects
+    ):
+        return
+    anchor = next(
+        (
+            statement
+            for statement in snmp_objects
+            if statement.values[:1] == ["docsDevFilterLLCStatus.2"]
+        ),
+        None,
+    )
+    if anchor is None:
+        msg = "docsDevFilterLLCStatus.2 not found in boot file"
         raise ValueError(msg)
-    return re.sub(_from, _to, bootfile)
+    boot_file.insert_after(anchor, parse_config(_IPV6_LLC_FILTER, keep_comments=True))
+
+
+@dataclass(frozen=True)
+class BootFileVariant:
+    """Boot file variant of a pre-built boot file matrix."""
+
+    # eRouter mode, see update_erouter_mode(), None keeps the board one
+    erouter_mode: str | None = None
+    # TLVs added with add_tlvs_to_bootfile(), empty for none
+    extra_tlvs: str = ""
+    with_mta: bool = True
+
+
+@dataclass(frozen=True)
+class PrebuiltBootFiles:
+    """Rendered and encoded boot files of a variant."""
+
+    cm_boot_file: str
+    cm_config: Path
+    mta_boot_file: str | None = None
+    mta_config: Path | None = None
+
+
+def get_boot_file_matrix(
+    erouter_modes: Iterable[str | None] = (None,),
+    extra_tlv_sets: Iterable[str] = ("",),
+    mta_options: Iterable[bool] = (True,),
+) -> list[BootFileVariant]:
+    """Declare a boot file matrix: eRouter modes x extra TLV sets x MTA on/off.
+
+    .. code-block:: python
+
+        # example usage
+        matrix = get_boot_file_matrix(
+            erouter_modes=["ipv4", "ipv6", "dual"],
+            extra_tlv_sets=["", sw_upgrade_tlvs],
+            mta_options=[True, False],
+        )
+
+    :param erouter_modes: eRouter modes, None keeps the board one
+    :type erouter_modes: Iterable[str | None]
+    :param extra_tlv_sets: TLVs to add to the CM boot file, empty for none
+    :type extra_tlv_sets: Iterable[str]
+    :param mta_options: whether the variants include the MTA boot file
+    :type mta_options: Iterable[bool]
+    :return: boot file variants
+    :rtype: list[BootFileVariant]
+    """
+    return [
+        BootFileVariant(mode, tlvs, with_mta)
+        for mode, tlvs, with_mta in product(erouter_modes, extra_tlv_sets, mta_options)
+    ]
+
+
+def prebuild_boot_files(
+    board: CableModem,
+    variants: Iterable[BootFileVariant],
+    mibs_path: list[str] | None = None,
+    max_workers: int | None = None,
+) -> dict[BootFileVariant, PrebuiltBootFiles]:
+    """Render and encode a boot file matrix at once, e.g. at session start.
+
+    Identical configs are encoded once, in parallel docsis compiler
+    processes, and their variants share the encoded file. As encoded files
+    are cached by content, provisioning a pre-built boot file later on costs
+    no encoding either.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Initialize DUT using boot file with below parameters
+
+    .. code-block:: python
+
+        # example usage
+        boot_files = prebuild_boot_files(
+            board, get_boot_file_matrix(erouter_modes=["ipv4", "ipv6"])
+        )
+        ipv6_boot_files = boot_files[BootFileVariant("ipv6")]
+
+    :param board: Cable Modem device instance
+    :type board: CableModem
+    :param variants: boot file variants, see get_boot_file_matrix()
+    :type variants: Iterable[BootFileVariant]
+    :param mibs_path: mibs directory paths, defaults to the DOCSIS MIBs
+    :type mibs_path: list[str] | None
+    :param max_workers: maximum number of concurrent encoder processes
+    :type max_workers: int | None
+    :raises ValueError: when an eRouter mode is not valid
+    :raises ConfigEncodingError: when a boot file fails to encode
+    :return: rendered and encoded boot files by variant
+    :rtype: dict[BootFileVariant, PrebuiltBootFiles]
+    """
+    variants = list(variants)
+    if modes := {variant.erouter_mode for variant in variants} - {
+        None,
+        *_EROUTER_MODES,
+    }:
+        msg = f"Requested initialization modes: {modes} not in {_EROUTER_MODES}"
+        raise ValueError(msg)
+    boot_files = BOOT_FILE_STORE.get(board)
+    board_boot_file = boot_files.cm_boot_file
+    vendor_id = get_vendor_id_from_cm_bootfile(board=board)
+    rendered: dict[BootFileVariant, tuple[str, str | None]] = {}
+    for variant in variants:
+        cm_boot_file = board_boot_file
+        if variant.erouter_mode is not None:
+            cm_boot_file = _get_erouter_variant(
+                cm_boot_file, variant.erouter_mode, vendor_id
+            )
+        if variant.extra_tlvs:
+            cm_boot_file = add_tlvs_to_bootfile(variant.extra_tlvs, cm_boot_file, board)
+        rendered[variant] = (
+            cm_boot_file,
+            boot_files.mta_boot_file if variant.with_mta else None,
+        )
+    encoded = _encode_boot_files(
+        list(rendered.values()), mibs_path or [DOCSIS_DEVICE_MIBS_PATH], max_workers
+    )
+    return {
+        variant: PrebuiltBootFiles(
+            cm_boot_file,
+            encoded[EncodeJob(cm_boot_file)],
+            mta,
+            encoded[EncodeJob(mta, is_mta=True)] if mta is not None else None,
+        )
+        for variant, (cm_boot_file, mta) in rendered.items()
+    }
+
+
+def _encode_boot_files(
+    boot_files: list[tuple[str, str | None]],
+    mibs_path: list[str],
+    max_workers: int | None,
+) -> dict[EncodeJob, Path]:
+    """Encode the unique CM and MTA boot files of a matrix at once.
+
+    :param boot_files: CM and MTA boot files, None for no MTA
+    :type boot_files: list[tuple[str, str | None]]
+    :param mibs_path: mibs directory paths
+    :type mibs_path: list[str]
+    :param max_workers: maximum number of concurrent encoder processes
+    :type max_workers: int | None
+    :raises ConfigEncodingError: when a boot file fails to encode
+    :return: encoded file by encoder job
+    :rtype: dict[EncodeJob, Path]
+    """
+    jobs = list(
+        dict.fromkeys(
+            job
+            for cm_boot_file, mta_boot_file in boot_files
+            for job in (
+                EncodeJob(cm_boot_file),
+                *([EncodeJob(mta_boot_file, is_mta=True)] if mta_boot_file else []),
+            )
+        )
+    )
+    encoded: dict[EncodeJob, Path] = {}
+    for result in DocsisConfigEncoder().encode_many(jobs, mibs_path, max_workers):
+        if result.error:
+            raise result.error
+        if result.path:
+            encoded[result.job] = result.path
+    return encoded
 
 
 def _override_boot_files(
@@ -549,10 +916,12 @@ def _override_boot_files(
     :return: the two configuration files in string format
     :rtype: tuple[str, str]
     """
+    # the boot files of the board may have changed since they were stored
+    BOOT_FILE_STORE.invalidate(board)
     if cm_boot_file is None:
-        cm_boot_file = board.sw.get_boot_file()
+        cm_boot_file = BOOT_FILE_STORE.get(board).cm_boot_file
     if mta_boot_file is None:
-        mta_boot_file = board.sw.get_mta_boot_file()
+        mta_boot_file = BOOT_FILE_STORE.get(board).mta_boot_file
 
     return cm_boot_file, mta_boot_file
 
@@ -613,6 +982,8 @@ def provision_docsis_board(
         boot_file=cm_boot_file,
         boot_file_mta=emta_boot_file,
     )
+    SNMP_CONTEXTS.invalidate(board.hw.mac_address)
+    BOOT_FILE_STORE.invalidate(board)
 
 
 def provision_docsis_board_and_reboot_it(
@@ -4,12 +4,24 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from boardfarm3.lib.SNMPv2 import SNMPv2
+from boardfarm3.exceptions import SNMPError
+
+from boardfarm3_docsis.lib.snmp_batch import (
+    VarbindResult,
+    build_snmp_command,
+    chunk_oids,
+    format_set_varbind,
+    get_error_reason,
+    parse_varbinds,
+    resolve_oid,
+)
+from boardfarm3_docsis.lib.snmp_context import SNMP_CONTEXTS
 
 if TYPE_CHECKING:
     from boardfarm3.templates.cpe import CPE
     from boardfarm3.templates.wan import WAN
 
+    from boardfarm3_docsis.templates.cable_modem.cable_modem_mibs import MIBInfo
     from boardfarm3_docsis.templates.cmts import CMTS
 
 
@@ -56,19 +68,16 @@ def snmp_get(  # pylint: disable=too-many-arguments  # noqa: PLR0913
     :return: value, type, full SNMP output
     :rtype: tuple[str, str, str]
     """
-    return SNMPv2(
-        wan,
-        cmts.get_cable_modem_ip_address(board.cm_mac),  # type: ignore [attr-defined]
-        board.sw.get_mibs_compiler(),  # type: ignore [attr-defined]
-    ).snmpget(
-        mib_name,
-        index,
-        community,
-        extra_args,
-        timeout,
-        retries,
-        cmd_timeout=cmd_timeout,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            mib_name,
+            index,
+            community,
+            extra_args,
+            timeout,
+            retries,
+            cmd_timeout=cmd_timeout,
+        )
 
 
 def snmp_set(  # pylint: disable=too-many-arguments  # noqa: PLR0913
@@ -136,21 +145,18 @@ def snmp_set(  # pylint: disable=too-many-arguments  # noqa: PLR0913
     :return: value, type, full SNMP output
     :rtype: tuple[str, str, str]
     """
-    return SNMPv2(
-        wan,
-        cmts.get_cable_modem_ip_address(board.cm_mac),  # type: ignore [attr-defined]
-        board.sw.get_mibs_compiler(),  # type: ignore [attr-defined]
-    ).snmpset(
-        mib_name,
-        value,
-        stype,
-        index,
-        community,
-        extra_args,
-        timeout,
-        retries,
-        cmd_timeout=cmd_timeout,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpset(
+            mib_name,
+            value,
+            stype,
+            index,
+            community,
+            extra_args,
+            timeout,
+            retries,
+            cmd_timeout=cmd_timeout,
+        )
 
 
 def snmp_walk(  # pylint: disable=too-many-arguments  # noqa: PLR0913
@@ -196,19 +202,16 @@ def snmp_walk(  # pylint: disable=too-many-arguments  # noqa: PLR0913
              complete output)
     :rtype: tuple[dict[str, List[str]], str]
     """
-    return SNMPv2(
-        wan,
-        cmts.get_cable_modem_ip_address(board.cm_mac),  # type: ignore [attr-defined]
-        board.sw.get_mibs_compiler(),  # type: ignore [attr-defined]
-    ).snmpwalk(
-        mib_name,
-        index,
-        community,
-        retries,
-        timeout,
-        extra_args,
-        cmd_timeout=cmd_timeout,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpwalk(
+            mib_name,
+            index,
+            community,
+            retries,
+            timeout,
+            extra_args,
+            cmd_timeout=cmd_timeout,
+        )
 
 
 def get_mib_oid(mib_name: str, device: CPE) -> str:
@@ -271,18 +274,218 @@ def snmp_bulk_get(  # pylint: disable=too-many-arguments  # noqa: PLR0913
     :return: output of snmpbulkget command
     :rtype: list[tuple[str, str, str]]
     """
-    return SNMPv2(
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpbulkget(
+            mib_name,
+            index,
+            community,
+            non_repeaters,
+            max_repetitions,
+            retries,
+            timeout,
+            extra_args,
+            cmd_timeout=cmd_timeout,
+        )
+
+
+def snmp_set_many(  # pylint: disable=too-many-arguments  # noqa: PLR0913
+    mibs: list[MIBInfo],
+    wan: WAN,
+    board: CPE,
+    cmts: CMTS,
+    community: str = "private",
+    extra_args: str = "",
+    timeout: int = 10,
+    retries: int = 3,
+    cmd_timeout: int = 30,
+) -> dict[str, VarbindResult]:
+    """SNMP Set several board MIBs at once from WAN device via SNMPv2.
+
+    All the MIBs are set with a single multi-varbind PDU, so the agent
+    applies either all of them or none.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Set the values of [mib_names] via SNMP
+        - Trigger the software upgrade on DUT via SNMP
+
+    :param mibs: MIBs to set, with their index, type and value. The types
+        are MIB types, e.g. Integer, String or HexString, or snmpset type
+        letters, see ``snmp_set()``.
+    :type mibs: list[MIBInfo]
+    :param wan: WAN device instance
+    :type wan: WAN
+    :param board: CPE device instance
+    :type board: CPE
+    :param cmts: CMTS device instance
+    :type cmts: CMTS
+    :param community: public/private, defaults to "private"
+    :type community: str
+    :param extra_args: see ``man snmpset`` for extra args, defaults to ""
+    :type extra_args: str
+    :param timeout: seconds, defaults to 10
+    :type timeout: int
+    :param retries: number of retries, defaults to 3
+    :type retries: int
+    :param cmd_timeout: timeout to wait for command to give otuput
+    :type cmd_timeout: int
+    :raises SNMPError: when the agent rejects the set, naming the failed MIB
+    :return: value and type set, keyed by MIB name
+    :rtype: dict[str, VarbindResult]
+    """
+    mibs_compiler = board.sw.get_mibs_compiler()  # type: ignore [attr-defined]
+    oids = {resolve_oid(mib.mib_name, mib.index, mibs_compiler): mib for mib in mibs}
+    output = _run_snmp_command(
+        "snmpset",
+        [format_set_varbind(oid, mib.type, mib.value) for oid, mib in oids.items()],
         wan,
-        cmts.get_cable_modem_ip_address(board.cm_mac),  # type: ignore [attr-defined]
-        board.sw.get_mibs_compiler(),  # type: ignore [attr-defined]
-    ).snmpbulkget(
-        mib_name,
-        index,
+        board,
+        cmts,
         community,
-        non_repeaters,
-        max_repetitions,
+        extra_args,
+        timeout,
         retries,
+        cmd_timeout,
+    )
+    return _get_set_results(oids, output)
+
+
+def snmp_get_many(  # pylint: disable=too-many-arguments  # noqa: PLR0913
+    mib_names_with_indexes: list[tuple[str, int]],
+    wan: WAN,
+    board: CPE,
+    cmts: CMTS,
+    community: str = "private",
+    extra_args: str = "",
+    timeout: int = 10,
+    retries: int = 3,
+    cmd_timeout: int = 30,
+    max_varbinds: int = 32,
+) -> dict[str, VarbindResult]:
+    """SNMP Get several board MIBs at once from WAN device via SNMPv2.
+
+    The OIDs are resolved once and fetched with multi-varbind GET PDUs. Large
+    requests are split into several PDUs, and a PDU whose response is too
+    big for the agent is split again.
+
+    .. hint:: This Use Case implements statements from the test suite such as:
+
+        - Get the values of [mib_names] via SNMP
+        - Verify the software update MIBs of the DUT via SNMP
+
+    :param mib_names_with_indexes: MIB names, or numeric OIDs, and MIB
+        indexes to get. A MIB name appears once.
+    :type mib_names_with_indexes: list[tuple[str, int]]
+    :param wan: WAN device instance
+    :type wan: WAN
+    :param board: CPE device instance
+    :type board: CPE
+    :param cmts: CMTS device instance
+    :type cmts: CMTS
+    :param community: public/private, defaults to "private"
+    :type community: str
+    :param extra_args: see ``man snmpget`` for extra args, defaults to ""
+    :type extra_args: str
+    :param timeout: seconds, defaults to 10
+    :type timeout: int
+    :param retries: number of retries, defaults to 3
+    :type retries: int
+    :param cmd_timeout: timeout to wait for command to give otuput
+    :type cmd_timeout: int
+    :param max_varbinds: maximum number of MIBs of a PDU, defaults to 32
+    :type max_varbinds: int
+    :raises ValueError: when a MIB name is given several times
+    :return: value and type of each MIB, keyed by MIB name. The MIBs not
+        fetched, e.g. noSuchObject or no response, have an error instead.
+    :rtype: dict[str, VarbindResult]
+    """
+    oids = _resolve_oids(mib_names_with_indexes, board)
+    results: dict[str, VarbindResult] = {}
+    pending = chunk_oids(list(oids), max_varbinds)
+    while pending:
+        chunk = pending.pop(0)
+        output = _run_snmp_command(
+            "snmpget",
+            chunk,
+            wan,
+            board,
+            cmts,
+            community,
+            extra_args,
+            timeout,
+            retries,
+            cmd_timeout,
+        )
+        if "tooBig" in output and len(chunk) > 1:
+            pending[:0] = [chunk[: len(chunk) // 2], chunk[len(chunk) // 2 :]]
+            continue
+        results.update(_get_get_results(chunk, output))
+    return {mib_name: results[oid] for oid, mib_name in oids.items()}
+
+
+def _resolve_oids(
+    mib_names_with_indexes: list[tuple[str, int]], board: CPE
+) -> dict[str, str]:
+    names = [mib_name for mib_name, _ in mib_names_with_indexes]
+    if len(set(names)) != len(names):
+        msg = f"MIB names given several times: {names}"
+        raise ValueError(msg)
+    mibs_compiler = board.sw.get_mibs_compiler()  # type: ignore [attr-defined]
+    return {
+        resolve_oid(mib_name, index, mibs_compiler): mib_name
+        for mib_name, index in mib_names_with_indexes
+    }
+
+
+def _get_get_results(oids: list[str], output: str) -> dict[str, VarbindResult]:
+    results = parse_varbinds(oids, output)
+    if error := get_error_reason(output):
+        # the varbinds without value failed with the PDU error
+        results.update(
+            {
+                oid: VarbindResult(oid, error=error[0])
+                for oid, result in results.items()
+                if not result.is_successful
+            }
+        )
+    return results
+
+
+def _get_set_results(oids: dict[str, MIBInfo], output: str) -> dict[str, VarbindResult]:
+    if error := get_error_reason(output):
+        failed_mib = oids[error[1]].mib_name if error[1] in oids else "the MIBs"
+        msg = f"SNMP set of {failed_mib} failed: {error[0]}"
+        raise SNMPError(msg)
+    results = parse_varbinds(list(oids), output)
+    if failed := [oids[oid].mib_name for oid, res in results.items() if res.error]:
+        msg = f"SNMP set of {', '.join(failed)} failed:\n{output}"
+        raise SNMPError(msg)
+    return {oids[oid].mib_name: result for oid, result in results.items()}
+
+
+def _run_snmp_command(  # pylint: disable=too-many-arguments  # noqa: PLR0913
+    action: str,
+    varbinds: list[str],
+    wan: WAN,
+    board: CPE,
+    cmts: CMTS,
+    community: str,
+    extra_args: str,
+    timeout: int,
+    retries: int,
+    cmd_timeout: int,
+) -> str:
+    command = build_snmp_command(
+        action,
+        SNMP_CONTEXTS.get_cm_ip_address(board, cmts),
+        varbinds,
+        community,
         timeout,
+        retries,
         extra_args,
-        cmd_timeout=cmd_timeout,
     )
+    output = wan.execute_snmp_command(command, timeout=cmd_timeout)
+    if (error := get_error_reason(output)) and error[1] is None:
+        # no response, the cached CM IP address may be stale
+        SNMP_CONTEXTS.invalidate(board.hw.mac_address)
+    return output
@@ -10,11 +10,12 @@ from time import sleep
 from typing import TYPE_CHECKING, Any, Literal
 from urllib.parse import urlparse
 
-from boardfarm3.lib.SNMPv2 import SNMPv2
 from boardfarm3.lib.utils import retry_on_exception
-from boardfarm3.lib.wrappers import singleton
 
-from boardfarm3_docsis.lib.sw_update_helper import SoftwareUpdateHelper
+from boardfarm3_docsis.lib.boot_file_store import BOOT_FILE_STORE
+from boardfarm3_docsis.lib.snmp_context import SNMP_CONTEXTS
+from boardfarm3_docsis.templates.cable_modem.cable_modem_mibs import MIBInfo
+from boardfarm3_docsis.use_cases.snmp import snmp_set_many
 
 if TYPE_CHECKING:
     from boardfarm3.templates.cpe.cpe import CPE
@@ -34,17 +35,6 @@ PROTO_DICT: dict[str, dict[str, str]] = {
 _LOGGER = logging.getLogger(__name__)
 
 
-@singleton
-class _SnmpSwUpdate:  # pylint: disable=too-few-public-methods
-    def __init__(self, board: CableModem, wan: WAN, cmts: CMTS) -> None:
-        self.snmp = SNMPv2(
-            wan,
-            cmts.get_cable_modem_ip_address(board.cm_mac),
-            board.sw.get_mibs_compiler(),
-        )
-        self.sw_update = SoftwareUpdateHelper()
-
-
 def get_current_cm_config(board: CableModem) -> str:
     """Get current cable modem bootfile.
 
@@ -58,7 +48,7 @@ def get_current_cm_config(board: CableModem) -> str:
     :rtype: str
     """
     # TODO: check whether this is a duplicate use Case
-    return board.sw.get_boot_file()
+    return BOOT_FILE_STORE.get(board).cm_boot_file
 
 
 def get_update_image_version(board: CPE) -> str:
@@ -441,11 +431,12 @@ def set_docsis_SwServerTransportProtocol(
     if proto not in PROTO_DICT:
         msg = "Wrong protocol name"
         raise ValueError(msg)
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_TransportProtocol_mib_name(vendor_specific=False, board=board),
-        PROTO_DICT[proto]["proto"],
-        "i",
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_TransportProtocol_mib_name(vendor_specific=False, board=board),
+            PROTO_DICT[proto]["proto"],
+            "i",
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -475,12 +466,13 @@ def set_vendor_SwServerTransportProtocol(
     if proto not in PROTO_DICT:
         msg = "Wrong protocol name"
         raise ValueError(msg)
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_TransportProtocol_mib_name(vendor_specific=True, board=board),
-        PROTO_DICT[proto]["proto"],
-        "i",
-        index=index,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_TransportProtocol_mib_name(vendor_specific=True, board=board),
+            PROTO_DICT[proto]["proto"],
+            "i",
+            index=index,
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -502,12 +494,13 @@ def get_docsis_SwServerTransportProtocol(
     :return: docsis software server transport protocol
     :rtype: str
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-        _get_TransportProtocol_mib_name(
-            vendor_specific=False,
-            board=board,
-        )
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            _get_TransportProtocol_mib_name(
+                vendor_specific=False,
+                board=board,
+            )
+        )[0]
 
 
 # pylint: disable-next=invalid-name
@@ -531,9 +524,11 @@ def get_vendor_SwServerTransportProtocol(
     :return: vendor software server transport protocol
     :rtype: str
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-        _get_TransportProtocol_mib_name(vendor_specific=True, board=board), index=index
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            _get_TransportProtocol_mib_name(vendor_specific=True, board=board),
+            index=index,
+        )[0]
 
 
 # pylint: disable-next=invalid-name
@@ -555,11 +550,12 @@ def set_docsis_SwServerAddressType(
     :param address_type: server address type
     :type address_type: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwServerAddressType_mib_name(vendor_specific=False, board=board),
-        str(address_type),
-        "i",
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwServerAddressType_mib_name(vendor_specific=False, board=board),
+            str(address_type),
+            "i",
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -585,12 +581,13 @@ def set_vendor_SwServerAddressType(
         defaults to 1
     :type index: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwServerAddressType_mib_name(vendor_specific=True, board=board),
-        str(address_type),
-        "i",
-        index=index,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwServerAddressType_mib_name(vendor_specific=True, board=board),
+            str(address_type),
+            "i",
+            index=index,
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -610,14 +607,15 @@ def get_docsis_SwServerAddressType(board: CableModem, wan: WAN, cmts: CMTS) -> i
     :return: docsis software server address type
     :rtype: int
     """
-    return int(
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-            _get_SwServerAddressType_mib_name(
-                vendor_specific=False,
-                board=board,
-            )
-        )[0]
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return int(
+            snmp.snmpget(
+                _get_SwServerAddressType_mib_name(
+                    vendor_specific=False,
+                    board=board,
+                )
+            )[0]
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -641,15 +639,16 @@ def get_vendor_SwServerAddressType(
     :return: vendor software server address type
     :rtype: int
     """
-    return int(
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-            _get_SwServerAddressType_mib_name(
-                vendor_specific=True,
-                board=board,
-            ),
-            index=index,
-        )[0]
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return int(
+            snmp.snmpget(
+                _get_SwServerAddressType_mib_name(
+                    vendor_specific=True,
+                    board=board,
+                ),
+                index=index,
+            )[0]
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -672,9 +671,10 @@ def set_docsis_SwServerAddress(
     :type addr: str
     """
     addr = "0x" + " ".join([format(int(x), "02X") for x in addr.split(".")])
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwServerAddress_mib_name(vendor_specific=False, board=board), addr, "x"
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwServerAddress_mib_name(vendor_specific=False, board=board), addr, "x"
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -699,12 +699,13 @@ def set_vendor_SwServerAddress(
     :type index: int
     """
     addr = "0x" + " ".join([format(int(x), "02X") for x in addr.split(".")])
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwServerAddress_mib_name(vendor_specific=True, board=board),
-        addr,
-        "x",
-        index=index,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwServerAddress_mib_name(vendor_specific=True, board=board),
+            addr,
+            "x",
+            index=index,
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -729,16 +730,17 @@ def set_vendor_HwModel(
         an index value greater than 0 and less than 3 is accepted, defaults to 1
     :type index: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_HwModel_mib_name(
-            mib=board.sw.mibs.hw_model_mib,
-            vendor_specific=True,
-            board=board,
-        ),
-        model,
-        "s",
-        index=index,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_HwModel_mib_name(
+                mib=board.sw.mibs.hw_model_mib,
+                vendor_specific=True,
+                board=board,
+            ),
+            model,
+            "s",
+            index=index,
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -758,9 +760,10 @@ def get_docsis_SwServerAddress(board: CableModem, wan: WAN, cmts: CMTS) -> str:
     :return: docsis software server address
     :rtype: str
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-        _get_SwServerAddress_mib_name(vendor_specific=False, board=board)
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            _get_SwServerAddress_mib_name(vendor_specific=False, board=board)
+        )[0]
 
 
 # pylint: disable-next=invalid-name,too-many-arguments,too-many-locals
@@ -785,14 +788,11 @@ def get_vendor_SwServerAddress(
     :return: vendor software server address
     :rtype: str
     """
-    return (
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts)
-        .snmp.snmpget(
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
             _get_SwServerAddress_mib_name(vendor_specific=True, board=board),
             index=index,
-        )[0]
-        .strip()
-    )
+        )[0].strip()
 
 
 # pylint: disable-next=invalid-name
@@ -812,9 +812,10 @@ def set_docsis_SwFilename(name: str, board: CableModem, wan: WAN, cmts: CMTS) ->
     :param name: software filename
     :type name: str
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwFilename_mib_name(vendor_specific=False, board=board), name, "s"
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwFilename_mib_name(vendor_specific=False, board=board), name, "s"
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -838,12 +839,13 @@ def set_vendor_SwFilename(
     :param index: index of the object for a mib or oid
     :type index: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwFilename_mib_name(vendor_specific=True, board=board),
-        name,
-        "s",
-        index=index,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwFilename_mib_name(vendor_specific=True, board=board),
+            name,
+            "s",
+            index=index,
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -863,9 +865,10 @@ def get_docsis_SwFilename(board: CableModem, wan: WAN, cmts: CMTS) -> str:
     :return: docsis software filename
     :rtype: str
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-        _get_SwFilename_mib_name(vendor_specific=False, board=board)
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            _get_SwFilename_mib_name(vendor_specific=False, board=board)
+        )[0]
 
 
 # pylint: disable-next=invalid-name
@@ -890,9 +893,10 @@ def get_vendor_SwFilename(
     :return: vendor software filename
     :rtype: str
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-        _get_SwFilename_mib_name(vendor_specific=True, board=board), index=index
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            _get_SwFilename_mib_name(vendor_specific=True, board=board), index=index
+        )[0]
 
 
 # pylint: disable-next=invalid-name
@@ -912,11 +916,12 @@ def set_vendor_SwMethod(board: CableModem, wan: WAN, cmts: CMTS, method: int) ->
     :param method: software update method
     :type method: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        board.sw.mibs.sw_method_mib,
-        str(method),
-        "i",
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            board.sw.mibs.sw_method_mib,
+            str(method),
+            "i",
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -938,11 +943,8 @@ def get_vendor_SwMethod(board: CableModem, wan: WAN, cmts: CMTS, index: int = 1)
     :return: software update method
     :rtype: int
     """
-    return int(
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-            board.sw.mibs.sw_method_mib, index=index
-        )[0]
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return int(snmp.snmpget(board.sw.mibs.sw_method_mib, index=index)[0])
 
 
 # pylint: disable-next=invalid-name
@@ -962,9 +964,12 @@ def set_docsis_SwAdminStatus(val: int, board: CableModem, wan: WAN, cmts: CMTS)
     :param val: software update admin status
     :type val: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwAdminStatus_mib_name(vendor_specific=False, board=board), str(val), "i"
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwAdminStatus_mib_name(vendor_specific=False, board=board),
+            str(val),
+            "i",
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -990,12 +995,13 @@ def set_vendor_SwAdminStatus(
         defaults to 1
     :type index: int
     """
-    _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpset(
-        _get_SwAdminStatus_mib_name(vendor_specific=True, board=board),
-        str(val),
-        "i",
-        index=index,
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        snmp.snmpset(
+            _get_SwAdminStatus_mib_name(vendor_specific=True, board=board),
+            str(val),
+            "i",
+            index=index,
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -1015,11 +1021,12 @@ def get_docsis_SwAdminStatus(board: CableModem, wan: WAN, cmts: CMTS) -> int:
     :return: software update admin status
     :rtype: int
     """
-    return int(
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-            _get_SwAdminStatus_mib_name(vendor_specific=False, board=board)
-        )[0]
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return int(
+            snmp.snmpget(
+                _get_SwAdminStatus_mib_name(vendor_specific=False, board=board)
+            )[0]
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -1044,11 +1051,13 @@ def get_vendor_SwAdminStatus(
     :return: software update admin status
     :rtype: int
     """
-    return int(
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-            _get_SwAdminStatus_mib_name(vendor_specific=True, board=board), index=index
-        )[0]
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return int(
+            snmp.snmpget(
+                _get_SwAdminStatus_mib_name(vendor_specific=True, board=board),
+                index=index,
+            )[0]
+        )
 
 
 # pylint: disable-next=invalid-name
@@ -1069,9 +1078,10 @@ def get_docsis_SwCurrentVers(board: CableModem, wan: WAN, cmts: CMTS) -> str:
     :return: current software version
     :rtype: str
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-        _get_SwCurrentVers_mib_name(vendor_specific=False, board=board)
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpget(
+            _get_SwCurrentVers_mib_name(vendor_specific=False, board=board)
+        )[0]
 
 
 # pylint: disable-next=invalid-name
@@ -1091,11 +1101,12 @@ def get_docsis_OperationStatus(board: CableModem, wan: WAN, cmts: CMTS) -> int:
     :return: docsis operation status
     :rtype: int
     """
-    return int(
-        _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpget(
-            _get_SwOperStatus_mib_name(vendor_specific=False, board=board)
-        )[0]
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return int(
+            snmp.snmpget(
+                _get_SwOperStatus_mib_name(vendor_specific=False, board=board)
+            )[0]
+        )
 
 
 # pylint: disable=too-many-arguments
@@ -1157,9 +1168,10 @@ def get_docsis_EventEntry(board: CableModem, wan: WAN, cmts: CMTS) -> tuple[dict
     :return: docsis event entry
     :rtype: Tuple[Dict, Any]
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpwalk(
-        _get_EventEntry_mib_name(vendor_specific=False, board=board)
-    )
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpwalk(
+            _get_EventEntry_mib_name(vendor_specific=False, board=board)
+        )
 
 
 def get_vendor_table(
@@ -1182,9 +1194,8 @@ def get_vendor_table(
     :return: sw model vendor tables
     :rtype: Dict[str, List[str]]
     """
-    return _SnmpSwUpdate(board=board, wan=wan, cmts=cmts).snmp.snmpwalk(
-        board.sw.mibs.sw_model_table_mib, index=index
-    )[0]
+    with SNMP_CONTEXTS.session(board, wan, cmts) as snmp:
+        return snmp.snmpwalk(board.sw.mibs.sw_model_table_mib, index=index)[0]
 
 
 # pylint: disable=too-many-arguments
@@ -1223,13 +1234,45 @@ def trigger_docsis_snmp_sw_update(  # noqa: PLR0913
     :type wan: WAN
     :param cmts: CMTS to which the CM is connected
     :type cmts: CMTS
+    :raises ValueError: When a wrong protocol name is passed
     """
-    set_docsis_SwFilename(name=sw_filename, board=board, wan=wan, cmts=cmts)
-    set_docsis_SwServerTransportProtocol(
-        proto=protocol, board=board, wan=wan, cmts=cmts
-    )
-    set_docsis_SwServerAddressType(
-        address_type=address_type, board=board, wan=wan, cmts=cmts
+    if protocol not in PROTO_DICT:
+        msg = "Wrong protocol name"
+        raise ValueError(msg)
+    snmp_set_many(
+        [
+            MIBInfo(
+                _get_SwFilename_mib_name(vendor_specific=False, board=board),
+                0,
+                "String",
+                sw_filename,
+            ),
+            MIBInfo(
+                _get_TransportProtocol_mib_name(vendor_specific=False, board=board),
+                0,
+                "Integer",
+                PROTO_DICT[protocol]["proto"],
+            ),
+            MIBInfo(
+                _get_SwServerAddressType_mib_name(vendor_specific=False, board=board),
+                0,
+                "Integer",
+                address_type,
+            ),
+            MIBInfo(
+                _get_SwServerAddress_mib_name(vendor_specific=False, board=board),
+                0,
+                "HexString",
+                server_address,
+            ),
+            MIBInfo(
+                _get_SwAdminStatus_mib_name(vendor_specific=False, board=board),
+                0,
+                "Integer",
+                admin_status,
+            ),
+        ],
+        wan=wan,
+        board=board,
+        cmts=cmts,
     )
-    set_docsis_SwServerAddress(addr=server_address, board=board, wan=wan, cmts=cmts)
-    set_docsis_SwAdminStatus(val=admin_status, board=board, wan=wan, cmts=cmts)
@@ -0,0 +1 @@
+"""Boardfarm-docsis unit tests module."""
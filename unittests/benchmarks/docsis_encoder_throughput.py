@@ -0,0 +1,39 @@
+"""Compare the throughput of the native DOCSIS encoder and the compiler.
+
+Run with ``python -m unittests.benchmarks.docsis_encoder_throughput``, the
+docsis compiler must be installed.
+"""
+
+import shutil
+import sys
+import time
+
+from boardfarm3_docsis.configs import DOCSIS_DEVICE_MIBS_PATH
+from boardfarm3_docsis.lib.docsis_encoder import DocsisConfigEncoder
+from boardfarm3_docsis.lib.docsis_native_encoder import NativeCmConfigEncoder
+from unittests.lib.test_docsis_native_encoder import _BOOT_FILE
+
+_ITERATIONS = 20
+
+
+def main() -> None:
+    """Print the boot files encoded per second by each engine."""
+    if shutil.which("docsis") is None:
+        sys.exit("docsis compiler is not installed")
+    encoder = DocsisConfigEncoder(use_cache=False)
+    native_encoder = NativeCmConfigEncoder()
+    start_time = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        encoder.encode_cm_config(
+            _BOOT_FILE, [DOCSIS_DEVICE_MIBS_PATH], engine="compiler"
+        ).unlink()
+    throughput = {"compiler": _ITERATIONS / (time.perf_counter() - start_time)}
+    start_time = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        native_encoder.encode(_BOOT_FILE)
+    throughput["native"] = _ITERATIONS / (time.perf_counter() - start_time)
+    sys.stdout.write(f"Boot files encoded per second: {throughput}\n")
+
+
+if __name__ == "__main__":
+    main()
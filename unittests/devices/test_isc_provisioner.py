@@ -0,0 +1,326 @@
+"""ISC provisioner DHCP config tests."""
+
+import asyncio
+import subprocess
+from argparse import Namespace
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import pytest
+from boardfarm3.exceptions import ConfigurationFailure
+
+from boardfarm3_docsis.devices.isc_provisioner import ISCProvisioner
+from boardfarm3_docsis.lib.fair_lock import FairLock
+
+
+class _ShellConsole:
+    """Console running the commands in a local shell."""
+
+    def execute_command(self, command: str) -> str:
+        return subprocess.run(  # noqa: S603
+            ["/bin/bash", "-c", command],
+            capture_output=True,
+            text=True,
+            check=False,
+        ).stdout
+
+    def sendline(self, command: str) -> None:
+        self.execute_command(command)
+
+    def expect(self, _pattern: object) -> int:
+        return 0
+
+
+@pytest.fixture(name="provisioner")
+def _provisioner(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> ISCProvisioner:
+    provisioner = ISCProvisioner(config={}, cmdline_args=Namespace())
+    provisioner.resource_name = f"board-{tmp_path.name}"
+    monkeypatch.setattr(provisioner, "_console", _ShellConsole(), raising=False)
+    # dhcpd is not available here, any config containing "invalid" is rejected
+    monkeypatch.setattr(
+        ISCProvisioner,
+        "_get_dhcp_config_test_command",
+        staticmethod(
+            lambda path, _, message: f"grep -q invalid {path} || echo {message}"
+        ),
+    )
+    return provisioner
+
+
+def test_rejected_config_is_rolled_back(
+    provisioner: ISCProvisioner, tmp_path: Path
+) -> None:
+    """Check that a rejected render leaves the live configs untouched."""
+    live_path = str(tmp_path / "dhcpd.conf")
+    Path(f"{live_path}.other").write_text("host other {}\n", encoding="utf-8")
+    provisioner._apply_dhcp_config_files(  # noqa: SLF001  # pylint: disable=protected-access
+        live_path,
+        {f"{live_path}-board.master": "master\n", f"{live_path}.board": "good\n"},
+        False,
+    )
+    assert Path(live_path).read_text(encoding="utf-8").split() == [
+        "master",
+        "host",
+        "other",
+        "{}",
+        "good",
+    ]
+    with pytest.raises(ConfigurationFailure):
+        provisioner._apply_dhcp_config_files(  # noqa: SLF001  # pylint: disable=protected-access
+            live_path,
+            {
+                f"{live_path}-board.master": "master\n",
+                f"{live_path}.board": "invalid\n",
+            },
+            False,
+        )
+    assert Path(f"{live_path}.board").read_text(encoding="utf-8").strip() == "good"
+    assert "invalid" not in Path(live_path).read_text(encoding="utf-8")
+    assert not Path(f"/tmp/dhcp-staging-{provisioner.resource_name}").exists()  # noqa: S108
+    # the other boards still get a valid config
+    provisioner._apply_dhcp_config_files(  # noqa: SLF001  # pylint: disable=protected-access
+        live_path,
+        {f"{live_path}-other.master": "master\n", f"{live_path}.other": "other\n"},
+        False,
+    )
+    assert Path(live_path).read_text(encoding="utf-8").split() == [
+        "master",
+        "good",
+        "other",
+    ]
+
+
+def test_async_provisioning_lock_order(
+    provisioner: ISCProvisioner, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Check that waiting for the provisioner lock leaves the console free."""
+    events: list[str] = []
+
+    def _fake_step(name: str) -> Callable[..., Awaitable[None]]:
+        async def _step(*args: object) -> None:
+            events.append(f"{name} {args[0]}" if name == "update" else name)
+            await asyncio.sleep(0.01)
+
+        return _step
+
+    for step, method in {
+        "acquire": "_acquire_device_file_lock_async",
+        "update": "_update_dhcp_config_async",
+        "restart": "_restart_dhcp_service_async",
+        "release": "_release_device_file_lock_async",
+    }.items():
+        monkeypatch.setattr(provisioner, method, _fake_step(step))
+    monkeypatch.setattr(
+        provisioner,
+        "_provisioning_lock",
+        FairLock("provisioner", str(tmp_path), poll_interval=0.01),
+    )
+    # another session holds the provisioner lock
+    other_session = FairLock("provisioner", str(tmp_path), poll_interval=0.01)
+    other_session.acquire("other session")
+
+    async def _provision(cm_mac: str) -> None:
+        await provisioner.provision_cable_modem_async(
+            cm_mac, "cm.cfg", "", "10.0.0.1", "2001::1"
+        )
+
+    async def _run() -> None:
+        provisions = [
+            asyncio.create_task(_provision(cm_mac)) for cm_mac in ("cm1", "cm2")
+        ]
+        await asyncio.sleep(0.1)
+        # the console stays available to the other coroutines
+        console_lock = provisioner._console_lock_async  # noqa: SLF001  # pylint: disable=protected-access
+        await asyncio.wait_for(console_lock.acquire(), timeout=1)
+        console_lock.release()
+        assert not events
+        other_session.release()
+        await asyncio.gather(*provisions)
+
+    asyncio.run(_run())
+    # each provisioning runs on its own, in arrival order
+    assert events == [
+        f"{step} {cm_mac}" if step == "update" else step
+        for cm_mac in ("cm1", "cm2")
+        for step in ("acquire", "update", "update", "restart", "release")
+    ]
+
+
+class _OmshellConsole:
+    """Console recording the commands, answering omshell with a canned output."""
+
+    def __init__(self, omshell_output: str) -> None:
+        self.omshell_output = omshell_output
+        self.scripts: list[str] = []
+
+    def execute_command(self, command: str) -> str:
+        return self.omshell_output if command.startswith("omshell") else ""
+
+    def sendline(self, command: str) -> None:
+        self.scripts.append(command)
+
+    def expect(self, _pattern: object) -> int:
+        return 0
+
+
+_CPE_CONFIG = {"erouter_fixed_ip_start": "2001:dead:beef:6::1000/64"}
+_OMAPI_CONFIG = {
+    **_CPE_CONFIG,
+    "omapi_key_name": "omapi",
+    "omapi_key_secret": "c2VjcmV0",
+}
+_OMSHELL_CONFIRMATION = "obj: host\nname = cpe\n"
+
+
+def _get_cpe_provisioner(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    config: dict[str, str],
+    omshell_output: str = "",
+) -> tuple[ISCProvisioner, _OmshellConsole, list[tuple[str, ...]]]:
+    provisioner = ISCProvisioner(config=config, cmdline_args=Namespace())
+    provisioner.resource_name = "board"
+    provisioner.station_no = 1
+    console = _OmshellConsole(omshell_output)
+    events: list[tuple[str, ...]] = []
+    monkeypatch.setattr(provisioner, "_console", console, raising=False)
+    monkeypatch.setattr(
+        provisioner,
+        "_provisioning_lock",
+        FairLock("provisioner", str(tmp_path), poll_interval=0.01),
+    )
+    for method in ("_acquire_device_file_lock", "_release_device_file_lock"):
+        monkeypatch.setattr(provisioner, method, lambda _: None)
+    for method in ("_get_dhcpv4_master_config", "_get_dhcpv6_master_config"):
+        monkeypatch.setattr(provisioner, method, lambda: "master")
+    monkeypatch.setattr(
+        provisioner,
+        "_apply_dhcp_config_files",
+        lambda path, files, _: events.append(
+            ("apply", path, files[f"{path}.board-cpe"])
+        ),
+    )
+    monkeypatch.setattr(
+        provisioner, "_restart_dhcp_service", lambda: events.append(("restart",))
+    )
+    return provisioner, console, events
+
+
+def test_cpe_config_rendering(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Check the CPE host fragments of the DHCP configs."""
+    provisioner, _, events = _get_cpe_provisioner(monkeypatch, tmp_path, _CPE_CONFIG)
+    provisioner.provision_cpes(
+        {
+            "AA:BB:CC:DD:EE:01": (
+                {"all": {"dns-server": "10.0.0.1"}, "data": {"valid-lifetime": 60}},
+                {},
+            ),
+            "AA:BB:CC:DD:EE:02": ({}, {"data": {"dns-server": "2001::1"}}),
+        }
+    )
+    assert events == [
+        (
+            "apply",
+            "/etc/dhcp/dhcpd.conf",
+            "host cpe-aabbccddee01 {\n"
+            "   hardware ethernet aa:bb:cc:dd:ee:01;\n"
+            "   fixed-address 192.168.202.126;\n"
+            "   option domain-name-servers 10.0.0.1;\n"
+            "   default-lease-time 60;\n"
+            "   max-lease-time 60;\n"
+            "}\n"
+            "host cpe-aabbccddee02 {\n"
+            "   hardware ethernet aa:bb:cc:dd:ee:02;\n"
+            "   fixed-address 192.168.202.127;\n"
+            "}",
+        ),
+        (
+            "apply",
+            "/etc/dhcp/dhcpd6.conf",
+            "host cpe-aabbccddee02 {\n"
+            "   host-identifier option dhcp6.client-id 00:03:00:01:aa:bb:cc:dd:ee:02;\n"
+            "   hardware ethernet aa:bb:cc:dd:ee:02;\n"
+            "   fixed-address6 2001:dead:beef:6::1:1;\n"
+            "   option dhcp6.name-servers 2001::1;\n"
+            "}",
+        ),
+        ("restart",),
+    ]
+    # OMAPI is not opened without a key
+    assert not provisioner._get_omapi_config()  # noqa: SLF001  # pylint: disable=protected-access
+
+
+def test_cpe_reservations_over_omapi(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Check that DHCPv4 reservations are pushed after the config is validated."""
+    provisioner, console, events = _get_cpe_provisioner(
+        monkeypatch, tmp_path, _OMAPI_CONFIG, f"{_OMSHELL_CONFIRMATION}omshell-rc=0"
+    )
+    assert "omapi-key omapi;" in provisioner._get_omapi_config()  # noqa: SLF001  # pylint: disable=protected-access
+    provisioner.provision_cpes({"AA:BB:CC:DD:EE:01": ({}, {})})
+    assert [event[:2] for event in events] == [("apply", "/etc/dhcp/dhcpd.conf")]
+    assert len(console.scripts) == 1
+    assert "key omapi c2VjcmV0" in console.scripts[0]
+    assert "remove" not in console.scripts[0]
+    # an updated reservation is replaced, which opens the old host object
+    console.omshell_output = f"{_OMSHELL_CONFIRMATION * 2}omshell-rc=0"
+    provisioner.provision_cpes(
+        {"AA:BB:CC:DD:EE:01": ({"data": {"dns-server": "10.0.0.1"}}, {})}
+    )
+    assert [event[:2] for event in events] == [("apply", "/etc/dhcp/dhcpd.conf")] * 2
+    assert "remove" in console.scripts[1]
+    assert (
+        'set statements = "option domain-name-servers 10.0.0.1;"'
+        in (console.scripts[1])
+    )
+
+
+@pytest.mark.parametrize(
+    ("config", "omshell_output"),
+    [
+        (_CPE_CONFIG, f"{_OMSHELL_CONFIRMATION}omshell-rc=0"),
+        (_OMAPI_CONFIG, "can't open object: not found\nomshell-rc=0"),
+        (_OMAPI_CONFIG, f"{_OMSHELL_CONFIRMATION}omshell-rc=1"),
+    ],
+    ids=["no-omapi-key", "host-not-created", "omshell-failed"],
+)
+def test_cpe_reservations_restart_fallback(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    config: dict[str, str],
+    omshell_output: str,
+) -> None:
+    """Check that the DHCP service is restarted when OMAPI cannot be used."""
+    provisioner, console, events = _get_cpe_provisioner(
+        monkeypatch, tmp_path, config, omshell_output
+    )
+    provisioner.provision_cpes({"AA:BB:CC:DD:EE:01": ({}, {})})
+    assert [event[:2] for event in events] == [
+        ("apply", "/etc/dhcp/dhcpd.conf"),
+        ("apply", "/etc/dhcp/dhcpd6.conf"),
+        ("restart",),
+    ]
+    assert len(console.scripts) == (config is _OMAPI_CONFIG)
+    # the restart is skipped once the reservations are applied
+    applied_events = list(events)
+    provisioner.provision_cpes({"AA:BB:CC:DD:EE:01": ({}, {})})
+    assert events == applied_events
+
+
+def test_rejected_cpe_config_is_not_pushed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Check that no host is pushed over OMAPI when the config is rejected."""
+    provisioner, console, _ = _get_cpe_provisioner(
+        monkeypatch, tmp_path, _OMAPI_CONFIG, f"{_OMSHELL_CONFIRMATION}omshell-rc=0"
+    )
+
+    def _reject(*_: object) -> None:
+        msg = "dhcpd -t failed"
+        raise ConfigurationFailure(msg)
+
+    monkeypatch.setattr(provisioner, "_apply_dhcp_config_files", _reject)
+    with pytest.raises(ConfigurationFailure):
+        provisioner.provision_cpes({"AA:BB:CC:DD:EE:01": ({}, {})})
+    assert not console.scripts
@@ -0,0 +1 @@
+"""Unit tests of the boardfarm-docsis libraries."""
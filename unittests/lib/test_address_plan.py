@@ -0,0 +1,74 @@
+"""Provisioner address plan tests."""
+
+from ipaddress import IPv4Address, IPv6Address, IPv6Network
+
+import pytest
+from boardfarm3.exceptions import ConfigurationFailure
+
+from boardfarm3_docsis.lib.address_plan import AddressPlan
+
+_CONFIG = {"erouter_fixed_ip_start": "2001:dead:beef:6::1000/64"}
+
+
+def test_delegated_prefixes() -> None:
+    """Check the delegated prefixes and fixed addresses of the stations."""
+    plan = AddressPlan(_CONFIG)
+    # a /51 holds 512 /60 prefixes, the last 10 are served dynamically
+    assert plan.max_stations == 502  # noqa: PLR2004
+    assert plan.get_station(1).delegated_prefix == IPv6Network(
+        "2001:dead:beef:e000::/60"
+    )
+    assert plan.get_station(2).delegated_prefix == IPv6Network(
+        "2001:dead:beef:e010::/60"
+    )
+    assert plan.get_station(502).erouter_address == IPv6Address(
+        "2001:dead:beef:6::11f5"
+    )
+    assert plan.dynamic_prefix_pool.start == IPv6Address("2001:dead:beef:ff60::")
+    assert plan.dynamic_prefix_pool.end == IPv6Address("2001:dead:beef:fff0::")
+    with pytest.raises(ConfigurationFailure):
+        plan.get_station(503)
+
+
+def test_ipv6_prefix() -> None:
+    """Check that the default IPv6 networks use the given prefix length."""
+    plan = AddressPlan(_CONFIG, ipv6_prefix=56)
+    assert plan.cm_pool_v6.network == IPv6Network("2001:dead:beef::/56")
+
+
+def test_invalid_plans() -> None:
+    """Check the validation of the station count and of the fixed addresses."""
+    assert AddressPlan({**_CONFIG, "max_stations": 4}).max_stations == 4  # noqa: PLR2004
+    with pytest.raises(ConfigurationFailure, match="cannot delegate"):
+        AddressPlan({**_CONFIG, "max_stations": 503})
+    with pytest.raises(ConfigurationFailure, match="cannot delegate"):
+        AddressPlan({**_CONFIG, "max_stations": -1})
+    with pytest.raises(ConfigurationFailure, match="too small"):
+        AddressPlan({**_CONFIG, "erouter_net": "2001:dead:beef:e000::/58"})
+    with pytest.raises(ConfigurationFailure, match="erouter_fixed_ip_start"):
+        AddressPlan({})
+    # the fixed eRouter addresses run into the open host pool from ::210
+    with pytest.raises(ConfigurationFailure, match="overlap pool"):
+        AddressPlan({"erouter_fixed_ip_start": "2001:dead:beef:6::200/64"})
+    assert AddressPlan(
+        {"erouter_fixed_ip_start": "2001:dead:beef:6::200/64", "max_stations": 16}
+    ).get_station(16).erouter_address == IPv6Address("2001:dead:beef:6::20f")
+
+
+def test_cpe_addresses() -> None:
+    """Check the fixed CPE address blocks of the stations."""
+    plan = AddressPlan(_CONFIG)
+    assert plan.get_cpe_addresses(1, 0) == (
+        IPv4Address("192.168.202.126"),
+        IPv6Address("2001:dead:beef:6::1:0"),
+    )
+    assert plan.get_cpe_addresses(2, 1)[0] == IPv4Address("192.168.202.131")
+    with pytest.raises(ConfigurationFailure, match="raise cpes_per_station"):
+        plan.get_cpe_addresses(1, 4)
+    assert AddressPlan({**_CONFIG, "cpes_per_station": 8}).get_cpe_addresses(1, 4)[
+        0
+    ] == IPv4Address("192.168.202.130")
+    with pytest.raises(ConfigurationFailure, match="change cpe_fixed_ip_start"):
+        plan.get_cpe_addresses(34, 0)
+    with pytest.raises(ConfigurationFailure, match="Fixed CPE addresses"):
+        AddressPlan({**_CONFIG, "cpe_fixed_ip_start": "192.168.202.100"})
@@ -0,0 +1,80 @@
+"""Boot file AST tests."""
+
+import pytest
+
+from boardfarm3_docsis.lib.boot_file import (
+    BootFile,
+    ConfigComment,
+    ConfigStatement,
+    parse_config,
+    serialize_config,
+)
+
+_BOOT_FILE = """Main
+{
+    GlobalPrivacyEnable 1 ; /* BPI+ */
+    VendorSpecific
+    {
+        VendorIdentifier 0x0050F1;
+        eRouter
+        {
+            InitializationMode 1;
+        }
+    }
+    /* CmMic */
+}
+"""
+
+
+def test_serializer_round_trip() -> None:
+    """Check that serializing and parsing again gives the same AST."""
+    nodes = parse_config(_BOOT_FILE, keep_comments=True)
+    assert parse_config(serialize_config(nodes), keep_comments=True) == nodes
+    assert serialize_config(nodes).splitlines()[2] == (
+        "\tGlobalPrivacyEnable 1; /* BPI+ */"
+    )
+
+
+def test_structural_edits() -> None:
+    """Check the indexes, insertion before the MIC hook and block pruning."""
+    boot_file = BootFile(_BOOT_FILE)
+    assert boot_file.get_vendor_id() == "0050F1"
+    (vendor_block,) = boot_file.get_vendor_blocks("0050f1")
+    boot_file.insert([ConfigStatement("MaxCPE", ["16"])], before_comment="missing")
+    boot_file.remove(boot_file.get_statements("InitializationMode")[0])
+    assert not boot_file.get_vendor_blocks("0050f1")
+    assert vendor_block not in boot_file.main.statements
+    assert boot_file.main.children == [
+        ConfigStatement("GlobalPrivacyEnable", ["1"], comment="/* BPI+ */"),
+        ConfigStatement("MaxCPE", ["16"]),
+        ConfigComment("/* CmMic */"),
+    ]
+
+
+def test_insert_after_commented_statement() -> None:
+    """Check that a trailing comment stays with its statement on insertion."""
+    boot_file = BootFile(
+        "Main\n{\n"
+        "\tSnmpMibObject docsDevFilterLLCStatus.2 Integer 4; /* createAndGo */\n"
+        "\t/* CmMic */\n}\n"
+    )
+    (anchor,) = boot_file.get_statements("SnmpMibObject")
+    boot_file.insert_after(
+        anchor,
+        parse_config(
+            "SnmpMibObject docsDevFilterLLCStatus.3 Integer 4; /* createAndGo */",
+            keep_comments=True,
+        ),
+    )
+    assert boot_file.to_text().splitlines()[2:5] == [
+        "\tSnmpMibObject docsDevFilterLLCStatus.2 Integer 4; /* createAndGo */",
+        "\tSnmpMibObject docsDevFilterLLCStatus.3 Integer 4; /* createAndGo */",
+        "\t/* CmMic */",
+    ]
+
+
+def test_syntax_errors() -> None:
+    """Check that malformed configs are reported."""
+    for config in ("Main { NetworkAccess 1 }", "Main { NetworkAccess 1;", "}"):
+        with pytest.raises(ValueError, match="."):
+            parse_config(config)
@@ -0,0 +1,67 @@
+"""Boot file store tests."""
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, cast
+
+from boardfarm3_docsis.lib.boot_file_store import BootFileStore
+
+if TYPE_CHECKING:
+    from boardfarm3_docsis.templates.cable_modem import CableModem
+
+
+class _FakeSoftware:
+    """Board software counting the boot file fetches."""
+
+    def __init__(self) -> None:
+        self.boot_files = {"cm": "Main { NetworkAccess 1; }", "mta": "Main { }"}
+        self.fetches: list[str] = []
+
+    def get_boot_file(self) -> str:
+        self.fetches.append("cm")
+        return self.boot_files["cm"]
+
+    def get_mta_boot_file(self) -> str:
+        self.fetches.append("mta")
+        return self.boot_files["mta"]
+
+
+def _get_board() -> tuple["CableModem", _FakeSoftware]:
+    software = _FakeSoftware()
+    board = SimpleNamespace(hw=SimpleNamespace(mac_address="cm1"), sw=software)
+    return cast("CableModem", board), software
+
+
+def test_mta_boot_file_fetched_lazily() -> None:
+    """Check that the MTA boot file is only fetched when used, once."""
+    store = BootFileStore()
+    board, software = _get_board()
+    assert store.get(board).cm_boot_file == "Main { NetworkAccess 1; }"
+    assert software.fetches == ["cm"]
+    assert store.get(board).mta_boot_file == "Main { }"
+    assert store.get(board).mta_boot_file == "Main { }"
+    assert software.fetches == ["cm", "mta"]
+
+
+def test_versions() -> None:
+    """Check the versions recorded over invalidations and updates."""
+    store = BootFileStore()
+    board, software = _get_board()
+    assert store.get(board).mta_boot_file == "Main { }"
+    # an MTA only change is fetched again, in the same version
+    software.boot_files["mta"] = "Main { MtaConfigDelimiter 1; }"
+    store.invalidate(board)
+    snapshot = store.get(board)
+    assert (snapshot.version, snapshot.mta_boot_file) == (
+        1,
+        "Main { MtaConfigDelimiter 1; }",
+    )
+    software.boot_files["cm"] = "Main { NetworkAccess 0; }"
+    assert store.refresh(board).version == 2  # noqa: PLR2004
+    snapshot = store.update(board, mta_boot_file="Main { }")
+    assert (snapshot.version, snapshot.cm_boot_file, snapshot.mta_boot_file) == (
+        3,
+        "Main { NetworkAccess 0; }",
+        "Main { }",
+    )
+    assert [snapshot.version for snapshot in store.get_versions(board)] == [1, 2, 3]
+    assert software.fetches.count("mta") == 3  # noqa: PLR2004
@@ -0,0 +1,43 @@
+"""CM MAC state and registration watchdog tests."""
+
+from boardfarm3_docsis.lib.cm_state import (
+    RegistrationAction,
+    RegistrationPolicy,
+    RegistrationWatchdog,
+    check_mac_state,
+)
+
+
+def test_check_mac_state() -> None:
+    """Check the online classification of the MAC states."""
+    assert check_mac_state("online(pt)")[0]
+    assert not check_mac_state("p-online(pt)")[0]
+    assert check_mac_state("p-online(pt)", ignore_partial=True)[0]
+    assert not check_mac_state("init(r1)")[0]
+    assert not check_mac_state(None)[0]
+
+
+def test_stuck_state_is_reset_then_failed() -> None:
+    """Check the resets of a stuck modem and the diagnosis once exhausted."""
+    watchdog = RegistrationWatchdog(
+        RegistrationPolicy(state_budgets={"init(d)": 60}, max_resets=1)
+    )
+    assert watchdog.observe("init(d)", now=0).action is RegistrationAction.WAIT
+    assert watchdog.observe("init(d)", now=60).action is RegistrationAction.WAIT
+    assert watchdog.observe("init(d)", now=61).action is RegistrationAction.RESET
+    assert watchdog.observe("init(d)", now=100).action is RegistrationAction.WAIT
+    verdict = watchdog.observe("init(d)", now=200)
+    assert verdict.action is RegistrationAction.FAIL
+    assert verdict.diagnosis.startswith("stuck in init(d) for 100s")
+
+
+def test_flapping_modem() -> None:
+    """Check that a modem cycling offline and init is reported."""
+    watchdog = RegistrationWatchdog(
+        RegistrationPolicy(max_offline_cycles=1, max_resets=0)
+    )
+    for now, mac_state in enumerate(["init(r1)", "offline", "init(r1)"]):
+        assert watchdog.observe(mac_state, now).action is RegistrationAction.WAIT
+    verdict = watchdog.observe("offline", 3)
+    assert verdict.action is RegistrationAction.FAIL
+    assert verdict.diagnosis == "flapping, went offline 2 times"
@@ -0,0 +1,49 @@
+"""CM MAC state tracker tests."""
+
+import asyncio
+
+from boardfarm3_docsis.lib.cm_state_tracker import CmStateTracker, CmStateTransition
+
+
+def test_state_transitions() -> None:
+    """Check the diff of consecutive samples, the history and the waits."""
+    samples = iter(
+        [
+            {"0050.f100.0001": "init(r1)", "0050.f100.0002": "online(pt)"},
+            {"0050.f100.0001": "online(pt)", "0050.f100.0002": "online(pt)"},
+            {"0050.f100.0001": "online(pt)"},
+        ]
+    )
+    tracker = CmStateTracker(lambda: next(samples), history_size=3)
+    received = []
+    tracker.subscribe(received.append)
+    assert len(tracker.sample()) == 2  # noqa: PLR2004
+    assert [(t.previous, t.current) for t in tracker.sample()] == [
+        ("init(r1)", "online(pt)")
+    ]
+    tracker.sample()
+    assert [
+        (t.cm_mac, t.current) for t in tracker.get_history("00:50:F1:00:00:02")
+    ] == [
+        ("00:50:f1:00:00:02", "online(pt)"),
+        ("00:50:f1:00:00:02", None),
+    ]
+    assert len(received) == 4  # noqa: PLR2004
+    assert len(tracker.get_history()) == 3  # noqa: PLR2004
+    assert tracker.get_state("00-50-f1-00-00-01") == "online(pt)"
+    assert tracker.wait_for_state("0050.f100.0001", lambda s: s == "online(pt)", 0)
+    assert not tracker.wait_for_state("0050.f100.0002", lambda s: s is not None, 0)
+
+
+def test_queue_subscription() -> None:
+    """Check that transitions reach an asyncio queue."""
+
+    async def _receive() -> CmStateTransition:
+        tracker = CmStateTracker(lambda: {"0050.f100.0001": "offline"})
+        queue = tracker.subscribe_queue()
+        await asyncio.to_thread(tracker.sample)
+        transition = await asyncio.wait_for(queue.get(), 1)
+        tracker.unsubscribe_queue(queue)
+        return transition
+
+    assert asyncio.run(_receive()).current == "offline"
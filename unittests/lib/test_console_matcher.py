@@ -0,0 +1,76 @@
+"""Console multi-pattern matcher tests."""
+
+import time
+
+from boardfarm3_docsis.lib.console_matcher import (
+    MultiPatternMatcher,
+    watch_console,
+    watch_logs,
+)
+
+
+def test_overlapping_patterns_across_chunks() -> None:
+    """Check overlapping matches and markers split over two chunks."""
+    matcher = MultiPatternMatcher({"he": "he", "she": "she", "hers": "hers"})
+    assert matcher.feed("us") == []
+    assert matcher.feed("hers") == [("she", 4), ("he", 4), ("hers", 6)]
+
+
+class _Console:
+    """Console returning a chunk of output per expect call."""
+
+    def __init__(self, chunks: list[str]) -> None:
+        self._chunks = chunks
+        self.after = ""
+
+    def expect(self, _patterns: list, timeout: float) -> int:  # noqa: ARG002
+        """Return the next chunk as a match, EOF once all are read."""
+        if not self._chunks:
+            return 2
+        self.after = self._chunks.pop(0)
+        return 0
+
+
+def test_watch_console_stops_early() -> None:
+    """Check that the watch ends once all the markers are seen."""
+    console = _Console(["boot: cfg dow", "nload ok\nmta ok\n", "never read"])
+    result = watch_console(
+        console,  # type: ignore[arg-type]
+        {"cfg": "cfg download ok", "mta": "mta ok"},
+        timeout=10,
+    )
+    assert result.is_successful
+    assert result.log == "boot: cfg download ok\nmta ok\n"
+    assert console.after != "never read"
+
+
+def test_watch_console_failure_marker() -> None:
+    """Check that a failure marker ends the watch."""
+    result = watch_console(
+        _Console(["T3 timeout\n", "mta ok\n"]),  # type: ignore[arg-type]
+        {"mta": "mta ok"},
+        timeout=10,
+        failure_markers={"ranging": "T3 timeout"},
+    )
+    assert result.failure is not None
+    assert result.failure.name == "ranging"
+    assert result.missing == ["mta"]
+
+
+def test_watch_logs_reads_slices() -> None:
+    """Check that quiet slices are read until the markers show up."""
+    slices = ["", "cfg download ok\n", "", "mta ok\n", "never read"]
+    slice_duration = 0.01
+
+    def _read_slice(_remaining: float) -> str:
+        time.sleep(slice_duration)
+        return slices.pop(0)
+
+    result = watch_logs(_read_slice, {"mta": "mta ok"}, 10)
+    assert result.is_successful
+    # the marker is stamped at the end of the slice it was read in
+    match = result.matches["mta"]
+    assert slice_duration <= match.window < match.elapsed
+    assert match.elapsed >= 4 * slice_duration
+    assert result.log == "cfg download ok\nmta ok\n"
+    assert slices == ["never read"]
@@ -0,0 +1,51 @@
+"""Encoded DOCSIS config decoder tests."""
+
+import pytest
+
+from boardfarm3_docsis.exceptions import ConfigDecodingError
+from boardfarm3_docsis.lib.docsis_decoder import DecodedCmConfig
+from boardfarm3_docsis.lib.docsis_native_encoder import NativeCmConfigEncoder
+
+_BOOT_FILE = """Main
+{
+    NetworkAccess 1;
+    GlobalPrivacyEnable 0;
+    SnmpMibObject 1.3.6.1.2.1.69.1.2.1.7.1 Integer 4;
+    VendorSpecific
+    {
+        VendorIdentifier 0x0050F1;
+        eRouter
+        {
+            InitializationMode 2;
+        }
+    }
+}
+"""
+
+
+def test_decoding_round_trip() -> None:
+    """Check the decoded tree of a natively encoded boot file."""
+    config = DecodedCmConfig(NativeCmConfigEncoder().encode(_BOOT_FILE, b"secret"))
+    assert [tlv.name for tlv in config.tlvs] == [
+        "NetworkAccess",
+        "GlobalPrivacyEnable",
+        "SnmpMibObject",
+        "VendorSpecific",
+        "CmMic",
+        "CmtsMic",
+    ]
+    assert config.is_bpi_privacy_disabled()
+    assert config.get_vendor_ids() == ["0050f1"]
+    assert config.get_tlvs(11)[0].value == ("1.3.6.1.2.1.69.1.2.1.7.1", "Integer", 4)
+    (erouter,) = config.get_vendor_blocks("0x0050F1")[0].get_children(202)
+    assert [(child.name, child.value) for child in erouter.children] == [
+        ("InitializationMode", 2)
+    ]
+    assert config.verify_mics(b"secret")
+    assert not config.verify_mics(b"")
+
+
+def test_decoding_truncated_config() -> None:
+    """Check that a truncated TLV is reported."""
+    with pytest.raises(ConfigDecodingError):
+        DecodedCmConfig(bytes.fromhex("0301"))
@@ -0,0 +1,157 @@
+"""Native DOCSIS config encoder conformance tests."""
+
+import hashlib
+import shutil
+
+import pytest
+
+from boardfarm3_docsis.configs import DOCSIS_DEVICE_MIBS_PATH
+from boardfarm3_docsis.exceptions import NativeEncodingError
+from boardfarm3_docsis.lib.docsis_encoder import DocsisConfigEncoder
+from boardfarm3_docsis.lib.docsis_native_encoder import NativeCmConfigEncoder
+from boardfarm3_docsis.lib.docsis_tlv import get_cmts_mic
+
+_BOOT_FILE = """Main
+{
+    NetworkAccess 1;
+    GlobalPrivacyEnable 1;
+    MaxCPE 16;
+    ClassOfService
+    {
+        ClassID 1;
+        MaxRateDown 0;
+        MaxRateUp 0;
+        PriorityUp 0;
+        GuaranteedUp 0;
+        MaxBurstUp 0;
+        PrivacyEnable 1;
+    }
+    UsServiceFlow
+    {
+        UsServiceFlowRef 1;
+        QosParamSetType 7;
+        MaxRateSustained 1000000000;
+        SchedulingType 2;
+    }
+    DsServiceFlow
+    {
+        DsServiceFlowRef 101;
+        QosParamSetType 7;
+        MaxRateSustained 1000000000;
+    }
+    /* docsDevNmAccessIpMask.1 */
+    SnmpMibObject 1.3.6.1.2.1.69.1.2.1.3.1 IPAddress 255.255.255.255;
+    SnmpMibObject 1.3.6.1.2.1.69.1.2.1.4.1 String "public";
+    SnmpMibObject 1.3.6.1.2.1.69.1.2.1.6.1 HexString 0x80;
+    SnmpMibObject 1.3.6.1.2.1.69.1.2.1.7.1 Integer 4;
+    VendorSpecific
+    {
+        VendorIdentifier 0x0050f1;
+        GenericTLV TlvCode 12 TlvString "Device.DSLite.Enable|boolean|true";
+        eRouter
+        {
+            InitializationMode 3;
+            TR69ManagementServer
+            {
+                EnableCWMP 1;
+                URL "http://acs_server.boardfarm.com:9675";
+                ACSOverride 1;
+            }
+        }
+    }
+    GenericTLV TlvCode 53 TlvLength 2 TlvValue 0x0101;
+    /* CmMic */
+    /* CmtsMic */
+}
+"""
+
+# nested TLVs, an SNMP object and both MICs, laid out by hand
+_GOLDEN_BOOT_FILE = """Main
+{
+    NetworkAccess 1;
+    UsServiceFlow
+    {
+        UsServiceFlowRef 1;
+        QosParamSetType 7;
+    }
+    VendorSpecific
+    {
+        VendorIdentifier 0x0050f1;
+        eRouter
+        {
+            InitializationMode 3;
+        }
+    }
+    SnmpMibObject 1.3.6.1.2.1.69.1.2.1.4.1 String "public";
+    /* CmMic */
+    /* CmtsMic */
+}
+"""
+_GOLDEN_TLVS = (
+    # NetworkAccess 1
+    "030101"
+    # UsServiceFlow: UsServiceFlowRef 1, QosParamSetType 7
+    "1807 01020001 060107"
+    # VendorSpecific: VendorIdentifier, eRouter: InitializationMode 3
+    "2b0a 08030050f1 ca03 010103"
+    # SnmpMibObject docsDevNmAccessCommunity.1 String "public"
+    "0b17 3015 060b2b0601020145010201040104 06 7075626c6963"
+    # CM MIC, MD5 of the TLVs above
+    "0610 bb5fd50746fbeb82b80cb8e10dd5f5f4"
+)
+# CMTS MIC, HMAC-MD5 of TLVs 3, 43, 6 and 24, with and without shared secret
+_GOLDEN_CMTS_MICS = {
+    b"": "0710 1c9bfc805010a89540e7c7c12050384b",
+    b"secret": "0710 345b867c16aa9460c4c59de570e17f9e",
+}
+
+_needs_compiler = pytest.mark.skipif(
+    shutil.which("docsis") is None, reason="docsis compiler is not installed"
+)
+
+
+def test_native_encoding_layout() -> None:
+    """Check the TLVs, MICs and trailer of a natively encoded boot file."""
+    encoded = NativeCmConfigEncoder().encode(_BOOT_FILE)
+    assert encoded.startswith(bytes.fromhex("030101 1d0101 120110"))
+    assert len(encoded) % 4 == 0
+    data = encoded.rstrip(b"\x00")
+    assert data.endswith(b"\xff")
+    data = data[:-1]
+    cm_mic_offset = len(data) - 18 - 18
+    assert data[cm_mic_offset : cm_mic_offset + 2] == bytes.fromhex("0610")
+    assert (
+        data[cm_mic_offset + 2 : cm_mic_offset + 18]
+        == hashlib.md5(data[:cm_mic_offset], usedforsecurity=False).digest()
+    )
+    assert data[-18:-16] == bytes.fromhex("0710")
+    assert data[-16:] == get_cmts_mic(data[:-18], b"")
+    varbind = bytes.fromhex("0b17 3015 060b 2b06010201450102010401 0406 7075626c6963")
+    assert varbind in data
+
+
+@pytest.mark.parametrize("shared_secret", [b"", b"secret"], ids=["no-secret", "secret"])
+def test_native_encoding_golden_bytes(shared_secret: bytes) -> None:
+    """Check a natively encoded boot file against hand encoded bytes."""
+    assert NativeCmConfigEncoder().encode(
+        _GOLDEN_BOOT_FILE, shared_secret
+    ) == bytes.fromhex(f"{_GOLDEN_TLVS} {_GOLDEN_CMTS_MICS[shared_secret]} ff 0000")
+
+
+def test_native_encoding_rejects_unsupported_tlvs() -> None:
+    """Check that unsupported TLVs are reported for the compiler fallback."""
+    with pytest.raises(NativeEncodingError):
+        NativeCmConfigEncoder().encode("Main { MtaConfigDelimiter 1; }")
+    with pytest.raises(NativeEncodingError):
+        NativeCmConfigEncoder().encode(
+            "Main { SnmpMibObject sysContact.0 String 'x'; }"
+        )
+
+
+@_needs_compiler
+def test_native_encoding_matches_compiler() -> None:
+    """Check that both engines produce the same boot file, byte for byte."""
+    compiled = DocsisConfigEncoder(use_cache=False).encode_cm_config(
+        _BOOT_FILE, [DOCSIS_DEVICE_MIBS_PATH], engine="compiler"
+    )
+    assert NativeCmConfigEncoder().encode(_BOOT_FILE) == compiled.read_bytes()
@@ -0,0 +1,43 @@
+"""Binary CM config patching tests."""
+
+from boardfarm3_docsis.lib.docsis_native_encoder import NativeCmConfigEncoder
+from boardfarm3_docsis.lib.docsis_patch import CmConfigPatcher
+
+_BOOT_FILE = """Main
+{
+    NetworkAccess 1;
+    GlobalPrivacyEnable 1;
+    VendorSpecific
+    {
+        VendorIdentifier 0x0050f1;
+        eRouter
+        {
+            InitializationMode 1;
+        }
+    }
+}
+"""
+
+
+def test_patching_matches_native_encoding() -> None:
+    """Check that a patched boot file equals the encoding of the edited text."""
+    encoder = NativeCmConfigEncoder()
+    patcher = CmConfigPatcher(encoder.encode(_BOOT_FILE, b"secret"))
+    patcher.set_tlv(29, b"\x00")
+    patcher.set_vendor_tlv(bytes.fromhex("0050f1"), 202, bytes.fromhex("010103"))
+    patcher.append_tlv(18, b"\x10")
+    expected = encoder.encode(
+        _BOOT_FILE.replace("GlobalPrivacyEnable 1", "GlobalPrivacyEnable 0")
+        .replace("InitializationMode 1", "InitializationMode 3")
+        .replace("    }\n}", "    }\n    MaxCPE 16;\n}"),
+        b"secret",
+    )
+    assert patcher.encode(b"secret") == expected
+
+
+def test_patching_adds_vendor_block() -> None:
+    """Check that a VendorSpecific block is added for an unknown vendor."""
+    patcher = CmConfigPatcher(NativeCmConfigEncoder().encode(_BOOT_FILE))
+    patcher.append_vendor_tlv(bytes.fromhex("001000"), 1, b"\x01")
+    assert patcher.remove_tlv(3).tlvs[-1] == (43, bytes.fromhex("0803001000 010101"))
+    assert [code for code, _ in patcher.tlvs] == [29, 43, 43]
@@ -0,0 +1,83 @@
+"""Encoded config file cache tests."""
+
+import os
+from pathlib import Path
+
+from boardfarm3_docsis.lib.encoder_cache import EncoderCache, get_mibs_key
+
+
+def _write_file(path: Path, content: bytes, mtime: int = 0) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    if mtime:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_hit_and_miss(tmp_path: Path) -> None:
+    """Check that a stored file is handed out as a private copy."""
+    cache = EncoderCache(str(tmp_path / "cache"))
+    assert cache.get("key", ".cfg") is None
+    encoded_file = _write_file(tmp_path / "cm.cfg", b"encoded")
+    cache.put("key", ".cfg", encoded_file)
+    cached_file = cache.get("key", ".cfg", prefix="cm-config-")
+    assert cached_file is not None
+    assert cached_file.name.startswith("cm-config-")
+    assert cached_file.read_bytes() == b"encoded"
+    # the copy is owned by the caller
+    cached_file.unlink()
+    assert cache.get("key", ".cfg") is not None
+    assert cache.get("other", ".cfg") is None
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+
+
+def test_vanished_entry_is_a_miss(tmp_path: Path) -> None:
+    """Check that an entry evicted by another process is a miss."""
+    cache = EncoderCache(str(tmp_path / "cache"))
+    cache.put("key", ".cfg", _write_file(tmp_path / "cm.cfg", b"encoded"))
+    # another process evicts the entry
+    EncoderCache(str(tmp_path / "cache")).clear()
+    assert cache.get("key", ".cfg") is None
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+
+
+def test_atomic_put(tmp_path: Path) -> None:
+    """Check that an entry is replaced as a whole and the source kept."""
+    cache_dir = tmp_path / "cache"
+    cache = EncoderCache(str(cache_dir))
+    encoded_file = _write_file(tmp_path / "cm.cfg", b"first")
+    entry = cache.put("key", ".cfg", encoded_file)
+    _write_file(encoded_file, b"second")
+    assert cache.put("key", ".cfg", encoded_file) == entry
+    assert entry.read_bytes() == b"second"
+    assert encoded_file.read_bytes() == b"second"
+    assert [path.name for path in cache_dir.iterdir()] == ["key.cfg"]
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    """Check that the least recently used entries are evicted first."""
+    cache_dir = tmp_path / "cache"
+    cache = EncoderCache(str(cache_dir), max_size=20)
+    for index, key in enumerate(("first", "second"), start=1):
+        cache.put(key, ".cfg", _write_file(tmp_path / "cm.cfg", b"0123456789"))
+        os.utime(cache_dir / f"{key}.cfg", (index * 100, index * 100))
+    # a hit makes the first entry the most recently used one
+    assert cache.get("first", ".cfg") is not None
+    cache.put("third", ".cfg", _write_file(tmp_path / "cm.cfg", b"0123456789"))
+    assert sorted(path.name for path in cache_dir.iterdir()) == [
+        "first.cfg",
+        "third.cfg",
+    ]
+    assert cache.stats.evictions == 1
+
+
+def test_mibs_key(tmp_path: Path) -> None:
+    """Check that the MIB set key follows the MIB directory changes."""
+    mibs_dir = tmp_path / "mibs"
+    _write_file(mibs_dir / "DOCS-IF-MIB", b"mib", mtime=100)
+    key = get_mibs_key([str(mibs_dir)])
+    assert get_mibs_key([str(mibs_dir)]) == key
+    assert get_mibs_key([str(tmp_path / "other")]) != key
+    # a MIB file added to a subdirectory
+    _write_file(mibs_dir / "vendor" / "VENDOR-MIB", b"mib", mtime=100)
+    assert get_mibs_key([str(mibs_dir)]) != key
@@ -0,0 +1,78 @@
+"""Host side FIFO lock tests."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from boardfarm3.exceptions import FileLockTimeout
+
+from boardfarm3_docsis.lib.fair_lock import FairLock
+
+
+def _write_ticket(queue_dir: Path, hostname: str, pid: int, age: float) -> Path:
+    queue_dir.mkdir(parents=True, exist_ok=True)
+    ticket = queue_dir / f"{1:020d}-{hostname}-{pid}.ticket"
+    holder = {"identity": "old", "hostname": hostname, "pid": pid, "queued_at": 0}
+    ticket.write_text(json.dumps(holder), encoding="utf-8")
+    os.utime(ticket, (time.time() - age, time.time() - age))
+    return ticket
+
+
+def _wait_for_tickets(queue_dir: Path, count: int) -> None:
+    while len(list(queue_dir.glob("*.ticket"))) < count:
+        time.sleep(0.01)
+
+
+def test_fifo_order(tmp_path: Path) -> None:
+    """Check that the waiters get the lock in arrival order."""
+    holder = FairLock("lock", str(tmp_path), poll_interval=0.01)
+    holder.acquire("first")
+    order: list[str] = []
+
+    def _contend(identity: str) -> None:
+        with FairLock("lock", str(tmp_path), poll_interval=0.01).hold(identity):
+            order.append(identity)
+
+    threads = []
+    for index, identity in enumerate(["second", "third", "fourth"], 2):
+        threads.append(threading.Thread(target=_contend, args=(identity,)))
+        threads[-1].start()
+        _wait_for_tickets(tmp_path / "lock", index)
+    holder.release()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["second", "third", "fourth"]
+
+
+def test_stale_tickets(tmp_path: Path) -> None:
+    """Check which tickets ahead in the queue are broken as stale."""
+    lock = FairLock("lock", str(tmp_path), stale_timeout=60, poll_interval=0.01)
+    _write_ticket(tmp_path / "lock", "remote-host", 1, age=120)
+    lock.acquire("remote expired")
+    lock.release()
+    with subprocess.Popen([sys.executable, "-c", "pass"]) as process:  # noqa: S603
+        process.wait()
+    _write_ticket(tmp_path / "lock", socket.gethostname(), process.pid, age=0)
+    lock.acquire("local dead")
+    lock.release()
+    assert lock.stats.stale_locks_broken == 2  # noqa: PLR2004
+    # a local holder still alive keeps the lock, however old its ticket
+    _write_ticket(tmp_path / "lock", socket.gethostname(), os.getpid(), age=120)
+    with pytest.raises(FileLockTimeout):
+        lock.acquire("local alive", timeout=0.2)
+
+
+def test_heartbeat(tmp_path: Path) -> None:
+    """Check that the holder keeps its ticket fresh."""
+    lock = FairLock("lock", str(tmp_path), stale_timeout=0.2, poll_interval=0.01)
+    with lock.hold("holder"):
+        (ticket,) = (tmp_path / "lock").glob("*.ticket")
+        os.utime(ticket, (0, 0))
+        time.sleep(0.2)
+        assert time.time() - ticket.stat().st_mtime < 1
@@ -0,0 +1,116 @@
+"""MIB OID table tests."""
+
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from boardfarm3_docsis.lib import docsis_encoder, mib_table
+from boardfarm3_docsis.lib.docsis_encoder import _NO_MIBS_DIR, DocsisConfigEncoder
+from boardfarm3_docsis.lib.encoder_cache import get_mibs_key
+from boardfarm3_docsis.lib.mib_table import MibOidTable
+
+_TEST_MIB = """TEST-MIB DEFINITIONS ::= BEGIN
+
+IMPORTS
+    MODULE-IDENTITY, OBJECT-TYPE, Integer32, enterprises
+        FROM SNMPv2-SMI;
+
+testMib MODULE-IDENTITY
+    LAST-UPDATED "202601010000Z"
+    ORGANIZATION "boardfarm"
+    CONTACT-INFO "boardfarm"
+    DESCRIPTION "Test MIB."
+    ::= { enterprises 99999 }
+
+testValue OBJECT-TYPE
+    SYNTAX      Integer32
+    MAX-ACCESS  read-write
+    STATUS      current
+    DESCRIPTION "Test value."
+    ::= { testMib 1 }
+
+END
+"""
+_TEST_OIDS = {"testMib": "1.3.6.1.4.1.99999", "testValue": "1.3.6.1.4.1.99999.1"}
+
+
+class _FakeCompiler:
+    """MIBs compiler counting the compilations of the test MIB."""
+
+    compiled: ClassVar[list[list[str]]] = []
+
+    def __init__(self, mibs_dirs: list[str]) -> None:
+        self.compiled.append(mibs_dirs)
+
+    @property
+    def oids(self) -> dict[str, str]:
+        return _TEST_OIDS
+
+
+@pytest.fixture(name="mibs_dir")
+def _mibs_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    mibs_dir = tmp_path / "mibs"
+    mibs_dir.mkdir()
+    (mibs_dir / "TEST-MIB.mib").write_text(_TEST_MIB, encoding="utf-8")
+    monkeypatch.setattr(mib_table, "_MibsTableCompiler", _FakeCompiler)
+    monkeypatch.setattr(_FakeCompiler, "compiled", [])
+    return mibs_dir
+
+
+def test_table_stored_on_disk(mibs_dir: Path, tmp_path: Path) -> None:
+    """Check that the table is compiled once and keyed by the MIB set."""
+    table_dir = tmp_path / "tables"
+    table = MibOidTable([str(mibs_dir)], str(table_dir))
+    assert table.resolve("testValue.0") == "1.3.6.1.4.1.99999.1.0"
+    assert table.resolve("1.3.6.1.2.1.1.4.0") == "1.3.6.1.2.1.1.4.0"
+    assert table.resolve("unknownValue.0") == "unknownValue.0"
+    assert [path.name for path in table_dir.iterdir()] == [
+        f"{get_mibs_key([str(mibs_dir)])}.json"
+    ]
+    # another process loads the stored table
+    MibOidTable([str(mibs_dir)], str(table_dir))
+    assert _FakeCompiler.compiled == [[str(mibs_dir)]]
+
+
+def test_table_rebuilt_on_mib_change(mibs_dir: Path, tmp_path: Path) -> None:
+    """Check that a changed MIB file gives a new table."""
+    table_dir = tmp_path / "tables"
+    MibOidTable([str(mibs_dir)], str(table_dir))
+    key = get_mibs_key([str(mibs_dir)])
+    # replace the MIB file, as a package update does
+    new_mib = mibs_dir / "TEST-MIB.tmp"
+    new_mib.write_text(_TEST_MIB.replace("Test value.", "Value."), encoding="utf-8")
+    new_mib.replace(mibs_dir / "TEST-MIB.mib")
+    assert get_mibs_key([str(mibs_dir)]) != key
+    MibOidTable([str(mibs_dir)], str(table_dir))
+    assert len(_FakeCompiler.compiled) == 2  # noqa: PLR2004
+    assert len(list(table_dir.iterdir())) == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    ("oid", "resolved_oid"),
+    [
+        ("testValue.0", "1.3.6.1.4.1.99999.1.0"),
+        ("1.3.6.1.4.1.99999.1.0", "1.3.6.1.4.1.99999.1.0"),
+        ("unknownValue.0", "unknownValue.0"),
+    ],
+)
+def test_numeric_config_encoded_without_mibs(
+    mibs_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    oid: str,
+    resolved_oid: str,
+) -> None:
+    """Check that the encoder loads no MIB once all the OIDs are numeric."""
+    table = MibOidTable([str(mibs_dir)], str(tmp_path / "tables"))
+    monkeypatch.setattr(docsis_encoder, "get_mib_table", lambda _: table)
+    config, mibs_path = DocsisConfigEncoder(use_cache=False)._resolve_config_oids(  # noqa: SLF001  # pylint: disable=protected-access
+        f"Main {{ SnmpMibObject {oid} Integer 1; }}", [str(mibs_dir)]
+    )
+    assert config == f"Main {{ SnmpMibObject {resolved_oid} Integer 1; }}"
+    # the unresolved OIDs are left to the encoder
+    assert mibs_path == (
+        [_NO_MIBS_DIR] if resolved_oid[0].isdigit() else [str(mibs_dir)]
+    )
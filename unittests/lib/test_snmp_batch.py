@@ -0,0 +1,60 @@
+"""Multi-varbind SNMP request tests."""
+
+import pytest
+
+from boardfarm3_docsis.lib.snmp_batch import (
+    chunk_oids,
+    format_set_varbind,
+    get_error_reason,
+    parse_varbinds,
+)
+
+
+def test_format_set_varbind() -> None:
+    """Check the type mapping and the value encoding."""
+    assert format_set_varbind("1.3.6.1.0", "Integer", 1) == "1.3.6.1.0 i 1"
+    assert format_set_varbind("1.3.6.1.0", "String", "a b") == "1.3.6.1.0 s 'a b'"
+    assert format_set_varbind("1.3.6.1.0", "HexString", "10.0.0.1") == (
+        "1.3.6.1.0 x 0A000001"
+    )
+    assert format_set_varbind("1.3.6.1.0", "x", "0x0a 0b") == "1.3.6.1.0 x 0A0B"
+    with pytest.raises(ValueError, match="Unknown SNMP type"):
+        format_set_varbind("1.3.6.1.0", "Opaque", "0")
+
+
+def test_parse_varbinds() -> None:
+    """Check the per-varbind values and errors."""
+    output = (
+        '.1.3.6.1.1.0 = STRING: "image.bin"\n'
+        ".1.3.6.1.2.0 = No Such Instance currently exists at this OID\n"
+    )
+    results = parse_varbinds(["1.3.6.1.1.0", "1.3.6.1.2.0", "1.3.6.1.3.0"], output)
+    assert (results["1.3.6.1.1.0"].value, results["1.3.6.1.1.0"].type) == (
+        "image.bin",
+        "STRING",
+    )
+    assert results["1.3.6.1.2.0"].error == (
+        "No Such Instance currently exists at this OID"
+    )
+    assert not results["1.3.6.1.3.0"].is_successful
+
+
+def test_get_error_reason() -> None:
+    """Check the failed object of a rejected PDU."""
+    output = (
+        "Error in packet.\nReason: notWritable (That object does not support"
+        " modification)\nFailed object: .1.3.6.1.2.0\n"
+    )
+    assert get_error_reason(output) == (
+        "notWritable (That object does not support modification)",
+        "1.3.6.1.2.0",
+    )
+    assert get_error_reason(".1.3.6.1.1.0 = INTEGER: 1") is None
+
+
+def test_chunk_oids() -> None:
+    """Check the split by number of varbinds and by estimated size."""
+    oids = [f"1.3.6.1.2.1.{index}.0" for index in range(10)]
+    assert [len(chunk) for chunk in chunk_oids(oids, 4)] == [4, 4, 2]
+    assert [len(chunk) for chunk in chunk_oids(oids, 10, max_size=50)] == [3] * 3 + [1]
+    assert [oid for chunk in chunk_oids(oids, 4) for oid in chunk] == oids
@@ -0,0 +1,120 @@
+"""SNMP context registry tests."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+from boardfarm3_docsis.lib.snmp_context import SNMP_CONTEXTS, SnmpContextRegistry
+from boardfarm3_docsis.use_cases import connectivity
+from boardfarm3_docsis.use_cases.docsis import provision_docsis_board
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from boardfarm3.templates.wan import WAN
+
+    from boardfarm3_docsis.templates.cable_modem import CableModem
+    from boardfarm3_docsis.templates.cmts import CMTS
+    from boardfarm3_docsis.templates.provisioner import Provisioner
+
+_CM_MAC = "00:11:22:33:44:55"
+
+
+class _FakeCMTS:
+    """CMTS counting the CM IP address queries."""
+
+    def __init__(self) -> None:
+        self.ip_address = "10.1.0.10"
+        self.queries: list[str] = []
+
+    def get_cable_modem_ip_address(self, cm_mac: str) -> str:
+        self.queries.append(cm_mac)
+        return self.ip_address
+
+
+def _get_board() -> CableModem:
+    board = SimpleNamespace(
+        hw=SimpleNamespace(mac_address=_CM_MAC),
+        sw=SimpleNamespace(
+            get_mibs_compiler=lambda: None,
+            provision_cable_modem=lambda **_: None,
+        ),
+    )
+    return cast("CableModem", board)
+
+
+def _get_wan(device_name: str = "wan") -> WAN:
+    return cast("WAN", SimpleNamespace(device_name=device_name))
+
+
+@pytest.fixture(name="cmts")
+def fixture_cmts() -> Iterator[_FakeCMTS]:
+    """Provide a fake CMTS, with an empty session registry."""
+    SNMP_CONTEXTS.clear()
+    yield _FakeCMTS()
+    SNMP_CONTEXTS.clear()
+
+
+def test_cm_ip_address_read_once(cmts: _FakeCMTS) -> None:
+    """Check that the CM IP address is read from the CMTS once per board."""
+    registry = SnmpContextRegistry()
+    board = _get_board()
+    for _ in range(3):
+        assert registry.get_cm_ip_address(board, cast("CMTS", cmts)) == "10.1.0.10"
+    assert cmts.queries == [_CM_MAC]
+
+
+def test_snmp_client_reused_per_wan(cmts: _FakeCMTS) -> None:
+    """Check that the SNMP clients are reused per WAN device name."""
+    registry = SnmpContextRegistry()
+    board = _get_board()
+    snmp = registry.get_snmp(board, _get_wan(), cast("CMTS", cmts))
+    assert registry.get_snmp(board, _get_wan(), cast("CMTS", cmts)) is snmp
+    other_snmp = registry.get_snmp(board, _get_wan("wan2"), cast("CMTS", cmts))
+    assert other_snmp is not snmp
+    assert other_snmp._target_ip == "10.1.0.10"  # noqa: SLF001  # pylint: disable=protected-access
+    assert cmts.queries == [_CM_MAC]
+
+
+def test_reset_invalidates_context(cmts: _FakeCMTS) -> None:
+    """Check that a board reset reads the CM IP address again."""
+    board = _get_board()
+    snmp = SNMP_CONTEXTS.get_snmp(board, _get_wan(), cast("CMTS", cmts))
+    connectivity._record_reset(_CM_MAC)  # noqa: SLF001  # pylint: disable=protected-access
+    cmts.ip_address = "10.1.0.20"
+    new_snmp = SNMP_CONTEXTS.get_snmp(board, _get_wan(), cast("CMTS", cmts))
+    assert new_snmp is not snmp
+    assert new_snmp._target_ip == "10.1.0.20"  # noqa: SLF001  # pylint: disable=protected-access
+    assert cmts.queries == [_CM_MAC, _CM_MAC]
+
+
+def test_reprovision_invalidates_context(cmts: _FakeCMTS) -> None:
+    """Check that reprovisioning a board reads the CM IP address again."""
+    board = _get_board()
+    snmp = SNMP_CONTEXTS.get_snmp(board, _get_wan(), cast("CMTS", cmts))
+    provision_docsis_board(
+        board, cast("Provisioner", None), _get_wan(), "cm config", "mta config"
+    )
+    assert SNMP_CONTEXTS.get_snmp(board, _get_wan(), cast("CMTS", cmts)) is not snmp
+    assert cmts.queries == [_CM_MAC, _CM_MAC]
+
+
+def test_session_drops_context_on_error(cmts: _FakeCMTS) -> None:
+    """Check that a failed SNMP session drops the board entry."""
+    registry = SnmpContextRegistry()
+    board = _get_board()
+    with registry.session(board, _get_wan(), cast("CMTS", cmts)) as snmp:
+        pass
+
+    def _fail_snmp_call() -> None:
+        with registry.session(board, _get_wan(), cast("CMTS", cmts)) as same_snmp:
+            assert same_snmp is snmp
+            raise TimeoutError
+
+    with pytest.raises(TimeoutError):
+        _fail_snmp_call()
+    assert registry.get_snmp(board, _get_wan(), cast("CMTS", cmts)) is not snmp
+    assert cmts.queries == [_CM_MAC, _CM_MAC]
@@ -0,0 +1,126 @@
+"""Cable modem online check tests."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, cast
+
+import pytest
+
+from boardfarm3_docsis.lib.cm_state import RegistrationPolicy, RegistrationWatchdog
+from boardfarm3_docsis.templates.cmts import CMTS
+from boardfarm3_docsis.use_cases.connectivity import (
+    _is_cable_modem_online,
+    are_boards_online_after_reset,
+)
+
+if TYPE_CHECKING:
+    from boardfarm3_docsis.templates.cable_modem import CableModem
+
+# resets a cable modem on its first observation out of the online states
+_IMPATIENT_POLICY = RegistrationPolicy(state_budgets={}, default_budget=-1)
+
+
+class _TemplateCMTS:
+    """CMTS without MAC states, using the template default."""
+
+    get_cable_modem_states = CMTS.get_cable_modem_states
+
+    def __init__(self, online: set[str]) -> None:
+        self.online = online
+        self.queries: list[str] = []
+        self.resets: list[str] = []
+
+    def is_cable_modem_online(
+        self, mac_address: str, ignore_partial: bool = False
+    ) -> bool:
+        self.queries.append(f"is_cable_modem_online {mac_address} {ignore_partial}")
+        return mac_address in self.online
+
+    def reset_cable_modem_status(self, mac_address: str) -> None:
+        self.online.discard(mac_address)
+
+    def clear_cm_reset(self, mac_address: str) -> None:
+        self.resets.append(mac_address)
+
+
+class _TableCMTS(_TemplateCMTS):
+    """CMTS reporting the MAC states of its cable modem table."""
+
+    def __init__(self, mac_states: dict[str, str | None]) -> None:
+        super().__init__(set())
+        self.mac_states = mac_states
+
+    def get_cable_modem_states(self, mac_addresses: list[str]) -> dict[str, str | None]:
+        self.queries.append(f"get_cable_modem_states {mac_addresses}")
+        return {mac: self.mac_states.get(mac) for mac in mac_addresses}
+
+
+def _get_board(cm_mac: str) -> CableModem:
+    board = SimpleNamespace(
+        hw=SimpleNamespace(mac_address=cm_mac),
+        sw=SimpleNamespace(finalize_boot=lambda: True),
+        config={},
+    )
+    return cast("CableModem", board)
+
+
+def test_fleet_boot_with_template_cmts() -> None:
+    """Check that the boards come online with a CMTS without MAC states."""
+    cmts = _TemplateCMTS({"cm1", "cm2"})
+    # the boards come back online once reset
+    cmts.reset_cable_modem_status = lambda **_: None  # type: ignore[method-assign]
+    outcomes = are_boards_online_after_reset(
+        [_get_board("cm1"), _get_board("cm2")],
+        cast("CMTS", cmts),
+        poll_interval=0.01,
+        timeout=5,
+        policy=_IMPATIENT_POLICY,
+    )
+    assert {mac: outcome.online for mac, outcome in outcomes.items()} == {
+        "cm1": True,
+        "cm2": True,
+    }
+    assert sorted(cmts.queries) == [
+        "is_cable_modem_online cm1 True",
+        "is_cable_modem_online cm2 True",
+    ]
+
+
+def test_fleet_boot_without_watchdog_for_template_cmts() -> None:
+    """Check that the watchdog is not fed without MAC states."""
+    cmts = _TemplateCMTS(set())
+    outcomes = are_boards_online_after_reset(
+        [_get_board("cm1")],
+        cast("CMTS", cmts),
+        poll_interval=0.01,
+        timeout=0.1,
+        policy=_IMPATIENT_POLICY,
+    )
+    assert not outcomes["cm1"].online
+    assert outcomes["cm1"].error is None
+    assert not cmts.resets
+
+
+@pytest.mark.parametrize(
+    ("mac_state", "is_online"),
+    [("online(pt)", True), ("p-online(pt)", True), ("online", False), (None, False)],
+)
+def test_cable_modem_online_from_one_query(
+    mac_state: str | None, is_online: bool
+) -> None:
+    """Check that the MAC state read once decides whether a modem is online."""
+    cmts = _TableCMTS({"cm1": mac_state})
+    assert _is_cable_modem_online(cast("CMTS", cmts), "cm1") is is_online
+    assert cmts.queries == ["get_cable_modem_states ['cm1']"]
+
+
+def test_watchdog_fed_with_mac_states() -> None:
+    """Check that the watchdog resets a modem stuck in a MAC state."""
+    cmts = _TableCMTS({"cm1": "init(r1)"})
+    watchdog = RegistrationWatchdog(_IMPATIENT_POLICY)
+    assert not _is_cable_modem_online(cast("CMTS", cmts), "cm1", watchdog)
+    assert cmts.resets == ["cm1"]
+    template_cmts = _TemplateCMTS(set())
+    assert not _is_cable_modem_online(cast("CMTS", template_cmts), "cm1", watchdog)
+    assert not template_cmts.resets